@@ -151,6 +151,42 @@ class DualEmbeddingProvider:
         logger.debug("[EmbeddingProvider] Using hash embedding (Google unavailable)")
         return _hash_embedding(text, self.embedding_dim)
 
+    def encode_batch(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        """
+        Embed many texts, one Google request per `batch_size` chunk.
+        Chunks that fail fall back to encode() per text. Output order = input order.
+        """
+        out: List[List[float]] = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            embs = self._google_embed_batch(chunk)
+            out.extend(embs if embs else [self.encode(t) for t in chunk])
+        return out
+
+    def _google_embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        if not self.google_available or self._client is None:
+            return None
+        if self._session_tokens >= self._token_budget:
+            logger.warning("[Google] Token budget reached — switching to hash mode")
+            self.google_available = False
+            return None
+        try:
+            result = self._client.models.embed_content(
+                model=_EMBED_MODEL,
+                contents=[t[:8192] for t in texts],
+            )
+            embs = [list(e.values) for e in (result.embeddings or []) if e.values]
+            if len(embs) == len(texts):
+                self._session_tokens += _TOKENS_PER_REQUEST * len(texts)
+                return embs
+            return None
+        except Exception as e:
+            logger.warning(f"[Google] Batch embedding failed: {e}")
+            if _is_permanent_error(e):
+                logger.warning("[Google] Permanent error — disabling for this run")
+                self.google_available = False
+            return None
+
     def get_dimension(self) -> int:
         return self.embedding_dim
 
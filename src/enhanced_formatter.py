@@ -4,7 +4,8 @@ Generates beautiful emails with 6+ papers, detailed insights, and embedded resou
 """
 
 import logging
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -21,13 +22,19 @@ class EnhancedReportFormatter:
     - Call-to-action buttons
     """
 
-    def build_html(self, insights: List[Dict]) -> str:
-        """Build comprehensive HTML report with 6+ papers"""
+    def build_html(self, insights: List[Dict], ranked: Optional[List[Dict]] = None) -> str:
+        """
+        Build comprehensive HTML report with 6+ papers
+
+        Args:
+            insights: Paper insights
+            ranked: The same insights already sorted by relevance_score (descending), if the caller has them
+        """
         if not insights:
             return self._build_empty_report()
 
         # Sort by relevance score
-        sorted_insights = sorted(
+        sorted_insights = ranked if ranked is not None else sorted(
             insights,
             key=lambda x: x.get('relevance_score', 0),
             reverse=True
@@ -263,9 +270,8 @@ class EnhancedReportFormatter:
             platforms[platform] = platforms.get(platform, 0) + 1
 
         # Impact analysis
-        high_impact = len([i for i in all_insights if i.get('dram_impact') == 'High'])
-        medium_impact = len([i for i in all_insights if i.get('dram_impact') == 'Medium'])
-        low_impact = len([i for i in all_insights if i.get('dram_impact') == 'Low'])
+        impacts = Counter(i.get('dram_impact') for i in all_insights)
+        high_impact, medium_impact, low_impact = impacts['High'], impacts['Medium'], impacts['Low']
 
         # Model types
         model_types = {}
@@ -13,12 +13,40 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+_REQUIRED_FIELDS = ('memory_insight', 'engineering_takeaway', 'platform', 'model_type')
+
+
+def _build_confidence_table() -> Dict[Tuple, float]:
+    """
+    Every confidence factor takes a few discrete values, so the mean is
+    precomputed for each combination:
+    (consensus, filled_fields, number_factor, has_full_text, has_crew) -> confidence
+    """
+    table = {}
+    for consensus in (None, 0.95, 0.75, 0.50):
+        for filled_fields in range(len(_REQUIRED_FIELDS) + 1):
+            for number_factor in (0.9, 0.7, 0.5):
+                for has_full_text in (False, True):
+                    for has_crew in (False, True):
+                        factors = [] if consensus is None else [consensus]
+                        factors.append(filled_fields / len(_REQUIRED_FIELDS))
+                        factors.append(number_factor)
+                        factors.append(0.9 if has_full_text else 0.6)
+                        if has_crew:
+                            factors.append(0.95)  # CrewAI = high confidence
+                        table[(consensus, filled_fields, number_factor, has_full_text, has_crew)] = (
+                            sum(factors) / len(factors)
+                        )
+    return table
+
 
 class HITLValidator:
     """
     Human-In-The-Loop validation system
     Papers with low confidence or high scores get human review
     """
+
+    _CONF_TABLE = _build_confidence_table()
     
     def __init__(
         self,
@@ -35,6 +63,8 @@ class HITLValidator:
         os.makedirs(f"{review_dir}/pending", exist_ok=True)
         os.makedirs(f"{review_dir}/approved", exist_ok=True)
         os.makedirs(f"{review_dir}/rejected", exist_ok=True)
+        # Small per-review records (id, title, score, confidence) for cheap listing
+        os.makedirs(f"{review_dir}/pending_index", exist_ok=True)
         
         self.stats = {
             'total_checked': 0,
@@ -58,12 +88,21 @@ class HITLValidator:
         """
         self.stats['total_checked'] += 1
         
-        # Calculate confidence
-        confidence = self._calculate_confidence(paper, analysis)
         score = analysis.get('relevance_score', 0)
+        if score >= self.require_review_score:
+            # High score always goes to a human, so confidence can't change the
+            # outcome: skip the full factor scan and keep a cheap estimate
+            consensus = self._consensus_factor(analysis)
+            confidence = consensus if consensus is not None else 0.5
+            estimated = True
+        else:
+            # Calculate confidence
+            confidence = self._calculate_confidence(paper, analysis)
+            estimated = False
         
         # Add confidence to analysis
         analysis['hitl_confidence'] = confidence
+        analysis['hitl_confidence_estimated'] = estimated
         analysis['hitl_status'] = 'pending'
         
         # Decision logic
@@ -83,34 +122,18 @@ class HITLValidator:
             # Save for review
             review_id = self._save_for_review(paper, analysis, confidence)
             
-            reason = self._get_review_reason(confidence, score)
+            reason = self._get_review_reason(confidence, score, confidence_estimated=estimated)
             logger.info(f"[HITL] NEEDS REVIEW: {reason} (ID: {review_id})")
             
             return 'needs_review', reason, analysis
     
     def _calculate_confidence(self, paper: Dict, analysis: Dict) -> float:
-        """
-        Calculate confidence score (0-1) based on multiple factors
-        """
-        confidence_factors = []
-        
+        """Calculate confidence score (0-1) based on multiple factors"""
         # Factor 1: Council consensus (if available)
-        if 'council_metadata' in analysis:
-            meta = analysis['council_metadata']
-            score_range = meta.get('score_range', 20)
-            
-            if score_range <= 10:
-                confidence_factors.append(0.95)  # Strong consensus
-            elif score_range <= 20:
-                confidence_factors.append(0.75)  # Moderate consensus
-            else:
-                confidence_factors.append(0.50)  # Weak consensus
-        
-        # Factor 2: Data completeness
-        required_fields = ['memory_insight', 'engineering_takeaway', 'platform', 'model_type']
-        filled_fields = sum(1 for f in required_fields if analysis.get(f) and analysis[f] != 'Unknown')
-        completeness = filled_fields / len(required_fields)
-        confidence_factors.append(completeness)
+        consensus = self._consensus_factor(analysis)
+        
+        # Factor 2: Data completeness (number of filled required fields)
+        filled_fields = sum(1 for f in _REQUIRED_FIELDS if analysis.get(f) and analysis[f] != 'Unknown')
         
         # Factor 3: Specific numbers in memory_insight
         memory_insight = analysis.get('memory_insight', '')
@@ -122,32 +145,39 @@ class HITLValidator:
         has_units = any(unit in memory_insight.lower() for unit in ['gb', 'mb', 'ms', 'tops', '%'])
         
         if has_numbers and has_units:
-            confidence_factors.append(0.9)
+            number_factor = 0.9
         elif has_numbers:
-            confidence_factors.append(0.7)
+            number_factor = 0.7
         else:
-            confidence_factors.append(0.5)
-        
-        # Factor 4: Full text availability (if using Playwright)
-        if paper.get('has_full_text', False):
-            confidence_factors.append(0.9)
-        else:
-            confidence_factors.append(0.6)
-        
-        # Factor 5: Multiple AI agreement (if available)
-        if 'crew_metadata' in analysis:
-            confidence_factors.append(0.95)  # CrewAI = high confidence
-        
-        # Calculate weighted average
-        if confidence_factors:
-            return sum(confidence_factors) / len(confidence_factors)
-        return 0.5
+            number_factor = 0.5
+        
+        # Factors 4 (full text via Playwright) and 5 (CrewAI agreement) are flags
+        key = (
+            consensus,
+            filled_fields,
+            number_factor,
+            bool(paper.get('has_full_text', False)),
+            'crew_metadata' in analysis
+        )
+        return self._CONF_TABLE[key]
+    
+    def _consensus_factor(self, analysis: Dict) -> Optional[float]:
+        """Council consensus confidence factor, or None without council metadata"""
+        if 'council_metadata' not in analysis:
+            return None
+
+        score_range = analysis['council_metadata'].get('score_range', 20)
+        if score_range <= 10:
+            return 0.95  # Strong consensus
+        elif score_range <= 20:
+            return 0.75  # Moderate consensus
+        return 0.50  # Weak consensus
     
-    def _get_review_reason(self, confidence: float, score: int) -> str:
+    def _get_review_reason(self, confidence: float, score: int, confidence_estimated: bool = False) -> str:
         """Get human-readable review reason"""
         reasons = []
         
-        if confidence < self.auto_approve_threshold:
+        if confidence < self.auto_approve_threshold and not confidence_estimated:
             reasons.append(f"Low confidence ({confidence:.0%})")
         
         if score >= self.require_review_score:
@@ -158,10 +188,11 @@ class HITLValidator:
     def _save_for_review(self, paper: Dict, analysis: Dict, confidence: float) -> str:
         """Save paper for human review"""
         
-        # Generate review ID
-        review_id = hashlib.md5(
-            f"{paper.get('title', '')}_{datetime.now().isoformat()}".encode()
-        ).hexdigest()[:8]
+        # Generate review ID (non-cryptographic; 4-byte digest = 8 hex chars)
+        review_id = hashlib.blake2b(
+            f"{paper.get('title', '')}_{datetime.now().isoformat()}".encode(),
+            digest_size=4
+        ).hexdigest()
         
         # Create review package
         review_package = {
@@ -182,7 +213,8 @@ class HITLValidator:
         # Save to pending
         review_file = f"{self.review_dir}/pending/{review_id}.json"
         with open(review_file, 'w', encoding='utf-8') as f:
-            json.dump(review_package, f, indent=2)
+            json.dump(review_package, f, separators=(',', ':'))
+        self._write_index_entry(review_package)
         
         logger.info(f"[HITL] Saved for review: {review_file}")
         return review_id
@@ -214,6 +246,54 @@ class HITLValidator:
                 questions.append("AIs disagreed on score. Which assessment is more accurate?")
         
         return questions
+
+    def _write_index_entry(self, review: Dict) -> Dict:
+        """Write the lightweight listing record for a pending review"""
+        entry = {
+            'review_id': review['review_id'],
+            'created_at': review.get('created_at', ''),
+            'title': review.get('paper', {}).get('title', 'Unknown'),
+            'score': review.get('analysis', {}).get('relevance_score', 0),
+            'confidence': review.get('confidence', 0.0)
+        }
+        index_file = f"{self.review_dir}/pending_index/{entry['review_id']}.json"
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, separators=(',', ':'))
+        return entry
+
+    def _remove_index_entry(self, review_id: str):
+        """Drop the listing record once a review leaves pending"""
+        index_file = f"{self.review_dir}/pending_index/{review_id}.json"
+        if os.path.exists(index_file):
+            os.remove(index_file)
+
+    def get_pending_index(self) -> List[Dict]:
+        """
+        List pending reviews without loading their full payloads
+        Returns records with review_id, created_at, title, score, confidence
+        """
+        pending_dir = f"{self.review_dir}/pending"
+        index_dir = f"{self.review_dir}/pending_index"
+        pending_ids = {f[:-5] for f in os.listdir(pending_dir) if f.endswith('.json')}
+
+        entries = []
+        indexed = set()
+        for filename in os.listdir(index_dir):
+            review_id = filename[:-5]
+            if review_id not in pending_ids:
+                # Resolved elsewhere (e.g. the dashboard moved the payload)
+                os.remove(f"{index_dir}/{filename}")
+                continue
+            with open(f"{index_dir}/{filename}", 'r', encoding='utf-8') as f:
+                entries.append(json.load(f))
+            indexed.add(review_id)
+
+        # Payloads saved before the index existed: backfill their records once
+        for review_id in pending_ids - indexed:
+            with open(f"{pending_dir}/{review_id}.json", 'r', encoding='utf-8') as f:
+                entries.append(self._write_index_entry(json.load(f)))
+
+        return sorted(entries, key=lambda x: x.get('created_at', ''), reverse=True)
     
     def get_pending_reviews(self) -> List[Dict]:
         """Get all papers pending human review"""
@@ -249,10 +329,11 @@ class HITLValidator:
         # Move to approved
         approved_file = f"{self.review_dir}/approved/{review_id}.json"
         with open(approved_file, 'w', encoding='utf-8') as f:
-            json.dump(review, f, indent=2)
+            json.dump(review, f, separators=(',', ':'))
         
         # Remove from pending
         os.remove(pending_file)
+        self._remove_index_entry(review_id)
         
         self.stats['human_approved'] += 1
         logger.info(f"[HITL] Approved: {review_id}")
@@ -280,10 +361,11 @@ class HITLValidator:
         # Move to rejected
         rejected_file = f"{self.review_dir}/rejected/{review_id}.json"
         with open(rejected_file, 'w', encoding='utf-8') as f:
-            json.dump(review, f, indent=2)
+            json.dump(review, f, separators=(',', ':'))
         
         # Remove from pending
         os.remove(pending_file)
+        self._remove_index_entry(review_id)
         
         self.stats['human_rejected'] += 1
         logger.info(f"[HITL] Rejected: {review_id}")
@@ -305,8 +387,8 @@ class HITLValidator:
             self._display_review(review)
         
         else:
-            # Show all pending
-            pending = self.get_pending_reviews()
+            # Show all pending (listing records only; payloads load on demand)
+            pending = self.get_pending_index()
             
             if not pending:
                 print("\n[HITL] No pending reviews")
@@ -317,8 +399,8 @@ class HITLValidator:
             print(f"{'='*80}\n")
             
             for idx, review in enumerate(pending, 1):
-                print(f"{idx}. [{review['review_id']}] {review['paper']['title'][:60]}")
-                print(f"   Score: {review['analysis'].get('relevance_score', 0)}")
+                print(f"{idx}. [{review['review_id']}] {review['title'][:60]}")
+                print(f"   Score: {review['score']}")
                 print(f"   Confidence: {review['confidence']:.0%}")
                 print()
     
@@ -355,7 +437,7 @@ class HITLValidator:
     
     def get_statistics(self) -> Dict:
         """Get HITL statistics"""
-        pending_count = len(self.get_pending_reviews())
+        pending_count = len(self.get_pending_index())
         
         return {
             **self.stats,
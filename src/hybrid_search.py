@@ -6,11 +6,16 @@ Combines keyword-based ranking (BM25) with semantic similarity for better retrie
 import logging
 from typing import List, Dict, Tuple, Optional
 import numpy as np
-from collections import Counter
-import math
 
 logger = logging.getLogger(__name__)
 
+# Optional JIT for the BM25 index build (NumPy fallback otherwise)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class BM25Ranker:
     """
@@ -32,11 +37,15 @@ class BM25Ranker:
         self.corpus = corpus
         self.corpus_size = len(corpus)
 
-        # Build inverted index
-        self.doc_freqs: Dict[str, List[int]] = {}  # term → [doc_ids containing term]
-        self.idf: Dict[str, float] = {}  # term → IDF value
-        self.doc_lengths = []  # Length of each document (word count)
+        # Build inverted index (CSR postings: term_id → doc_ids / term freqs)
+        self.vocab: Dict[str, int] = {}  # term → term_id
+        self.idf = np.zeros(0, dtype=np.float64)  # term_id → IDF value
+        self.doc_lengths = np.zeros(0, dtype=np.int32)  # Length of each document (word count)
         self.avg_doc_length = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.int32)
+        self._norm = np.zeros(0, dtype=np.float64)  # doc_id → BM25 length normalization
 
         self._build_index()
 
@@ -46,27 +55,33 @@ class BM25Ranker:
 
     def _build_index(self):
         """Build inverted index and calculate IDF values"""
-        for doc_id, doc in enumerate(self.corpus):
+        # Map tokens → integer ids; everything after this works on flat int arrays
+        token_ids: List[int] = []
+        doc_offsets = [0]
+        for doc in self.corpus:
             tokens = self._tokenize(doc)
-            self.doc_lengths.append(len(tokens))
-
-            # Track unique terms in document
-            unique_terms = set(tokens)
-            for term in unique_terms:
-                if term not in self.doc_freqs:
-                    self.doc_freqs[term] = []
-                self.doc_freqs[term].append(doc_id)
+            token_ids.extend(self.vocab.setdefault(term, len(self.vocab)) for term in tokens)
+            doc_offsets.append(len(token_ids))
 
-        # Calculate average document length
-        self.avg_doc_length = sum(self.doc_lengths) / self.corpus_size if self.corpus_size > 0 else 0
+        offsets = np.asarray(doc_offsets, dtype=np.int64)
+        self.doc_lengths = np.diff(offsets).astype(np.int32)
 
-        # Calculate IDF for each term
-        for term, doc_list in self.doc_freqs.items():
+        if self.vocab:
+            build_csr = _build_csr_numba if NUMBA_AVAILABLE else _build_csr_numpy
+            self._indptr, self._indices, self._tfs, df = build_csr(
+                np.asarray(token_ids, dtype=np.int32), offsets, len(self.vocab)
+            )
             # IDF = log((N - n + 0.5) / (n + 0.5))
-            n = len(doc_list)
-            self.idf[term] = math.log((self.corpus_size - n + 0.5) / (n + 0.5))
+            self.idf = np.log((self.corpus_size - df + 0.5) / (df + 0.5))
+
+        # Calculate average document length
+        self.avg_doc_length = float(self.doc_lengths.mean()) if self.corpus_size > 0 else 0
+        if self.avg_doc_length > 0:
+            self._norm = 1 - self.b + self.b * (self.doc_lengths / self.avg_doc_length)
+        else:
+            self._norm = np.ones(self.corpus_size, dtype=np.float64)
 
-        logger.info(f"[BM25] Indexed {self.corpus_size} documents with {len(self.idf)} unique terms")
+        logger.info(f"[BM25] Indexed {self.corpus_size} documents with {len(self.vocab)} unique terms")
 
     def rank(self, query: str, top_k: int = 10) -> List[Tuple[int, float]]:
         """
@@ -79,33 +94,92 @@ class BM25Ranker:
         Returns:
             List of (doc_id, score) tuples
         """
-        query_tokens = self._tokenize(query)
-        scores = [0.0] * self.corpus_size
+        doc_ids, scores = self.rank_arrays(query, top_k)
+        return list(zip(doc_ids.tolist(), scores.tolist()))
+
+    def rank_arrays(self, query: str, top_k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array form of rank(): parallel (doc_ids int64, scores float64), best first
+        """
+        scores = np.zeros(self.corpus_size, dtype=np.float64)
 
-        for term in query_tokens:
-            if term not in self.idf:
+        for term in self._tokenize(query):
+            term_id = self.vocab.get(term)
+            if term_id is None:
                 continue
 
-            idf_score = self.idf[term]
-            term_freqs = Counter(self._tokenize(self.corpus[doc_id])) if hasattr(self, 'corpus') else {}
+            # Postings for this term: every document containing it
+            start, end = self._indptr[term_id], self._indptr[term_id + 1]
+            doc_ids = self._indices[start:end]
+            term_freq = self._tfs[start:end]
 
-            # Calculate BM25 score for each document
-            for doc_id in self.doc_freqs.get(term, []):
-                doc_tokens = self._tokenize(self.corpus[doc_id])
-                term_freq = doc_tokens.count(term)
-                doc_length = self.doc_lengths[doc_id]
+            # BM25 formula
+            scores[doc_ids] += self.idf[term_id] * (
+                (self.k1 + 1) * term_freq) / (
+                self.k1 * self._norm[doc_ids] + term_freq
+            )
 
-                # BM25 formula
-                norm_factor = 1 - self.b + self.b * (doc_length / self.avg_doc_length)
-                bm25_score = idf_score * (
-                    (self.k1 + 1) * term_freq) / (
-                    self.k1 * norm_factor + term_freq
-                )
-                scores[doc_id] += bm25_score
+        # Sort (stable, so ties keep corpus order) and return top_k
+        ranked = np.argsort(-scores, kind='stable')[:top_k]
+        return ranked.astype(np.int64), scores[ranked]
 
-        # Sort and return top_k
-        ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
-        return ranked[:top_k]
+
+def _build_csr_numpy(token_ids: np.ndarray, doc_offsets: np.ndarray, vocab_size: int):
+    """
+    Vectorized CSR postings build (fallback when Numba is unavailable)
+
+    Returns:
+        (indptr, indices, tfs, df) — postings of term t are
+        indices[indptr[t]:indptr[t+1]] with frequencies tfs[indptr[t]:indptr[t+1]]
+    """
+    n_docs = len(doc_offsets) - 1
+    doc_ids = np.repeat(np.arange(n_docs, dtype=np.int64), np.diff(doc_offsets))
+
+    # One key per (term, doc) pair; np.unique sorts by term, then doc
+    keys, tfs = np.unique(token_ids.astype(np.int64) * n_docs + doc_ids, return_counts=True)
+    df = np.bincount(keys // n_docs, minlength=vocab_size).astype(np.int32)
+
+    indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+    np.cumsum(df, out=indptr[1:])
+    return indptr, (keys % n_docs).astype(np.int32), tfs.astype(np.int32), df
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _build_csr_numba(token_ids, doc_offsets, vocab_size):
+        """Two-pass CSR postings build over integer token ids (see _build_csr_numpy)"""
+        n_docs = doc_offsets.shape[0] - 1
+        df = np.zeros(vocab_size, dtype=np.int32)
+        last_doc = np.full(vocab_size, -1, dtype=np.int64)
+
+        # Pass 1: document frequency per term
+        for d in range(n_docs):
+            for j in range(doc_offsets[d], doc_offsets[d + 1]):
+                t = token_ids[j]
+                if last_doc[t] != d:
+                    last_doc[t] = d
+                    df[t] += 1
+
+        indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(df)
+        indices = np.empty(indptr[vocab_size], dtype=np.int32)
+        tfs = np.zeros(indptr[vocab_size], dtype=np.int32)
+        cursor = indptr[:vocab_size].copy()
+        slot = np.zeros(vocab_size, dtype=np.int64)
+        last_doc[:] = -1
+
+        # Pass 2: fill postings in doc order, accumulating term frequencies
+        for d in range(n_docs):
+            for j in range(doc_offsets[d], doc_offsets[d + 1]):
+                t = token_ids[j]
+                if last_doc[t] != d:
+                    last_doc[t] = d
+                    slot[t] = cursor[t]
+                    indices[cursor[t]] = d
+                    cursor[t] += 1
+                tfs[slot[t]] += 1
+
+        return indptr, indices, tfs, df
 
 
 class HybridSearchEngine:
@@ -153,69 +227,70 @@ class HybridSearchEngine:
         Returns:
             Ranked list of result dicts with 'doc_id', 'score', 'metadata'
         """
-        results = {}  # doc_id → combined_score
+        # Union of candidate doc_ids (dict keeps first-seen order for stable ties)
+        slots: Dict = {}
+        semantic_ids: List = []
+        semantic_scores = np.zeros(0, dtype=np.float32)
+        metadata: Dict = {}
+        keyword_ids: List = []
+        keyword_scores = np.zeros(0, dtype=np.float64)
 
         # 1. Semantic search (if embedding available and not keyword_only)
         if embedding is not None and not keyword_only:
             semantic_results = self.vector_store.similarity_search(embedding, top_k * 2)
-
-            # Normalize semantic scores to [0, 1]
-            max_semantic_score = max([s[1] for s in semantic_results]) if semantic_results else 1.0
-
-            for doc_id, similarity, metadata in semantic_results:
-                normalized_score = similarity / max_semantic_score if max_semantic_score > 0 else 0
-                results[doc_id] = {
-                    'semantic_score': similarity,
-                    'normalized_semantic': normalized_score,
-                    'metadata': metadata,
-                    'combined_score': 0  # Will be set below
-                }
+            if semantic_results:
+                semantic_ids, sims, metas = zip(*semantic_results)
+                semantic_scores = np.asarray(sims, dtype=np.float32)
+                metadata = dict(zip(semantic_ids, metas))
+                for doc_id in semantic_ids:
+                    slots.setdefault(doc_id, len(slots))
 
         # 2. Keyword search BM25 (if not semantic_only)
         if not semantic_only:
-            keyword_results = self.bm25.rank(query, top_k * 2)
-
-            # Normalize BM25 scores to [0, 1]
-            max_keyword_score = max([s[1] for s in keyword_results]) if keyword_results else 1.0
-
-            for doc_id, bm25_score in keyword_results:
-                normalized_score = bm25_score / max_keyword_score if max_keyword_score > 0 else 0
-
-                if doc_id in results:
-                    results[doc_id]['keyword_score'] = bm25_score
-                    results[doc_id]['normalized_keyword'] = normalized_score
-                else:
-                    results[doc_id] = {
-                        'semantic_score': 0,
-                        'normalized_semantic': 0,
-                        'keyword_score': bm25_score,
-                        'normalized_keyword': normalized_score,
-                        'metadata': {},
-                        'combined_score': 0
-                    }
-
-        # 3. Combine scores using weighted sum
-        for doc_id, result_dict in results.items():
-            semantic_part = result_dict.get('normalized_semantic', 0) * self.alpha
-            keyword_part = result_dict.get('normalized_keyword', 0) * (1 - self.alpha)
-            result_dict['combined_score'] = semantic_part + keyword_part
-
-        # 4. Sort by combined score and return top_k
-        ranked = sorted(
-            [(doc_id, data) for doc_id, data in results.items()],
-            key=lambda x: x[1]['combined_score'],
-            reverse=True
-        )
+            kw_ids, keyword_scores = self.bm25.rank_arrays(query, top_k * 2)
+            keyword_ids = kw_ids.tolist()
+            for doc_id in keyword_ids:
+                slots.setdefault(doc_id, len(slots))
+
+        if not slots:
+            return []
+
+        # 3. Scatter normalized [0, 1] scores into aligned vectors and fuse
+        n = len(slots)
+        semantic = np.zeros(n, dtype=np.float64)
+        keyword = np.zeros(n, dtype=np.float64)
+        normalized_semantic = np.zeros(n, dtype=np.float64)
+        normalized_keyword = np.zeros(n, dtype=np.float64)
+
+        if len(semantic_ids):
+            idx = np.fromiter((slots[d] for d in semantic_ids), dtype=np.int64, count=len(semantic_ids))
+            semantic[idx] = semantic_scores
+            max_semantic_score = semantic_scores.max()
+            if max_semantic_score > 0:
+                normalized_semantic[idx] = semantic_scores / max_semantic_score
+
+        if len(keyword_ids):
+            idx = np.fromiter((slots[d] for d in keyword_ids), dtype=np.int64, count=len(keyword_ids))
+            keyword[idx] = keyword_scores
+            max_keyword_score = keyword_scores.max()
+            if max_keyword_score > 0:
+                normalized_keyword[idx] = keyword_scores / max_keyword_score
+
+        combined = self.alpha * normalized_semantic + (1 - self.alpha) * normalized_keyword
+
+        # 4. Select top_k by combined score (stable, so ties keep insertion order)
+        ranked = np.argsort(-combined, kind='stable')[:top_k]
+        doc_ids = list(slots)
 
         return [
             {
-                'doc_id': doc_id,
-                'score': data['combined_score'],
-                'semantic_score': data.get('semantic_score', 0),
-                'keyword_score': data.get('keyword_score', 0),
-                'metadata': data.get('metadata', {})
+                'doc_id': doc_ids[i],
+                'score': float(combined[i]),
+                'semantic_score': float(semantic[i]),
+                'keyword_score': float(keyword[i]),
+                'metadata': metadata.get(doc_ids[i], {})
             }
-            for doc_id, data in ranked[:top_k]
+            for i in ranked
         ]
 
 
@@ -4,10 +4,18 @@ Filters out irrelevant noise before expensive analysis.
 """
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from src.multimodel_orchestrator import MultiModelOrchestrator
 
 logger = logging.getLogger(__name__)
 
+# Whole-word keywords for the heuristic pre-filter (substring matching let
+# e.g. "memorycardreader" through to the LLM judge)
+_KEYS = frozenset(['on-device', 'mobile', 'edge', 'memory', 'dram', 'quantization', 'npu', 'latency', 'bandwidth'])
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
 class RelevanceJudge:
     def __init__(self, orchestrator: MultiModelOrchestrator):
         self.orchestrator = orchestrator
@@ -18,15 +26,43 @@ class RelevanceJudge:
         Returns True/False.
         """
         # 1. Keyword Heuristic (Fastest)
+        if not self._keyword_pass(article):
+            return False
+
+        # 2. LLM Judge (More accurate)
+        return self._llm_judge_one(article)
+
+    def is_relevant_batch(self, articles: List[dict], max_workers: int = 16) -> List[bool]:
+        """
+        Judges many articles, returning one bool per article in input order.
+        The keyword heuristic runs inline; only articles that pass it are
+        sent to the LLM judge, concurrently.
+        """
+        results = [self._keyword_pass(article) for article in articles]
+        ambiguous = [i for i, passed in enumerate(results) if passed]
+        if not ambiguous:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ambiguous))) as ex:
+            verdicts = ex.map(self._llm_judge_one, (articles[i] for i in ambiguous))
+            for i, verdict in zip(ambiguous, verdicts):
+                results[i] = verdict
+        return results
+
+    def _keyword_pass(self, article: dict) -> bool:
+        """Keyword heuristic: False means the article is almost certainly noise"""
         text = (article.get('title', '') + " " + article.get('summary', '')).lower()
-        keywords = ['on-device', 'mobile', 'edge', 'memory', 'dram', 'quantization', 'npu', 'latency', 'bandwidth']
-        
+        tokens = set(_TOKEN_RE.findall(text))
+        tokens.update(part for token in tuple(tokens) if '-' in token for part in token.split('-'))
+
         # If no keywords found, it's likely noise (unless it's a GitHub release)
-        if not any(k in text for k in keywords) and "github" not in article.get('source', '').lower():
+        if _KEYS.isdisjoint(tokens) and "github" not in article.get('source', '').lower():
             logger.info(f"[-] Judge: Keyword reject '{article['title'][:30]}'")
             return False
+        return True
 
-        # 2. LLM Judge (More accurate)
+    def _llm_judge_one(self, article: dict) -> bool:
+        """Single LLM relevance call; fails open"""
         summary_text = article.get('summary', '')
         if not summary_text or len(summary_text) < 10:
             summary_text = "No summary provided. Judge based on the Title alone. If the Title mentions a known AI library, score it highly."
@@ -6,15 +6,18 @@ Uses Graph RAG, embeddings, and structured knowledge extraction for scalable res
 import json
 import os
 import pickle
+import struct
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple, Set
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+from itertools import chain
 import logging
 import hashlib
 
 # Core dependencies
 import numpy as np
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from enum import Enum
 logger = logging.getLogger(__name__)
 
@@ -26,10 +29,74 @@ except ImportError:
     logger.warning("sentence-transformers not installed. Vector search will be disabled.")
     EMBEDDINGS_AVAILABLE = False
 
+# Optional ANN backend for VectorStore (NumPy brute force otherwise)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Optional SIMD-specialized (AVX-512/NEON) distance kernels for brute-force search
+try:
+    import simsimd as simd
+    SIMSIMD_AVAILABLE = hasattr(simd, 'cdist')
+except ImportError:
+    SIMSIMD_AVAILABLE = False
 
 
 logger = logging.getLogger(__name__)
 
+# File header for pickles written with out-of-band buffers (see _dump_oob)
+_OOB_MAGIC = b"DEAPKL5\n"
+
+
+def _dump_oob(obj, f):
+    """
+    Pickle protocol 5 with NumPy array buffers written out-of-band:
+    magic | payload_len, n_buffers | payload | (buffer_len | buffer bytes)*
+    Arrays are copied as raw bytes instead of going through the pickle stream.
+    """
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    f.write(_OOB_MAGIC)
+    f.write(struct.pack('<QQ', len(payload), len(buffers)))
+    f.write(payload)
+    for buf in buffers:
+        raw = buf.raw()
+        f.write(struct.pack('<Q', raw.nbytes))
+        f.write(raw)
+
+
+def _load_oob(f):
+    """Inverse of _dump_oob; falls back to a plain pickle.load for older files"""
+    if f.read(len(_OOB_MAGIC)) != _OOB_MAGIC:
+        f.seek(0)
+        return pickle.load(f)
+    payload_len, n_buffers = struct.unpack('<QQ', f.read(16))
+    payload = f.read(payload_len)
+    buffers = []
+    for _ in range(n_buffers):
+        (size,) = struct.unpack('<Q', f.read(8))
+        buf = bytearray(size)  # writable, so loaded arrays are too
+        f.readinto(buf)
+        buffers.append(buf)
+    return pickle.loads(payload, buffers=buffers)
+
+
+def _paper_timestamp(date_str) -> Optional[float]:
+    """Epoch seconds for a naive ISO date; None where the date filters used to skip the paper"""
+    try:
+        paper_date = datetime.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    # Aware datetimes could never be compared with the naive cutoff
+    return paper_date.timestamp() if paper_date.tzinfo is None else None
+
+
+def _pair_key(a: str, b: str) -> Tuple[str, str]:
+    """Direction-independent key for the edge index"""
+    return (a, b) if a <= b else (b, a)
+
 
 class ResearchEntity(Enum):
     """Entity types in research knowledge graph"""
@@ -85,10 +152,20 @@ class KnowledgeGraph:
         self.edges: List[ResearchEdge] = []
         self.entity_index: Dict[ResearchEntity, Set[str]] = defaultdict(set)
         self.adjacency: Dict[str, List[str]] = defaultdict(list)
+        # Outgoing neighbors by relationship: source_id → relationship → [target_id]
+        self.adj_out: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        # Edges between an (unordered) node pair, in insertion order
+        self._edge_index: Dict[Tuple[str, str], List[ResearchEdge]] = defaultdict(list)
+        # entity_type → materialized node list; dropped whenever a node of that type changes
+        self._type_cache: Dict[ResearchEntity, List[ResearchNode]] = {}
         self.load()
     
     def add_node(self, node: ResearchNode) -> str:
         """Add node to graph"""
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            self._type_cache.pop(previous.entity_type, None)
+        self._type_cache.pop(node.entity_type, None)
         self.nodes[node.id] = node
         self.entity_index[node.entity_type].add(node.id)
         logger.debug(f"Added node: {node.id} ({node.entity_type.value})")
@@ -99,21 +176,23 @@ class KnowledgeGraph:
         self.edges.append(edge)
         self.adjacency[edge.source_id].append(edge.target_id)
         self.adjacency[edge.target_id].append(edge.source_id)  # Bidirectional
+        self.adj_out[edge.source_id][edge.relationship].append(edge.target_id)
+        self._edge_index[_pair_key(edge.source_id, edge.target_id)].append(edge)
         logger.debug(f"Added edge: {edge.source_id} -> {edge.target_id} ({edge.relationship})")
     
     def get_neighbors(self, node_id: str, relationship: Optional[str] = None) -> List[ResearchNode]:
-        """Get neighboring nodes"""
-        neighbors = []
-        for edge in self.edges:
-            if edge.source_id == node_id:
-                if relationship is None or edge.relationship == relationship:
-                    if edge.target_id in self.nodes:
-                        neighbors.append(self.nodes[edge.target_id])
-        return neighbors
+        """Get neighboring nodes (targets of outgoing edges), O(deg) via adj_out"""
+        by_rel = self.adj_out.get(node_id, {})
+        if relationship is None:
+            targets = chain.from_iterable(by_rel.values())
+        else:
+            targets = by_rel.get(relationship, [])
+        return [self.nodes[t] for t in targets if t in self.nodes]
     
     def find_paths(self, start_id: str, end_id: str, max_depth: int = 3) -> List[List[str]]:
         """Find paths between two nodes (for relationship discovery)"""
         paths = []
+        on_path = {start_id}  # path's members, for O(1) cycle checks
         
         def dfs(current: str, target: str, path: List[str], depth: int):
             if depth > max_depth:
@@ -123,9 +202,11 @@ class KnowledgeGraph:
                 return
             
             for neighbor in self.adjacency.get(current, []):
-                if neighbor not in path:
+                if neighbor not in on_path:
                     path.append(neighbor)
+                    on_path.add(neighbor)
                     dfs(neighbor, target, path, depth + 1)
+                    on_path.discard(neighbor)
                     path.pop()
         
         dfs(start_id, end_id, [start_id], 0)
@@ -134,12 +215,13 @@ class KnowledgeGraph:
     def get_subgraph(self, center_id: str, radius: int = 2) -> Tuple[Dict, List]:
         """Get subgraph around a node (for context)"""
         visited = set()
-        queue = [(center_id, 0)]
+        queue = deque([(center_id, 0)])
         subgraph_nodes = {}
         subgraph_edges = []
+        seen_edges = set()
         
         while queue:
-            node_id, depth = queue.pop(0)
+            node_id, depth = queue.popleft()
             if node_id in visited or depth > radius:
                 continue
             
@@ -152,25 +234,27 @@ class KnowledgeGraph:
                     queue.append((neighbor_id, depth + 1))
                 
                 # Add edges in subgraph
-                for edge in self.edges:
-                    if (edge.source_id == node_id and edge.target_id == neighbor_id) or \
-                       (edge.source_id == neighbor_id and edge.target_id == node_id):
-                        if edge not in subgraph_edges:
-                            subgraph_edges.append(edge)
+                for edge in self._edge_index.get(_pair_key(node_id, neighbor_id), ()):
+                    if id(edge) not in seen_edges:
+                        seen_edges.add(id(edge))
+                        subgraph_edges.append(edge)
         
         return subgraph_nodes, subgraph_edges
     
     def get_entities_by_type(self, entity_type: ResearchEntity) -> List[ResearchNode]:
-        """Get all nodes of a specific type"""
-        node_ids = self.entity_index.get(entity_type, set())
-        return [self.nodes[nid] for nid in node_ids if nid in self.nodes]
+        """Get all nodes of a specific type (cached list shared between calls: do not mutate)"""
+        cached = self._type_cache.get(entity_type)
+        if cached is None:
+            node_ids = self.entity_index.get(entity_type, set())
+            cached = self._type_cache[entity_type] = [self.nodes[nid] for nid in node_ids if nid in self.nodes]
+        return cached
     
     def save(self):
         """Persist graph to disk"""
         try:
             os.makedirs(os.path.dirname(self.graph_path), exist_ok=True)
             with open(self.graph_path, 'wb') as f:
-                pickle.dump({
+                _dump_oob({
                     'nodes': self.nodes,
                     'edges': self.edges,
                     'entity_index': self.entity_index,
@@ -180,16 +264,26 @@ class KnowledgeGraph:
         except Exception as e:
             logger.error(f"Failed to save graph: {e}")
     
+    def _rebuild_edge_indexes(self):
+        """Recompute derived edge lookups (not persisted) from self.edges"""
+        self.adj_out = defaultdict(lambda: defaultdict(list))
+        self._edge_index = defaultdict(list)
+        self._type_cache = {}
+        for edge in self.edges:
+            self.adj_out[edge.source_id][edge.relationship].append(edge.target_id)
+            self._edge_index[_pair_key(edge.source_id, edge.target_id)].append(edge)
+
     def load(self):
         """Load graph from disk"""
         try:
             if os.path.exists(self.graph_path):
                 with open(self.graph_path, 'rb') as f:
-                    data = pickle.load(f)
+                    data = _load_oob(f)
                     self.nodes = data['nodes']
                     self.edges = data['edges']
                     self.entity_index = data['entity_index']
                     self.adjacency = data['adjacency']
+                self._rebuild_edge_indexes()
                 logger.info(f"Loaded graph: {len(self.nodes)} nodes, {len(self.edges)} edges")
         except Exception as e:
             logger.warning(f"Could not load graph: {e}")
@@ -198,44 +292,316 @@ class KnowledgeGraph:
 class VectorStore:
     """
     Local Vector Database using Numpy for math and Pickle for storage.
+    Embeddings live in one contiguous [N, D] float32 matrix (struct-of-arrays
+    with a parallel id list), searched with SimSIMD or BLAS, or through a
+    FAISS inner-product index over the normalized rows when faiss is installed.
     """
-    def __init__(self, store_path: str = "data/vector_store.pkl"):
+    def __init__(self, store_path: str = "data/vector_store.pkl", index_type: str = "flat", quantize: bool = False):
+        """
+        Args:
+            store_path: Pickle file for vectors and metadata
+            index_type: FAISS index when available: 'flat' (exact IndexFlatIP)
+                or 'hnsw' (approximate IndexHNSWFlat, for large stores)
+            quantize: Also keep int8 codes of the rows with per-row scales and
+                search those (4x less bandwidth, approximate scores; bypasses FAISS)
+        """
+        if index_type not in ("flat", "hnsw"):
+            raise ValueError("index_type must be 'flat' or 'hnsw'")
         self.store_path = store_path
-        self.embeddings: Dict[str, np.ndarray] = {} # This holds the vectors
+        self.index_type = index_type
+        self.quantize = quantize
         self.metadata: Dict[str, Dict] = {}
+
+        # Struct-of-arrays storage; rows [0, _size) are in use, dead rows are tombstoned
+        self._raw = np.zeros((0, 0), dtype=np.float32)  # row → embedding
+        self._inv_norm = np.zeros(0, dtype=np.float32)  # row → 1/‖e‖ (0 for zero vectors)
+        self._alive = np.zeros(0, dtype=bool)  # row → not deleted
+        self._size = 0
+        self._n_dead = 0
+        self._ids: List[str] = []  # row → doc_id
+        self._id_to_row: Dict[str, int] = {}
+
+        # Derived search structures, synced lazily from the rows above
+        self._synced_rows = 0  # rows already reflected in _index / _codes
+        self._stale = True  # full rebuild needed (overwrite, delete, load)
+        self._index = None  # FAISS index over normalized rows
+        self._codes: Optional[np.ndarray] = None  # int8 codes (quantize)
+        self._scales: Optional[np.ndarray] = None  # row → int8 dequantization scale
+        self._code_norms: Optional[np.ndarray] = None  # row → ‖codes‖ (NumPy int8 fallback)
         self.load() # Load existing vectors from disk on startup
 
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    @property
+    def embeddings(self) -> Dict[str, np.ndarray]:
+        """Read-only doc_id → embedding view (rows of the contiguous matrix)"""
+        return {doc_id: self._raw[row] for doc_id, row in self._id_to_row.items()}
+
     def add_embedding(self, doc_id: str, embedding: np.ndarray, metadata: Dict):
-        """Stores the vector in the local dictionary"""
-        self.embeddings[doc_id] = embedding
+        """Stores the vector as a row of the embedding matrix"""
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        # Checked before a row is reserved so a rejected vector leaves no trace
+        if self._raw.shape[1] and vec.shape[0] != self._raw.shape[1]:
+            raise ValueError(f"Embedding dimension {vec.shape[0]} != store dimension {self._raw.shape[1]}")
+        row = self._id_to_row.get(doc_id)
+        if row is None:
+            self._reserve(1, vec.shape[0])
+            row = self._size
+            self._size += 1
+            self._ids.append(doc_id)
+            self._id_to_row[doc_id] = row
+            self._alive[row] = True
+        else:
+            self._stale = True  # Overwrite: derived index rows must be replaced
+
+        self._raw[row] = vec
+        self._inv_norm[row] = self._inverse_norm(vec)
         self.metadata[doc_id] = metadata
 
-    def similarity_search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Tuple[str, float, Dict]]:
-        """Performs Cosine Similarity math to find the closest research papers"""
-        if not self.embeddings: return []
-        
-        similarities = []
-        for doc_id, emb in self.embeddings.items():
-            # Math: Cosine Similarity
-            sim = np.dot(query_embedding, emb) / (np.linalg.norm(query_embedding) * np.linalg.norm(emb))
-            similarities.append((doc_id, float(sim), self.metadata.get(doc_id, {})))
-        
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:top_k]
+    def remove_embedding(self, doc_id: str) -> bool:
+        """Tombstone a document; storage is compacted once half the rows are dead"""
+        row = self._id_to_row.pop(doc_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._n_dead += 1
+        self.metadata.pop(doc_id, None)
+        self._stale = True
+        if self._n_dead * 2 > self._size:
+            self._compact()
+        return True
+
+    @staticmethod
+    def _inverse_norm(vec: np.ndarray) -> float:
+        """1/‖e‖ via vdot (avoids np.linalg.norm's generic axis/ord dispatch)"""
+        norm_sq = float(np.vdot(vec, vec))
+        return 1.0 / np.sqrt(norm_sq) if norm_sq > 0 else 0.0
+
+    def _reserve(self, extra: int, dim: int):
+        """Grow the row buffers geometrically so appends are amortized O(D)"""
+        if self._raw.shape[1] == 0 and self._size == 0:
+            self._raw = np.zeros((0, dim), dtype=np.float32)
+        needed = self._size + extra
+        capacity = self._raw.shape[0]
+        if needed <= capacity:
+            return
+        capacity = max(16, capacity * 2, needed)
+        raw = np.zeros((capacity, self._raw.shape[1]), dtype=np.float32)
+        raw[:self._size] = self._raw[:self._size]
+        inv_norm = np.zeros(capacity, dtype=np.float32)
+        inv_norm[:self._size] = self._inv_norm[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._raw, self._inv_norm, self._alive = raw, inv_norm, alive
+
+    def _compact(self):
+        """Drop tombstoned rows and renumber"""
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._raw = self._raw[keep]
+        self._inv_norm = self._inv_norm[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._ids = [self._ids[i] for i in keep]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._size = len(keep)
+        self._n_dead = 0
+        self._stale = True
+
+    def _normalized_rows(self, start: int, stop: int) -> np.ndarray:
+        """Unit-length copies of rows [start, stop)"""
+        return self._raw[start:stop] * self._inv_norm[start:stop, None]
+
+    @staticmethod
+    def _quantize(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric per-row int8 quantization: rows ≈ codes * scales[:, None]"""
+        scales = np.abs(rows).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.round(rows / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _new_index(self, dim: int):
+        """Empty FAISS index; inner product over unit rows = cosine"""
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+            index.hnsw.efSearch = 64
+            return index
+        return faiss.IndexFlatIP(dim)
+
+    def _sync_derived(self, build_index: bool = True):
+        """Bring the FAISS index / int8 codes up to date with the rows"""
+        if self._stale:
+            self._synced_rows = 0
+            self._index = None
+            self._codes = self._scales = self._code_norms = None
+            self._stale = False
+        start, stop = self._synced_rows, self._size
+        if start == stop:
+            return
+
+        # Append-only since last sync: extend instead of rebuilding
+        rows = self._normalized_rows(start, stop)
+        if self.quantize:
+            codes, scales = self._quantize(rows)
+            code_norms = np.sqrt(np.einsum('ij,ij->i', codes, codes, dtype=np.float32))
+            if self._codes is None:
+                self._codes, self._scales, self._code_norms = codes, scales, code_norms
+            else:
+                self._codes = np.vstack([self._codes, codes])
+                self._scales = np.concatenate([self._scales, scales])
+                self._code_norms = np.concatenate([self._code_norms, code_norms])
+        elif FAISS_AVAILABLE and build_index:
+            if self._index is None:
+                self._index = self._new_index(rows.shape[1])
+            self._index.add(rows)
+        self._synced_rows = stop
+
+    def similarity_search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        filters: Optional[Dict] = None
+    ) -> List[Tuple[str, float, Dict]]:
+        """
+        Performs Cosine Similarity math to find the closest research papers
+
+        Args:
+            query_embedding: Query vector
+            top_k: Number of results to return
+            filters: Optional metadata equality filters, e.g. {'platform': 'Mobile'}
+        """
+        if not self._id_to_row or top_k <= 0: return []
+        self._sync_derived()
+
+        q = np.asarray(query_embedding, dtype=np.float32).ravel()
+        q_sq = np.vdot(q, q)
+        if q_sq == 0: return []
+        q = q / np.sqrt(q_sq)
+
+        if self._index is not None and not filters:
+            k = min(top_k + self._n_dead, self._size)
+            scores, rows = self._index.search(q[None, :], k)
+            return [
+                (self._ids[i], float(score), self.metadata.get(self._ids[i], {}))
+                for score, i in zip(scores[0], rows[0]) if i >= 0 and self._alive[i]
+            ][:top_k]
+
+        # Math: Cosine Similarity over every row in one kernel call
+        sims = self._cosine_scores(q)
+
+        valid = self._alive[:self._size]
+        if filters:
+            valid = valid & np.fromiter(
+                (all(self.metadata.get(doc_id, {}).get(k) == v for k, v in filters.items()) for doc_id in self._ids),
+                dtype=bool, count=self._size
+            )
+        if self._n_dead or filters:
+            sims = np.where(valid, sims, -np.inf)
+            top_k = min(top_k, int(valid.sum()))
+
+        top_idx = self._top_k_indices(sims, top_k)
+        return [(self._ids[i], float(sims[i]), self.metadata.get(self._ids[i], {})) for i in top_idx]
+
+    def _cosine_scores(self, q: np.ndarray) -> np.ndarray:
+        """Cosine similarity of unit query q against every stored row"""
+        if self.quantize:
+            # Per-row scales cancel in cosine, so compare the int8 codes directly
+            q_codes = self._quantize(q[None, :])[0][0]
+            if SIMSIMD_AVAILABLE:
+                return 1.0 - np.asarray(simd.cdist(q_codes[None, :], self._codes, metric='cosine'))[0]
+            q_codes = q_codes.astype(np.float32)
+            code_norms = self._code_norms * np.sqrt(np.vdot(q_codes, q_codes))
+            code_norms[code_norms == 0] = 1.0
+            return (self._codes @ q_codes) / code_norms
+        if SIMSIMD_AVAILABLE:
+            return 1.0 - np.asarray(simd.cdist(q[None, :], self._raw[:self._size], metric='cosine'))[0]
+        # Row norms were cached at insert; scale in place rather than allocating another N-vector
+        sims = self._raw[:self._size] @ q
+        sims *= self._inv_norm[:self._size]
+        return sims
+
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Indices of the top_k scores, best first (O(N) partition + O(k log k) sort).
+        Same result as a full stable sort: ties at the k-th score keep row order.
+        """
+        if top_k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if top_k < len(scores):
+            kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:top_k - len(above)]
+            candidates = np.concatenate([above, ties])
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
 
     def save(self):
-        """Persists all vectors to a local file"""
+        """Persists all vectors to a local file (plus the HNSW graph, which is costly to rebuild)"""
+        if self._n_dead:
+            self._compact()
         os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        # Matrix goes to a .npy sidecar (one header + raw rows, mmap-able on load).
+        # Write-then-rename: the current matrix may itself be mapped from that file.
+        matrix_path = self.store_path + ".npy"
+        with open(matrix_path + ".tmp", 'wb') as f:
+            np.save(f, self._raw[:self._size])
+        os.replace(matrix_path + ".tmp", matrix_path)
         with open(self.store_path, 'wb') as f:
-            pickle.dump({'embeddings': self.embeddings, 'metadata': self.metadata}, f)
+            _dump_oob({
+                'ids': self._ids,
+                'matrix_file': os.path.basename(matrix_path),
+                'metadata': self.metadata
+            }, f)
+        if FAISS_AVAILABLE and self.index_type == "hnsw" and not self.quantize and self._size:
+            self._sync_derived()
+            faiss.write_index(self._index, self.store_path + ".faiss")
 
     def load(self):
         """Loads vectors from the .pkl file"""
         if os.path.exists(self.store_path):
             with open(self.store_path, 'rb') as f:
-                data = pickle.load(f)
-                self.embeddings = data.get('embeddings', {})
-                self.metadata = data.get('metadata', {})
+                data = _load_oob(f)
+            self.metadata = data.get('metadata', {})
+            if 'matrix_file' in data:
+                # Copy-on-write mapping: pages load on demand, in-place row updates stay private
+                ids = list(data['ids'])
+                matrix = np.load(os.path.join(os.path.dirname(self.store_path), data['matrix_file']), mmap_mode='c')
+                if matrix.shape[0] != len(ids):
+                    logger.error(f"Vector store matrix has {matrix.shape[0]} rows for {len(ids)} ids; ignoring saved vectors")
+                    ids, matrix = [], np.zeros((0, 0), dtype=np.float32)
+            elif 'matrix' in data:
+                ids, matrix = list(data['ids']), np.asarray(data['matrix'], dtype=np.float32)
+            else:
+                # Legacy layout: {'embeddings': {doc_id: vector}}
+                legacy = data.get('embeddings', {})
+                ids = list(legacy.keys())
+                matrix = (np.stack([np.asarray(e, dtype=np.float32).ravel() for e in legacy.values()])
+                          if legacy else np.zeros((0, 0), dtype=np.float32))
+            self._set_rows(ids, matrix)
+
+            index_path = self.store_path + ".faiss"
+            if (FAISS_AVAILABLE and self.index_type == "hnsw" and not self.quantize
+                    and self._size and os.path.exists(index_path)):
+                index = faiss.read_index(index_path)
+                if index.ntotal == self._size:
+                    self._index = index
+                    self._synced_rows = self._size
+                    self._stale = False
+
+    def _set_rows(self, ids: List[str], matrix: np.ndarray):
+        """Replace storage with the given rows"""
+        self._raw = np.ascontiguousarray(matrix, dtype=np.float32)
+        norm_sq = np.einsum('ij,ij->i', self._raw, self._raw)
+        self._inv_norm = np.zeros(len(ids), dtype=np.float32)
+        np.divide(1.0, np.sqrt(norm_sq), out=self._inv_norm, where=norm_sq > 0)
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._ids = ids
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(ids)}
+        self._size = len(ids)
+        self._n_dead = 0
+        self._stale = True
 
 class ChainOfThoughtReasoner:
     """
@@ -260,50 +626,49 @@ class ChainOfThoughtReasoner:
             "conclusions": []
         }
         
-        # Step 1: Observe individual papers
+        # Steps 1-2 in a single pass: observations plus pattern histograms
+        approaches = Counter()
+        impacts = Counter()
+        platforms = Counter()
+        high_techniques = set()
+        low_techniques = set()
+        
         for paper in papers:
-            observation = {
+            approach = paper.get('quantization_method', 'Unknown')
+            impact = paper.get('dram_impact', 'Unknown')
+            reasoning_chain["observations"].append({
                 "paper": paper.get('title', 'Unknown'),
                 "key_finding": paper.get('memory_insight', 'N/A'),
-                "approach": paper.get('quantization_method', 'Unknown'),
-                "impact": paper.get('dram_impact', 'Unknown')
-            }
-            reasoning_chain["observations"].append(observation)
-        
-        # Step 2: Identify patterns
-        approaches = defaultdict(int)
-        impacts = defaultdict(int)
-        platforms = defaultdict(int)
-        
-        for paper in papers:
-            approaches[paper.get('quantization_method', 'Unknown')] += 1
-            impacts[paper.get('dram_impact', 'Unknown')] += 1
+                "approach": approach,
+                "impact": impact
+            })
+            approaches[approach] += 1
+            impacts[impact] += 1
             platforms[paper.get('platform', 'Unknown')] += 1
+            if impact == 'High':
+                high_techniques.add(paper.get('quantization_method', ''))
+            elif impact == 'Low':
+                low_techniques.add(paper.get('quantization_method', ''))
         
         # Most common approach
         if approaches:
-            top_approach = max(approaches.items(), key=lambda x: x[1])
+            top_approach = approaches.most_common(1)[0]
             if top_approach[1] >= 3:
                 reasoning_chain["patterns"].append(
                     f"Dominant approach: {top_approach[0]} ({top_approach[1]} papers)"
                 )
         
         # Platform focus
-        if platforms:
-            for platform, count in platforms.items():
-                if count >= len(papers) * 0.3:  # 30%+
-                    reasoning_chain["patterns"].append(
-                        f"{platform} focus in {count}/{len(papers)} papers"
-                    )
+        min_count = len(papers) * 0.3  # 30%+
+        for platform, count in platforms.items():
+            if count >= min_count:
+                reasoning_chain["patterns"].append(
+                    f"{platform} focus in {count}/{len(papers)} papers"
+                )
         
         # Step 3: Detect contradictions
-        high_impact_papers = [p for p in papers if p.get('dram_impact') == 'High']
-        low_impact_papers = [p for p in papers if p.get('dram_impact') == 'Low']
-        
-        if high_impact_papers and low_impact_papers:
+        if high_techniques and low_techniques:
             # Check if using same techniques with different results
-            high_techniques = set(p.get('quantization_method', '') for p in high_impact_papers)
-            low_techniques = set(p.get('quantization_method', '') for p in low_impact_papers)
             overlap = high_techniques & low_techniques
             
             if overlap:
@@ -312,7 +677,7 @@ class ChainOfThoughtReasoner:
                 )
         
         # Step 4: Identify gaps
-        covered_platforms = set(p.get('platform') for p in papers)
+        covered_platforms = platforms.keys()
         all_platforms = {'Mobile', 'Laptop', 'Both'}
         missing_platforms = all_platforms - covered_platforms
         
@@ -327,7 +692,7 @@ class ChainOfThoughtReasoner:
                 f"Research trend: {reasoning_chain['patterns'][0]}"
             )
         
-        if len(high_impact_papers) > len(low_impact_papers):
+        if impacts['High'] > impacts['Low']:
             reasoning_chain["conclusions"].append(
                 "Research focusing on high DRAM impact solutions"
             )
@@ -343,46 +708,39 @@ class ChainOfThoughtReasoner:
         """
         Generate rich contextual prompt using CoT reasoning
         """
-        prompt = "RESEARCH CONTEXT (Chain-of-Thought Analysis):\n\n"
+        parts = ["RESEARCH CONTEXT (Chain-of-Thought Analysis):\n\n"]
         
         # 1. Similar historical papers
         if similar_papers:
-            prompt += "SIMILAR PREVIOUS RESEARCH:\n"
+            parts.append("SIMILAR PREVIOUS RESEARCH:\n")
             for i, paper in enumerate(similar_papers[:3], 1):
-                prompt += f"{i}. {paper.get('title', 'Unknown')}\n"
-                prompt += f"   Finding: {paper.get('memory_insight', 'N/A')}\n"
-                prompt += f"   Approach: {paper.get('quantization_method', 'Unknown')}\n"
-                prompt += f"   Impact: {paper.get('dram_impact', 'Unknown')}\n\n"
+                parts.append(
+                    f"{i}. {paper.get('title', 'Unknown')}\n"
+                    f"   Finding: {paper.get('memory_insight', 'N/A')}\n"
+                    f"   Approach: {paper.get('quantization_method', 'Unknown')}\n"
+                    f"   Impact: {paper.get('dram_impact', 'Unknown')}\n\n"
+                )
         
         # 2. Graph-based relationships
         if graph_context.get('related_techniques'):
-            prompt += "RELATED TECHNIQUES IN KNOWLEDGE GRAPH:\n"
-            for tech in graph_context['related_techniques'][:3]:
-                prompt += f"- {tech}\n"
-            prompt += "\n"
+            parts.append("RELATED TECHNIQUES IN KNOWLEDGE GRAPH:\n")
+            parts.extend(f"- {tech}\n" for tech in graph_context['related_techniques'][:3])
+            parts.append("\n")
         
         # 3. Trend analysis
-        if trend_analysis.get('patterns'):
-            prompt += "OBSERVED PATTERNS:\n"
-            for pattern in trend_analysis['patterns']:
-                prompt += f"- {pattern}\n"
-            prompt += "\n"
-        
-        if trend_analysis.get('contradictions'):
-            prompt += "CONTRADICTIONS TO INVESTIGATE:\n"
-            for contradiction in trend_analysis['contradictions']:
-                prompt += f"- {contradiction}\n"
-            prompt += "\n"
-        
-        if trend_analysis.get('conclusions'):
-            prompt += "CURRENT RESEARCH DIRECTION:\n"
-            for conclusion in trend_analysis['conclusions']:
-                prompt += f"- {conclusion}\n"
-            prompt += "\n"
-        
-        prompt += "TASK: Analyze the new paper in context of these trends and patterns.\n"
-        
-        return prompt
+        for key, header in (
+            ('patterns', "OBSERVED PATTERNS:\n"),
+            ('contradictions', "CONTRADICTIONS TO INVESTIGATE:\n"),
+            ('conclusions', "CURRENT RESEARCH DIRECTION:\n"),
+        ):
+            if trend_analysis.get(key):
+                parts.append(header)
+                parts.extend(f"- {item}\n" for item in trend_analysis[key])
+                parts.append("\n")
+        
+        parts.append("TASK: Analyze the new paper in context of these trends and patterns.\n")
+        
+        return ''.join(parts)
 
 
 class EnterpriseKnowledgeManager:
@@ -392,6 +750,9 @@ class EnterpriseKnowledgeManager:
     - Vector Store (Semantic search)
     - Chain-of-Thought reasoning
     """
+
+    # Max memoized text embeddings (keyed by SHA-1 of the text)
+    EMBEDDING_CACHE_SIZE = 2048
     
     def __init__(
         self,
@@ -405,48 +766,105 @@ class EnterpriseKnowledgeManager:
         self.graph = KnowledgeGraph(os.path.join(data_dir, "knowledge_graph.pkl"))
         self.vector_store = VectorStore(os.path.join(data_dir, "vector_store.pkl"))
         self.reasoner = ChainOfThoughtReasoner()
-        self.use_embeddings = use_embeddings and EMBEDDINGS_AVAILABLE
+        # Embedding provider is created on first use (see `embedder`)
+        self._embeddings_requested = use_embeddings and EMBEDDINGS_AVAILABLE
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
 
-        # Initialize Dual Embedding Provider (Google API + GROQ fallback)
-        self.embedder = None
-        if self.use_embeddings:
-            try:
-                from src.embedding_provider import get_embedding_provider
-                self.embedder = get_embedding_provider()
-                status = self.embedder.get_status()
-
-                if status['google_available'] or status['groq_available']:
-                    logger.info("✓ Knowledge Manager initialized with dual embedding provider")
-                    logger.info(f"  Google API: {'✓' if status['google_available'] else '✗'}")
-                    logger.info(f"  GROQ Fallback: {'✓' if status['groq_available'] else '✗'}")
-                else:
-                    logger.warning("⚠️  No embedding providers available")
-                    self.use_embeddings = False
-
-            except Exception as e:
-                logger.error(f"Failed to initialize embedding provider: {e}")
-                logger.warning("Continuing without embeddings - semantic search will be disabled")
-                self.use_embeddings = False
+        # Paper node id → parsed date (epoch seconds), in graph insertion order
+        self._paper_ts: Dict[str, float] = {}
+        for node_id, node in self.graph.nodes.items():
+            if node.entity_type == ResearchEntity.PAPER:
+                self._index_paper_date(node)
 
         # JSON backup for compatibility
         self.json_path = os.path.join(data_dir, "history.json")
 
-        logger.info(f"Enterprise Knowledge Manager initialized (Embeddings: {self.use_embeddings})")
+        logger.info(
+            f"Enterprise Knowledge Manager initialized "
+            f"(Embeddings: {'on first use' if self._embeddings_requested else False})"
+        )
+
+    @cached_property
+    def embedder(self):
+        """
+        Dual Embedding Provider (Google API + GROQ fallback), initialized lazily:
+        the provider probes the Google API on construction, which managers that
+        never embed anything should not pay for
+        """
+        if not self._embeddings_requested:
+            return None
+        try:
+            from src.embedding_provider import get_embedding_provider
+            embedder = get_embedding_provider()
+            status = embedder.get_status()
+
+            if status['google_available'] or status['groq_available']:
+                logger.info("✓ Knowledge Manager initialized with dual embedding provider")
+                logger.info(f"  Google API: {'✓' if status['google_available'] else '✗'}")
+                logger.info(f"  GROQ Fallback: {'✓' if status['groq_available'] else '✗'}")
+            else:
+                logger.warning("⚠️  No embedding providers available")
+                self._embeddings_requested = False
+            return embedder
+
+        except Exception as e:
+            logger.error(f"Failed to initialize embedding provider: {e}")
+            logger.warning("Continuing without embeddings - semantic search will be disabled")
+            self._embeddings_requested = False
+            return None
+
+    @property
+    def use_embeddings(self) -> bool:
+        """Whether papers get embedded / vector search is on (resolves the embedder)"""
+        if self._embeddings_requested:
+            self.embedder  # may switch embeddings off if no provider is usable
+        return self._embeddings_requested
+
+    @use_embeddings.setter
+    def use_embeddings(self, value: bool):
+        self._embeddings_requested = bool(value)
+
     def _generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """Generate embedding using dual provider (Google API + GROQ fallback)"""
-        if self.embedder:
-            embedding_list = self.embedder.encode(text)
-            if embedding_list:
-                return np.array(embedding_list)
-        return None
+        return self._generate_embeddings([text])[0]
+
+    @staticmethod
+    def _embedding_text(paper: Dict) -> str:
+        """Text a paper's embedding is computed from"""
+        return f"{paper.get('title', '')} {paper.get('summary', '')}"
+
+    def _generate_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Embed many texts: memo hits are served from the LRU cache, the
+        distinct misses go to the provider in one batched call
+        """
+        if not self.embedder:
+            return [None] * len(texts)
+
+        keys = [hashlib.sha1(text.encode()).hexdigest() for text in texts]
+        resolved: Dict[str, Optional[np.ndarray]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in self._embedding_cache:
+                self._embedding_cache.move_to_end(key)
+                resolved[key] = self._embedding_cache[key]
+            elif key not in resolved:
+                missing.setdefault(key, text)
+
+        if missing:
+            if hasattr(self.embedder, 'encode_batch'):
+                encoded = self.embedder.encode_batch(list(missing.values()))
+            else:
+                encoded = [self.embedder.encode(text) for text in missing.values()]
+            for key, embedding_list in zip(missing, encoded):
+                resolved[key] = np.asarray(embedding_list, dtype=np.float32) if embedding_list else None
+                if embedding_list:
+                    self._embedding_cache[key] = resolved[key]
+            while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+
+        return [resolved[key] for key in keys]
 
-    def add_paper(self, paper: Dict, embedding: Optional[np.ndarray] = None):
-        """Add paper to graph and vector store"""
-        # Auto-generate embedding if not provided and model is loaded
-        if embedding is None and self.use_embeddings:
-            text_content = f"{paper.get('title', '')} {paper.get('summary', '')}"
-            embedding = self._generate_embedding(text_content)
-    
     def _generate_id(self, content: str) -> str:
         """Generate unique ID from content"""
         return hashlib.md5(content.encode()).hexdigest()[:12]
@@ -503,7 +921,22 @@ class EnterpriseKnowledgeManager:
         
         Args:
             paper: Paper dictionary with analysis
-            embedding: Optional pre-computed embedding vector
+            embedding: Optional pre-computed embedding vector (generated from title + summary if omitted)
+        """
+        # Auto-generate embedding if not provided and the embedder is available
+        if embedding is None and self.use_embeddings:
+            embedding = self._generate_embedding(self._embedding_text(paper))
+
+        self._insert_paper(paper, self._prepare_paper(paper, embedding))
+
+    def _prepare_paper(
+        self,
+        paper: Dict,
+        embedding: Optional[np.ndarray]
+    ) -> Tuple[ResearchNode, List[ResearchNode], List[ResearchEdge]]:
+        """
+        Build a paper's node, entity nodes and edges without touching the graph
+        (pure per-paper work)
         """
         paper_id = self._generate_id(paper.get('title', '') + paper.get('summary', ''))
         
@@ -526,40 +959,56 @@ class EnterpriseKnowledgeManager:
             embedding=embedding
         )
         
-        self.graph.add_node(paper_node)
-        
-        # Extract and add entities
-        entities = self._extract_entities(paper)
-        entity_nodes = {}
+        # Extract entities (only ones not yet in the graph get inserted)
+        entity_nodes = []
+        entity_ids = {}
         
-        for entity_type, entity_name, attributes in entities:
+        for entity_type, entity_name, attributes in self._extract_entities(paper):
             entity_id = self._generate_id(f"{entity_type.value}_{entity_name}")
-            
-            # Check if entity already exists
-            if f"{entity_type.value}_{entity_id}" not in self.graph.nodes:
-                entity_node = ResearchNode(
-                    id=f"{entity_type.value}_{entity_id}",
-                    entity_type=entity_type,
-                    name=entity_name,
-                    attributes=attributes
-                )
-                self.graph.add_node(entity_node)
-                entity_nodes[entity_name] = entity_node.id
-            else:
-                entity_nodes[entity_name] = f"{entity_type.value}_{entity_id}"
+            entity_node = ResearchNode(
+                id=f"{entity_type.value}_{entity_id}",
+                entity_type=entity_type,
+                name=entity_name,
+                attributes=attributes
+            )
+            entity_nodes.append(entity_node)
+            entity_ids[entity_name] = entity_node.id
         
         # Create edges from paper to entities
-        for entity_name, entity_id in entity_nodes.items():
-            edge = ResearchEdge(
+        edges = [
+            ResearchEdge(
                 source_id=paper_node.id,
                 target_id=entity_id,
                 relationship="uses" if "technique" in entity_id or "optimization" in entity_id else "relates_to",
                 weight=paper.get('relevance_score', 50) / 100.0,
                 metadata={'paper_title': paper.get('title', '')}
             )
+            for entity_id in entity_ids.values()
+        ]
+        
+        return paper_node, entity_nodes, edges
+
+    def _insert_paper(
+        self,
+        paper: Dict,
+        prepared: Tuple[ResearchNode, List[ResearchNode], List[ResearchEdge]]
+    ):
+        """Apply a _prepare_paper result to the graph and vector store (serial)"""
+        paper_node, entity_nodes, edges = prepared
+        
+        self.graph.add_node(paper_node)
+        self._index_paper_date(paper_node)
+        
+        for entity_node in entity_nodes:
+            # Check if entity already exists
+            if entity_node.id not in self.graph.nodes:
+                self.graph.add_node(entity_node)
+        
+        for edge in edges:
             self.graph.add_edge(edge)
         
         # Add to vector store if embedding provided
+        embedding = paper_node.embedding
         if embedding is not None and self.use_embeddings:
             self.vector_store.add_embedding(
                 doc_id=paper_node.id,
@@ -573,6 +1022,47 @@ class EnterpriseKnowledgeManager:
             )
         
         logger.info(f"Added paper to knowledge graph: {paper.get('title', 'Unknown')[:50]}")
+
+    def add_papers_batch(
+        self,
+        papers: List[Dict],
+        embeddings: Optional[List[Optional[np.ndarray]]] = None
+    ):
+        """
+        Add many papers, batch-encoding the ones without a pre-computed embedding.
+        Graph inserts happen in input order.
+
+        Args:
+            papers: Paper dictionaries with analysis
+            embeddings: Optional pre-computed embeddings aligned with papers (None entries are generated)
+        """
+        embeddings = list(embeddings) if embeddings is not None else [None] * len(papers)
+        if self.use_embeddings:
+            todo = [i for i, emb in enumerate(embeddings) if emb is None]
+            generated = self._generate_embeddings([self._embedding_text(papers[i]) for i in todo])
+            for i, emb in zip(todo, generated):
+                embeddings[i] = emb
+
+        for paper, embedding in zip(papers, embeddings):
+            self._insert_paper(paper, self._prepare_paper(paper, embedding))
+    
+    def _index_paper_date(self, node: ResearchNode):
+        """Parse a paper node's date once so the recency filters compare floats"""
+        ts = _paper_timestamp(node.attributes.get('date', ''))
+        if ts is None:
+            self._paper_ts.pop(node.id, None)
+        else:
+            self._paper_ts[node.id] = ts
+
+    def _recent_papers(self, days: int) -> List[Dict]:
+        """Attributes of papers dated within the last `days` days"""
+        cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+        nodes = self.graph.nodes
+        return [
+            nodes[node_id].attributes
+            for node_id, ts in self._paper_ts.items()
+            if ts > cutoff_ts and node_id in nodes
+        ]
     
     def get_contextual_knowledge(
         self,
@@ -604,18 +1094,7 @@ class EnterpriseKnowledgeManager:
                     })
         
         # 2. Get recent papers from graph (time-based)
-        cutoff = datetime.now() - timedelta(days=context_days)
-        recent_papers = []
-        
-        for node_id, node in self.graph.nodes.items():
-            if node.entity_type == ResearchEntity.PAPER:
-                paper_date_str = node.attributes.get('date', '')
-                try:
-                    paper_date = datetime.fromisoformat(paper_date_str)
-                    if paper_date > cutoff:
-                        recent_papers.append(node.attributes)
-                except:
-                    pass
+        recent_papers = self._recent_papers(context_days)
         
         # 3. Get graph context (related entities)
         graph_context = {
@@ -652,17 +1131,7 @@ class EnterpriseKnowledgeManager:
     
     def get_trend_report(self, days: int = 30) -> Dict:
         """Generate comprehensive trend report"""
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_papers = []
-        
-        for node_id, node in self.graph.nodes.items():
-            if node.entity_type == ResearchEntity.PAPER:
-                try:
-                    paper_date = datetime.fromisoformat(node.attributes.get('date', ''))
-                    if paper_date > cutoff:
-                        recent_papers.append(node.attributes)
-                except:
-                    pass
+        recent_papers = self._recent_papers(days)
         
         # Perform CoT analysis
         trend_analysis = self.reasoner.analyze_research_trend(recent_papers)
@@ -3,25 +3,249 @@ Enhanced Mailer for On-Device AI Memory Intelligence Agent
 Improved error handling, retry logic, and email delivery
 """
 
+import asyncio
+import base64
+import hashlib
+import json
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
+from email.message import Message
 import os
+import random
+import re
+import threading
 import time
 import logging
-from typing import List, Optional
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from html import escape
+from string import Template
 
 logger = logging.getLogger(__name__)
 
+# Optional asyncio SMTP client for AsyncMailer
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+
+# Compiled once; _html_to_text runs on every message
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+@lru_cache(maxsize=16)
+def _strip_html(html: str) -> str:
+    """Tags removed, whitespace runs collapsed; memoized so retries and repeat sends of a body skip the scan"""
+    # str.split() uses the same whitespace set as \s, without a second regex pass
+    return ' '.join(_TAG_RE.sub('', html).split())
+
+
+# Attachment read size: a multiple of 57 raw bytes (one 76-char base64 line)
+# so chunk-wise encodebytes yields the same line breaks as encoding in one go
+_B64_CHUNK = 57 * 16384
+
+# Fixed email bodies, parsed once; values are HTML-escaped before substitution
+_TEST_EMAIL_TPL = Template("""
+        <html>
+        <body>
+            <h1>Test Email</h1>
+            <p>This is a test email from the On-Device AI Memory Intelligence Agent.</p>
+            <p>If you received this, your email configuration is working correctly.</p>
+            <p><strong>Configuration:</strong></p>
+            <ul>
+                <li>SMTP Server: $server</li>
+                <li>SMTP Port: $port</li>
+                <li>Recipients: $recipients</li>
+            </ul>
+        </body>
+        </html>
+        """)
+
+_ERROR_EMAIL_TPL = Template("""
+    <html>
+    <body style="font-family: Arial, sans-serif;">
+        <h2 style="color: #d32f2f;">⚠️ Pipeline Error Alert</h2>
+        <p>The On-Device AI Memory Intelligence Agent encountered an error:</p>
+        <div style="background: #f5f5f5; padding: 15px; border-left: 4px solid #d32f2f; margin: 20px 0;">
+            <pre>$error_details</pre>
+        </div>
+        <p><strong>Time:</strong> $ts</p>
+        <p>Please check the logs for more details.</p>
+    </body>
+    </html>
+    """)
+
 
 class MailerConfig:
     """Configuration for email sending"""
     MAX_RETRIES = 3
-    RETRY_DELAY = 5  # seconds
+    RETRY_DELAY = 5  # seconds (backoff base)
+    RETRY_MAX_DELAY = 60  # seconds (backoff ceiling)
     CONNECTION_TIMEOUT = 30  # seconds
+    BREAKER_FAILURE_THRESHOLD = 5  # consecutive failed attempts before failing fast
+    BREAKER_COOLDOWN = 60  # seconds the circuit stays open before a probe
+    MAX_CONNECTIONS_PER_SERVER = 4  # concurrent pooled SMTP sessions per server/account
+    MAX_MESSAGES_PER_CONNECTION = 100  # send_many() opens a fresh session after this many (provider quotas)
+    BATCH_ABORT_MIN_SIZE = 30  # send_many() batches at least this large abort once...
+    BATCH_ABORT_FAILURE_RATIO = 1 / 3  # ...this share of the batch has failed
+    # Concurrent in-flight sends per channel; kept within MAX_CONNECTIONS_PER_SERVER
+    # so a saturated report batch can't take the session an alert needs
+    BULKHEAD_LIMITS = {'normal': 3, 'alerts': 1}
+    BULKHEAD_TIMEOUT = 30  # seconds to wait for a free slot before giving up
+    OUTBOX_DIR = "data/mail_outbox"  # undeliverable emails, re-sent by Mailer.replay_outbox()
+    OUTBOX_MAX_ENTRIES = 20  # oldest queued emails are dropped beyond this many...
+    OUTBOX_MAX_AGE_DAYS = 7  # ...and once they are older than this
+
+
+class BatchAbortError(Exception):
+    """send_many() gave up on a batch after too many failures"""
+    
+    def __init__(self, sent: int, failed: int, total: int):
+        super().__init__(f"Batch aborted: {failed} of {total} emails failed ({sent} sent, {total - sent - failed} skipped)")
+        self.sent = sent
+        self.failed = failed
+        self.total = total
+
+
+class CircuitBreaker:
+    """
+    CLOSED → OPEN after `failure_threshold` consecutive failures. OPEN fails
+    fast for `cooldown` seconds, then HALF_OPEN lets a single probe through:
+    success closes the circuit, failure re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may proceed now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False  # One probe at a time
+                self._probing = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+    
+    def trip(self):
+        """Open the circuit now, regardless of the failure count"""
+        with self._lock:
+            if self.state != self.OPEN:
+                logger.warning(f"SMTP circuit OPEN for {self.cooldown}s (tripped)")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"SMTP circuit OPEN for {self.cooldown}s after {self._failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Authenticated SMTP sessions shared by every Mailer in the process, keyed by
+    (server, port, user). Sessions are reused across sends; at most
+    `max_connections` are checked out per key at once (callers beyond that block),
+    so independent servers proceed in parallel without flooding any one of them.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple, List[smtplib.SMTP]] = defaultdict(list)
+        self._slots: Dict[Tuple, threading.BoundedSemaphore] = {}
+    
+    def acquire(self, key: Tuple, connect: Callable[[], smtplib.SMTP], max_connections: int) -> Tuple[smtplib.SMTP, bool]:
+        """Check out a session for `key`: (session, reused). Pair with release()."""
+        with self._lock:
+            slots = self._slots.get(key)
+            if slots is None:
+                slots = self._slots[key] = threading.BoundedSemaphore(max_connections)
+        slots.acquire()
+        try:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop(), True
+            return connect(), False
+        except BaseException:
+            slots.release()
+            raise
+    
+    def release(self, key: Tuple, server: smtplib.SMTP, healthy: bool):
+        """Return a checked-out session; unhealthy ones are closed"""
+        try:
+            if healthy:
+                with self._lock:
+                    self._idle[key].append(server)
+            else:
+                _quit(server)
+        finally:
+            self._slots[key].release()
+    
+    def close(self, key: Optional[Tuple] = None):
+        """Close idle sessions for `key` (all keys if None)"""
+        with self._lock:
+            if key is None:
+                servers = [srv for idle in self._idle.values() for srv in idle]
+                self._idle.clear()
+            else:
+                servers = self._idle.pop(key, [])
+        for server in servers:
+            _quit(server)
+
+
+def _quit(server: smtplib.SMTP):
+    """Politely end an SMTP session, dropping the socket if QUIT fails"""
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+_SMTP_POOL = SMTPConnectionPool()
+
+# Process-wide bulkheads, one bounded semaphore per mail channel
+_BULKHEADS: Dict[str, threading.BoundedSemaphore] = {}
+_BULKHEADS_LOCK = threading.Lock()
+
+
+def _bulkhead(channel: str, config: MailerConfig) -> threading.BoundedSemaphore:
+    """Semaphore limiting in-flight sends on `channel` (created on first use)"""
+    with _BULKHEADS_LOCK:
+        bulkhead = _BULKHEADS.get(channel)
+        if bulkhead is None:
+            bulkhead = _BULKHEADS[channel] = threading.BoundedSemaphore(config.BULKHEAD_LIMITS.get(channel, 1))
+        return bulkhead
 
 
 class Mailer:
@@ -43,14 +267,32 @@ class Mailer:
         self.cc_recipients = email_config.get('cc', [])
         self.bcc_recipients = email_config.get('bcc', [])
         
+        # Built once, reused by every send and retry
+        self._to_header = ", ".join(self.recipients)
+        self._cc_header = ", ".join(self.cc_recipients) if self.cc_recipients else None
+        self._copy_recipients = tuple(self.cc_recipients + self.bcc_recipients)
+        self._all_recipients = tuple(self.recipients) + self._copy_recipients
+        
         # Validate configuration
         self._validate_config()
         
+        # Authenticated SMTP sessions are pooled per server/account (see SMTPConnectionPool)
+        self._pool_key = (self.smtp_server, self.smtp_port, self.username)
+        
+        # Fail fast while the SMTP server is known to be down
+        self.breaker = CircuitBreaker(
+            self.config.BREAKER_FAILURE_THRESHOLD,
+            self.config.BREAKER_COOLDOWN
+        )
+        
         # Statistics
         self.stats = {
             'emails_sent': 0,
             'emails_failed': 0,
-            'retries': 0
+            'retries': 0,
+            'short_circuited': 0,
+            'queued': 0,
+            'batches_aborted': 0
         }
     
     def _validate_config(self):
@@ -70,7 +312,9 @@ class Mailer:
         html_content: str, 
         subject: Optional[str] = None,
         attachments: Optional[List[str]] = None,
-        retry_count: int = 0
+        retry_count: int = 0,
+        channel: str = "normal",
+        queue_on_failure: bool = True
     ) -> bool:
         """
         Send HTML email with optional attachments
@@ -80,12 +324,20 @@ class Mailer:
             subject: Email subject (default: generated from date)
             attachments: List of file paths to attach
             retry_count: Current retry attempt (internal use)
+            channel: Bulkhead the send runs in ("normal" or "alerts", see MailerConfig.BULKHEAD_LIMITS)
+            queue_on_failure: Persist the email to the outbox for replay_outbox() if it can't be delivered
             
         Returns:
             True if email sent successfully, False otherwise
         """
+        # Generate subject if not provided
+        if not subject:
+            today = datetime.now().strftime("%B %d, %Y")
+            subject = f"On-Device AI Memory Intelligence - {today}"
+        
         # Check if email is configured
         if not self.username or not self.password:
+            # Not queued: an unconfigured install would never be able to replay it
             logger.warning("Email credentials not found. Skipping email dispatch.")
             return False
         
@@ -93,65 +345,351 @@ class Mailer:
             logger.warning("No recipients configured. Skipping email dispatch.")
             return False
         
-        # Generate subject if not provided
-        if not subject:
-            today = datetime.now().strftime("%B %d, %Y")
-            subject = f"On-Device AI Memory Intelligence - {today}"
+        sent, error, rejected = self._attempt(html_content, subject, attachments, channel)
+        if sent:
+            self.stats['emails_sent'] += 1
+            return True
+        if rejected:
+            # The server said no for good: neither a retry nor a replay can deliver it
+            self.stats['emails_failed'] += 1
+            return False
+        
+        # Retry logic (the bulkhead slot is not held while backing off)
+        if error is not None:
+            if retry_count < self.config.MAX_RETRIES:
+                return self._retry_send(
+                    html_content, subject, attachments, retry_count, error, channel, queue_on_failure
+                )
+            logger.error(f"Failed to send email after {self.config.MAX_RETRIES} attempts")
+        self.stats['emails_failed'] += 1
+        if queue_on_failure:
+            self._queue_for_replay(html_content, subject, attachments, channel, error or "not delivered")
+        return False
+    
+    def _attempt(
+        self,
+        html_content: str,
+        subject: str,
+        attachments: Optional[List[str]],
+        channel: str
+    ) -> Tuple[bool, Optional[str], bool]:
+        """
+        One delivery attempt inside the channel's bulkhead
         
+        Returns:
+            (sent, error, rejected) - error is the reason to retry, None if retrying is
+            pointless; rejected marks a permanent (5xx) refusal of this message
+        """
+        bulkhead = _bulkhead(channel, self.config)
+        if not bulkhead.acquire(timeout=self.config.BULKHEAD_TIMEOUT):
+            logger.error(f"Mail bulkhead '{channel}' saturated - skipping email dispatch")
+            return False, None, False
         try:
-            # Create message
-            msg = self._create_message(html_content, subject, attachments)
-            
-            # Send email
-            logger.info(f"Sending email to {len(self.recipients)} recipient(s)...")
+            if not self.breaker.allow():
+                logger.error("SMTP circuit open - skipping email dispatch")
+                self.stats['short_circuited'] += 1
+                return False, None, False
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.config.CONNECTION_TIMEOUT) as server:
-                # Enable TLS
-                server.starttls()
-                
-                # Login
-                server.login(self.username, self.password)
+            try:
+                # Create message
+                msg = self._create_message(html_content, subject, attachments)
                 
                 # Send email
-                all_recipients = self.recipients + self.cc_recipients + self.bcc_recipients
-                server.sendmail(self.username, all_recipients, msg.as_string())
-            
-            logger.info("[OK] Email sent successfully")
-            self.stats['emails_sent'] += 1
-            return True
-            
-        except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"Authentication failed: {e}")
-            logger.error("Check SMTP_USER and SMTP_PASSWORD environment variables")
-            self.stats['emails_failed'] += 1
-            return False
+                logger.info(f"Sending email to {len(self.recipients)} recipient(s)...")
+                
+                self._deliver(self._all_recipients, msg)
+                
+                logger.info("[OK] Email sent successfully")
+                self.breaker.record_success()
+                return True, None, False
+                
+            except smtplib.SMTPAuthenticationError as e:
+                self.breaker.record_failure()
+                logger.error(f"Authentication failed: {e}")
+                logger.error("Check SMTP_USER and SMTP_PASSWORD environment variables")
+                return False, None, False
             
-        except smtplib.SMTPException as e:
-            logger.error(f"SMTP error: {e}")
+            except smtplib.SMTPRecipientsRefused as e:
+                # About the addresses, not the server: no breaker failure
+                logger.error(f"Recipients refused: {e.recipients}")
+                if all(code >= 500 for code, _ in e.recipients.values()):
+                    return False, None, True
+                return False, str(e), False
             
-            # Retry logic
-            if retry_count < self.config.MAX_RETRIES:
-                return self._retry_send(html_content, subject, attachments, retry_count, str(e))
-            else:
-                logger.error(f"Failed to send email after {self.config.MAX_RETRIES} attempts")
-                self.stats['emails_failed'] += 1
-                return False
+            except smtplib.SMTPResponseException as e:
+                self.breaker.record_failure()
+                logger.error(f"SMTP error: {e}")
+                # 5xx (sender refused, data rejected...) is final; 4xx such as 421 is retried
+                if e.smtp_code >= 500 and not isinstance(e, smtplib.SMTPConnectError):
+                    return False, None, True
+                return False, str(e), False
                 
+            except smtplib.SMTPException as e:
+                self.breaker.record_failure()
+                logger.error(f"SMTP error: {e}")
+                return False, str(e), False
+                    
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.error(f"Failed to send email: {e}")
+                return False, str(e), False
+        finally:
+            bulkhead.release()
+    
+    def _queue_for_replay(
+        self,
+        html_content: str,
+        subject: str,
+        attachments: Optional[List[str]],
+        channel: str,
+        reason: str
+    ):
+        """Fallback: persist an undeliverable email to the outbox directory"""
+        try:
+            os.makedirs(self.config.OUTBOX_DIR, exist_ok=True)
+            digest = hashlib.blake2b((subject + html_content).encode(), digest_size=4).hexdigest()
+            path = os.path.join(self.config.OUTBOX_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{digest}.json")
+            entry = {
+                'subject': subject,
+                'html': html_content,
+                'attachments': attachments or [],
+                'channel': channel,
+                'reason': reason,
+                'queued_at': datetime.now().isoformat()
+            }
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(path + ".tmp", path)
+            self.stats['queued'] += 1
+            logger.warning(f"Email queued for replay: {path}")
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            logger.error(f"Failed to queue email for replay: {e}")
+        self._prune_outbox()
+    
+    def _prune_outbox(self):
+        """Drop outbox entries past OUTBOX_MAX_AGE_DAYS and all but the newest OUTBOX_MAX_ENTRIES"""
+        if not os.path.isdir(self.config.OUTBOX_DIR):
+            return
+        # Names start with the queue timestamp, so sorted order is oldest first
+        names = sorted(n for n in os.listdir(self.config.OUTBOX_DIR) if n.endswith('.json'))
+        cutoff = time.time() - self.config.OUTBOX_MAX_AGE_DAYS * 86400
+        excess = len(names) - self.config.OUTBOX_MAX_ENTRIES
+        for idx, name in enumerate(names):
+            path = os.path.join(self.config.OUTBOX_DIR, name)
+            try:
+                if idx < excess or os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    logger.warning(f"Dropped queued email {name} from the outbox")
+            except OSError as e:
+                logger.error(f"Failed to prune outbox entry {name}: {e}")
+    
+    def replay_outbox(self) -> int:
+        """
+        Re-send emails queued by failed sends, oldest first. Delivered entries are
+        removed; the rest stay queued. Stops at the first failure.
+        
+        Returns:
+            Number of emails delivered
+        """
+        if not os.path.isdir(self.config.OUTBOX_DIR):
+            return 0
+        self._prune_outbox()
+        
+        delivered = 0
+        for name in sorted(os.listdir(self.config.OUTBOX_DIR)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.config.OUTBOX_DIR, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except Exception as e:
+                logger.error(f"Unreadable outbox entry {name}: {e}")
+                continue
             
-            # Retry logic for general errors
-            if retry_count < self.config.MAX_RETRIES:
-                return self._retry_send(html_content, subject, attachments, retry_count, str(e))
-            else:
-                self.stats['emails_failed'] += 1
-                return False
+            if not self.send(
+                entry['html'],
+                subject=entry['subject'],
+                attachments=entry.get('attachments') or None,
+                channel=entry.get('channel', 'normal'),
+                queue_on_failure=False
+            ):
+                break
+            os.remove(path)
+            delivered += 1
+        
+        if delivered:
+            logger.info(f"Replayed {delivered} queued email(s)")
+        return delivered
+    
+    def _open_connection(self) -> smtplib.SMTP:
+        """New authenticated SMTP session (connect + STARTTLS + login)"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.config.CONNECTION_TIMEOUT)
+        try:
+            # Enable TLS
+            server.starttls()
+            
+            # Login
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _deliver(self, recipients: Tuple[str, ...], message: Message):
+        """
+        Send one message over a pooled session. send_message() serializes it
+        straight to bytes, without an intermediate as_string() copy of every
+        attachment. If a reused session turns out to have been dropped by the
+        server (idle timeout), the idle sessions for this server are discarded
+        and the send is repeated once on a fresh one, without a retry delay.
+        """
+        for attempt in range(2):
+            server, reused = _SMTP_POOL.acquire(
+                self._pool_key, self._open_connection, self.config.MAX_CONNECTIONS_PER_SERVER
+            )
+            healthy = False
+            try:
+                server.send_message(message, self.username, recipients)
+                healthy = True
+                return
+            except smtplib.SMTPServerDisconnected:
+                _SMTP_POOL.close(self._pool_key)
+                if not reused or attempt:
+                    raise
+            finally:
+                # Sessions that saw an error are closed, not returned to the pool
+                _SMTP_POOL.release(self._pool_key, server, healthy)
+    
+    def send_many(
+        self,
+        items: Iterable[Tuple[str, str, Optional[List[str]]]],
+        channel: str = "normal"
+    ) -> Iterator[Tuple[int, bool, Optional[str]]]:
+        """
+        Send several emails over one pooled SMTP session instead of one session
+        checkout per email. The session is swapped for a fresh one every
+        MAX_MESSAGES_PER_CONNECTION messages. Failed items are not retried or
+        queued; callers handle partial failures from the yielded results.
+        
+        A batch of BATCH_ABORT_MIN_SIZE or more stops once BATCH_ABORT_FAILURE_RATIO
+        of it has failed: the circuit breaker is tripped and BatchAbortError is
+        raised instead of working through the rest.
+        
+        Args:
+            items: (html_content, subject, recipients) tuples; recipients=None
+                means the configured recipients (CC/BCC are always added)
+            channel: Bulkhead the whole batch runs in
+            
+        Yields:
+            (index, sent, error) per item, in input order
+            
+        Raises:
+            BatchAbortError: Too many items of a large batch failed
+        """
+        items = list(items)
+        abort_at = (
+            len(items) * self.config.BATCH_ABORT_FAILURE_RATIO
+            if len(items) >= self.config.BATCH_ABORT_MIN_SIZE else float('inf')
+        )
+        
+        if not self.username or not self.password:
+            logger.warning("Email credentials not found. Skipping email dispatch.")
+            for index, _ in enumerate(items):
+                yield index, False, "credentials missing"
+            return
+        
+        bulkhead = _bulkhead(channel, self.config)
+        if not bulkhead.acquire(timeout=self.config.BULKHEAD_TIMEOUT):
+            logger.error(f"Mail bulkhead '{channel}' saturated - skipping email dispatch")
+            for index, _ in enumerate(items):
+                yield index, False, "bulkhead saturated"
+            return
+        
+        server = None
+        reused = False
+        on_connection = 0
+        sent = failed = 0
+        try:
+            for index, (html_content, subject, recipients) in enumerate(items):
+                if not self.breaker.allow():
+                    self.stats['short_circuited'] += 1
+                    yield index, False, "circuit open"
+                    continue
+                
+                to = tuple(recipients) if recipients else None
+                error = None
+                for attempt in range(2):
+                    try:
+                        if server is not None and on_connection >= self.config.MAX_MESSAGES_PER_CONNECTION:
+                            _SMTP_POOL.release(self._pool_key, server, False)
+                            server = None
+                        if server is None:
+                            server, reused = _SMTP_POOL.acquire(
+                                self._pool_key, self._open_connection, self.config.MAX_CONNECTIONS_PER_SERVER
+                            )
+                            on_connection = 0
+                        
+                        msg = self._create_message(html_content, subject, recipients=to)
+                        server.send_message(
+                            msg, self.username, to + self._copy_recipients if to else self._all_recipients
+                        )
+                        on_connection += 1
+                        error = None
+                        break
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                        # Refusals leave the session usable (smtplib already sent RSET),
+                        # except a 421, on which smtplib closes the socket instead;
+                        # anything else means the connection is gone
+                        refused = isinstance(e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException))
+                        if server is not None and not (refused and server.sock is not None):
+                            _SMTP_POOL.release(self._pool_key, server, False)
+                            server = None
+                            # A pooled session the server dropped while idle: once more on a fresh one
+                            if isinstance(e, smtplib.SMTPServerDisconnected) and reused and on_connection == 0 and not attempt:
+                                _SMTP_POOL.close(self._pool_key)
+                                continue
+                        break
+                
+                if error is None:
+                    self.breaker.record_success()
+                    self.stats['emails_sent'] += 1
+                    sent += 1
+                else:
+                    self.breaker.record_failure()
+                    self.stats['emails_failed'] += 1
+                    failed += 1
+                    logger.error(f"Batch email {index} failed: {error}")
+                yield index, error is None, error
+                
+                if failed >= abort_at:
+                    self.breaker.trip()
+                    self.stats['batches_aborted'] += 1
+                    abort = BatchAbortError(sent, failed, len(items))
+                    logger.error(str(abort))
+                    raise abort
+        finally:
+            if server is not None:
+                _SMTP_POOL.release(self._pool_key, server, True)
+            bulkhead.release()
+    
+    def close(self):
+        """Close this server's idle pooled SMTP sessions (reopened on the next send)"""
+        _SMTP_POOL.close(self._pool_key)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def _create_message(
         self, 
         html_content: str, 
         subject: str,
-        attachments: Optional[List[str]] = None
+        attachments: Optional[List[str]] = None,
+        recipients: Optional[List[str]] = None
     ) -> MIMEMultipart:
         """
         Create email message with HTML content and attachments
@@ -160,6 +698,7 @@ class Mailer:
             html_content: HTML body
             subject: Email subject
             attachments: List of file paths to attach
+            recipients: To addresses (default: configured recipients)
             
         Returns:
             MIMEMultipart message object
@@ -168,10 +707,10 @@ class Mailer:
         msg = MIMEMultipart('mixed')
         msg['Subject'] = subject
         msg['From'] = self.username
-        msg['To'] = ", ".join(self.recipients)
+        msg['To'] = ", ".join(recipients) if recipients else self._to_header
         
-        if self.cc_recipients:
-            msg['Cc'] = ", ".join(self.cc_recipients)
+        if self._cc_header:
+            msg['Cc'] = self._cc_header
         
         # Add custom headers
         msg['X-Priority'] = '3'  # Normal priority
@@ -212,11 +751,9 @@ class Mailer:
             
             filename = os.path.basename(filepath)
             
-            with open(filepath, 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
-            
-            encoders.encode_base64(part)
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(self._encode_file_base64(filepath))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header('Content-Disposition', f'attachment; filename= {filename}')
             msg.attach(part)
             
@@ -225,6 +762,19 @@ class Mailer:
         except Exception as e:
             logger.error(f"Failed to attach file {filepath}: {e}")
     
+    @staticmethod
+    def _encode_file_base64(filepath: str) -> str:
+        """
+        Base64 body for an attachment, streamed in chunks so the raw file is
+        never held in memory alongside its encoding (output matches
+        email.encoders.encode_base64)
+        """
+        encoded = bytearray()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(_B64_CHUNK), b''):
+                encoded += base64.encodebytes(chunk)
+        return encoded.decode('ascii')
+    
     def _html_to_text(self, html: str) -> str:
         """
         Convert HTML to plain text (simple version)
@@ -236,18 +786,8 @@ class Mailer:
             Plain text version
         """
         try:
-            import re
-            
-            # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', html)
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text)
-            
-            # Remove leading/trailing whitespace
-            text = text.strip()
-            
-            return text
+            # Remove HTML tags, then collapse whitespace runs and trim
+            return _strip_html(html)
             
         except Exception as e:
             logger.error(f"Error converting HTML to text: {e}")
@@ -259,10 +799,12 @@ class Mailer:
         subject: str,
         attachments: Optional[List[str]],
         retry_count: int,
-        error_msg: str
+        error_msg: str,
+        channel: str = "normal",
+        queue_on_failure: bool = True
     ) -> bool:
         """
-        Retry sending email with exponential backoff
+        Retry sending email with exponential backoff and full jitter
         
         Args:
             html_content: Email content
@@ -270,6 +812,8 @@ class Mailer:
             attachments: File attachments
             retry_count: Current retry count
             error_msg: Previous error message
+            channel: Bulkhead to send in
+            queue_on_failure: Persist to the outbox if the final attempt fails
             
         Returns:
             True if successful, False otherwise
@@ -277,11 +821,19 @@ class Mailer:
         retry_count += 1
         self.stats['retries'] += 1
         
-        delay = self.config.RETRY_DELAY * retry_count
-        logger.warning(f"Retry {retry_count}/{self.config.MAX_RETRIES} after {delay}s (reason: {error_msg})")
+        delay = self._backoff_delay(retry_count)
+        logger.warning(f"Retry {retry_count}/{self.config.MAX_RETRIES} after {delay:.1f}s (reason: {error_msg})")
         time.sleep(delay)
         
-        return self.send(html_content, subject, attachments, retry_count)
+        return self.send(html_content, subject, attachments, retry_count, channel, queue_on_failure)
+    
+    def _backoff_delay(self, retry_count: int) -> float:
+        """
+        Full jitter: uniform over [0, base * 2^(n-1)], capped, so concurrent
+        senders don't retry against the server in lockstep
+        """
+        ceiling = min(self.config.RETRY_MAX_DELAY, self.config.RETRY_DELAY * 2 ** (retry_count - 1))
+        return random.uniform(0, ceiling)
     
     def send_test_email(self) -> bool:
         """
@@ -290,27 +842,13 @@ class Mailer:
         Returns:
             True if successful, False otherwise
         """
-        test_html = """
-        <html>
-        <body>
-            <h1>Test Email</h1>
-            <p>This is a test email from the On-Device AI Memory Intelligence Agent.</p>
-            <p>If you received this, your email configuration is working correctly.</p>
-            <p><strong>Configuration:</strong></p>
-            <ul>
-                <li>SMTP Server: {server}</li>
-                <li>SMTP Port: {port}</li>
-                <li>Recipients: {recipients}</li>
-            </ul>
-        </body>
-        </html>
-        """.format(
-            server=self.smtp_server,
+        test_html = _TEST_EMAIL_TPL.substitute(
+            server=escape(str(self.smtp_server)),
             port=self.smtp_port,
-            recipients=", ".join(self.recipients)
+            recipients=escape(self._to_header)
         )
         
-        return self.send(test_html, subject="Test Email - On-Device AI Intelligence Agent")
+        return self.send(test_html, subject="Test Email - On-Device AI Intelligence Agent", queue_on_failure=False)
     
     def get_statistics(self) -> dict:
         """Get email sending statistics"""
@@ -322,6 +860,157 @@ class Mailer:
             self.stats[key] = 0
 
 
+class AsyncMailer:
+    """
+    asyncio front end for a Mailer (requires aiosmtplib). Same settings, message
+    building, circuit breaker and statistics, but the SMTP exchange is awaited
+    instead of blocking, so dispatch overlaps with other I/O.
+    
+    SMTP is sequential per connection: each instance keeps one persistent session
+    carrying one message at a time. gather() sends on several instances to have
+    several sessions in flight.
+    """
+    
+    def __init__(self, mailer: Mailer):
+        if not AIOSMTPLIB_AVAILABLE:
+            raise ImportError("aiosmtplib not installed. Run: pip install aiosmtplib")
+        self.mailer = mailer
+        self._smtp = None
+        self._lock = asyncio.Lock()
+    
+    async def send(
+        self,
+        html_content: str,
+        subject: Optional[str] = None,
+        attachments: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Send HTML email with optional attachments, retrying with backoff
+        
+        Returns:
+            True if email sent successfully, False otherwise
+        """
+        mailer = self.mailer
+        if not subject:
+            today = datetime.now().strftime("%B %d, %Y")
+            subject = f"On-Device AI Memory Intelligence - {today}"
+        
+        if not mailer.username or not mailer.password:
+            logger.warning("Email credentials not found. Skipping email dispatch.")
+            return False
+        
+        if not mailer.recipients:
+            logger.warning("No recipients configured. Skipping email dispatch.")
+            return False
+        
+        # Attachments are read from disk: build the message off the event loop
+        msg = await asyncio.get_running_loop().run_in_executor(
+            None, mailer._create_message, html_content, subject, attachments
+        )
+        for retry_count in range(mailer.config.MAX_RETRIES + 1):
+            if retry_count:
+                mailer.stats['retries'] += 1
+                delay = mailer._backoff_delay(retry_count)
+                logger.warning(f"Retry {retry_count}/{mailer.config.MAX_RETRIES} after {delay:.1f}s")
+                await asyncio.sleep(delay)
+            
+            if not mailer.breaker.allow():
+                logger.error("SMTP circuit open - skipping email dispatch")
+                mailer.stats['short_circuited'] += 1
+                break
+            
+            try:
+                logger.info(f"Sending email to {len(mailer.recipients)} recipient(s)...")
+                await self._deliver(mailer._all_recipients, msg)
+                logger.info("[OK] Email sent successfully")
+                mailer.breaker.record_success()
+                mailer.stats['emails_sent'] += 1
+                return True
+            
+            except aiosmtplib.SMTPAuthenticationError as e:
+                mailer.breaker.record_failure()
+                logger.error(f"Authentication failed: {e}")
+                logger.error("Check SMTP_USER and SMTP_PASSWORD environment variables")
+                break
+            
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                # About the addresses, not the server: no breaker failure
+                logger.error(f"Recipients refused: {e}")
+                if all(r.code >= 500 for r in e.recipients):
+                    break
+            
+            except aiosmtplib.SMTPResponseException as e:
+                mailer.breaker.record_failure()
+                logger.error(f"SMTP error: {e}")
+                # 5xx (sender refused, data rejected...) is final; 4xx such as 421 is retried
+                if e.code >= 500 and not isinstance(e, aiosmtplib.SMTPConnectError):
+                    break
+            
+            except Exception as e:
+                mailer.breaker.record_failure()
+                logger.error(f"SMTP error: {e}")
+        
+        mailer.stats['emails_failed'] += 1
+        return False
+    
+    async def _connect(self):
+        """New authenticated session (connect + STARTTLS + login)"""
+        mailer = self.mailer
+        smtp = aiosmtplib.SMTP(
+            hostname=mailer.smtp_server,
+            port=mailer.smtp_port,
+            timeout=mailer.config.CONNECTION_TIMEOUT,
+            start_tls=False
+        )
+        await smtp.connect()
+        try:
+            await smtp.starttls()
+            await smtp.login(mailer.username, mailer.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+    
+    async def _deliver(self, recipients: Tuple[str, ...], message: Message):
+        """
+        Send over the persistent session, one message at a time. A session that
+        saw an error is closed; if it had been dropped while idle, the send is
+        repeated once on a fresh one.
+        """
+        async with self._lock:
+            for attempt in range(2):
+                reused = self._smtp is not None
+                if not reused:
+                    self._smtp = await self._connect()
+                try:
+                    await self._smtp.send_message(message, sender=self.mailer.username, recipients=recipients)
+                    return
+                except Exception as e:
+                    await self._close_session()
+                    if not (isinstance(e, aiosmtplib.SMTPServerDisconnected) and reused and not attempt):
+                        raise
+    
+    async def _close_session(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    async def close(self):
+        """Close the persistent SMTP session (reopened on the next send)"""
+        async with self._lock:
+            await self._close_session()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
 # Utility function for sending notification emails
 def send_error_notification(mailer: Mailer, error_details: str):
     """
@@ -331,21 +1020,13 @@ def send_error_notification(mailer: Mailer, error_details: str):
         mailer: Mailer instance
         error_details: Details of the error
     """
-    error_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif;">
-        <h2 style="color: #d32f2f;">⚠️ Pipeline Error Alert</h2>
-        <p>The On-Device AI Memory Intelligence Agent encountered an error:</p>
-        <div style="background: #f5f5f5; padding: 15px; border-left: 4px solid #d32f2f; margin: 20px 0;">
-            <pre>{error_details}</pre>
-        </div>
-        <p><strong>Time:</strong> {datetime.now().isoformat()}</p>
-        <p>Please check the logs for more details.</p>
-    </body>
-    </html>
-    """
+    # Escaped: exception text can contain markup (or attacker-controlled input)
+    error_html = _ERROR_EMAIL_TPL.substitute(
+        error_details=escape(str(error_details)),
+        ts=datetime.now().isoformat()
+    )
     
     try:
-        mailer.send(error_html, subject="🚨 Pipeline Error - Immediate Attention Required")
+        mailer.send(error_html, subject="🚨 Pipeline Error - Immediate Attention Required", channel="alerts")
     except Exception as e:
         logger.error(f"Failed to send error notification: {e}")
\ No newline at end of file
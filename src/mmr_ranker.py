@@ -10,6 +10,108 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Optional JIT for the greedy MMR loop (NumPy fallback otherwise)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _mmr_select_numpy(unit: np.ndarray, relevance: np.ndarray, lambda_param: float, k: int, scale: float = 1.0):
+    """
+    Greedy MMR selection over unit-norm rows (NumPy fallback when Numba is unavailable)
+
+    `unit` may be int8 codes (see _quantize_unit); dot products are then
+    accumulated in int32 and multiplied by `scale` to get back to cosine.
+
+    Returns:
+        (order, mmr_scores, diversity) — picked row indices in selection order,
+        with each pick's MMR score and diversity (1 - max similarity to earlier picks)
+    """
+    n = unit.shape[0]
+    # Max similarity of each candidate to the selected set (0 → diversity 1.0 before the first pick)
+    max_similarity = np.zeros(n)
+    available = np.ones(n, dtype=bool)
+    order = np.empty(k, dtype=np.int64)
+    mmr_out = np.empty(k)
+    diversity = np.empty(k)
+    # Loop invariants: the relevance term never changes between picks
+    relevance_term = lambda_param * relevance
+    penalty = 1 - lambda_param
+
+    for step in range(k):
+        mmr_scores = relevance_term - penalty * max_similarity
+        mmr_scores[~available] = -np.inf
+        best = int(np.argmax(mmr_scores))
+
+        available[best] = False
+        order[step] = best
+        mmr_out[step] = mmr_scores[best]
+        diversity[step] = 1.0 - max_similarity[best]  # Higher = more diverse
+
+        # One GEMV folds the new pick into every candidate's max similarity
+        if unit.dtype == np.int8:
+            similarity = np.matmul(unit, unit[best], dtype=np.int32) * scale
+        else:
+            similarity = unit @ unit[best]
+        max_similarity = similarity if step == 0 else np.maximum(max_similarity, similarity)
+
+    return order, mmr_out, diversity
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _mmr_select_numba(unit, relevance, lambda_param, k, scale=1.0):
+        """Fused greedy MMR loop (see _mmr_select_numpy); skips picked rows instead of masking with -inf"""
+        n, d = unit.shape
+        max_similarity = np.zeros(n)
+        available = np.ones(n, dtype=np.bool_)
+        order = np.empty(k, dtype=np.int64)
+        mmr_out = np.empty(k)
+        diversity = np.empty(k)
+        relevance_term = lambda_param * relevance
+        penalty = 1 - lambda_param
+
+        for step in range(k):
+            best = -1
+            best_score = 0.0
+            for i in range(n):
+                if available[i]:
+                    score = relevance_term[i] - penalty * max_similarity[i]
+                    if best < 0 or score > best_score:
+                        best = i
+                        best_score = score
+
+            available[best] = False
+            order[step] = best
+            mmr_out[step] = best_score
+            diversity[step] = 1.0 - max_similarity[best]
+
+            # Only candidates still in play need their max similarity updated
+            for i in range(n):
+                if available[i]:
+                    dot = 0  # integer accumulator for int8 codes, float otherwise
+                    for j in range(d):
+                        dot += unit[i, j] * unit[best, j]
+                    similarity = dot * scale
+                    if step == 0 or similarity > max_similarity[i]:
+                        max_similarity[i] = similarity
+
+        return order, mmr_out, diversity
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; zero rows stay zero (cosine similarity 0)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _quantize_unit(unit: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Fixed-scale int8 codes for unit-norm rows: unit ≈ codes / 127, cosine ≈ codes·codes / 127²"""
+    codes = np.clip(np.rint(unit * 127.0), -127, 127).astype(np.int8)
+    return codes, 1.0 / (127.0 * 127.0)
+
 
 class MMRRanker:
     """
@@ -18,7 +120,7 @@ class MMRRanker:
     Prevents getting similar/redundant results
     """
 
-    def __init__(self, lambda_param: float = 0.5):
+    def __init__(self, lambda_param: float = 0.5, quantize: Optional[str] = None):
         """
         Initialize MMR ranker
 
@@ -27,20 +129,19 @@ class MMRRanker:
                 - λ=1.0: Pure relevance (no diversity)
                 - λ=0.5: Balanced relevance and diversity (recommended)
                 - λ=0.0: Pure diversity
+            quantize: None (float64) or 'int8' — run the document-document
+                similarity passes on int8 codes (1/8 the bytes; near-identical picks
+                when reranking thousands of candidates)
         """
         if not (0 <= lambda_param <= 1):
             raise ValueError("lambda_param must be between 0 and 1")
+        if quantize not in (None, 'int8'):
+            raise ValueError("quantize must be None or 'int8'")
 
         self.lambda_param = lambda_param
+        self.quantize = quantize
         logger.info(f"[MMR] Initialized with lambda={lambda_param} (relevance={lambda_param*100:.0f}%, diversity={(1-lambda_param)*100:.0f}%)")
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors"""
-        norm_product = np.linalg.norm(vec1) * np.linalg.norm(vec2)
-        if norm_product == 0:
-            return 0.0
-        return float(np.dot(vec1, vec2) / norm_product)
-
     def rank(
         self,
         query_embedding: np.ndarray,
@@ -63,51 +164,34 @@ class MMRRanker:
         if not candidate_embeddings:
             return []
 
-        selected_docs = []
-        remaining_docs = set(candidate_embeddings.keys())
-        results = []
-
-        # Greedy selection of top_k most diverse+relevant documents
-        for _ in range(min(top_k, len(remaining_docs))):
-            best_doc = None
-            best_mmr_score = -float('inf')
-            best_relevance = 0
-            best_diversity = 0
-
-            for doc_id in remaining_docs:
-                # 1. Calculate relevance (similarity to query)
-                doc_embedding = candidate_embeddings[doc_id]
-                relevance = self._cosine_similarity(query_embedding, doc_embedding)
-
-                # If relevance_scores provided, weight by that
-                if doc_id in relevance_scores:
-                    relevance = relevance * (relevance_scores[doc_id] / 100.0)
-
-                # 2. Calculate diversity (dissimilarity to already selected)
-                diversity = 1.0  # Start with max diversity for first item
-                if selected_docs:
-                    # Find max similarity to any selected document
-                    max_similarity = max([
-                        self._cosine_similarity(doc_embedding, candidate_embeddings[selected])
-                        for selected in selected_docs
-                    ])
-                    diversity = 1.0 - max_similarity  # Higher = more diverse
-
-                # 3. Calculate MMR score
-                mmr_score = (self.lambda_param * relevance) - (
-                    (1 - self.lambda_param) * (1 - diversity)
-                )
-
-                if mmr_score > best_mmr_score:
-                    best_mmr_score = mmr_score
-                    best_doc = doc_id
-                    best_relevance = relevance
-                    best_diversity = diversity
-
-            if best_doc is not None:
-                selected_docs.append(best_doc)
-                remaining_docs.remove(best_doc)
-                results.append((best_doc, best_mmr_score, best_relevance, best_diversity))
+        # Cosine similarity is a dot product of L2-normalized vectors, so
+        # normalize once and let BLAS do the per-candidate math
+        # Candidates are addressed by row index from here on; ids are only
+        # looked up again for the picked rows
+        doc_ids = list(candidate_embeddings.keys())
+        n = len(doc_ids)
+        unit = _unit_rows(np.stack([
+            np.asarray(vec, dtype=np.float64).ravel() for vec in candidate_embeddings.values()
+        ]))
+        query = _unit_rows(np.asarray(query_embedding, dtype=np.float64).reshape(1, -1))[0]
+
+        # 1. Relevance (similarity to query), weighted by relevance_scores if provided
+        relevance = unit @ query
+        relevance *= np.fromiter(
+            (relevance_scores.get(doc_id, 100.0) / 100.0 for doc_id in doc_ids),
+            dtype=np.float64, count=n
+        )
+
+        # 2-3. Greedy selection of top_k most diverse+relevant documents
+        # (relevance stays exact; only the repeated doc-doc passes read int8 codes)
+        vectors, scale = _quantize_unit(unit) if self.quantize == 'int8' else (unit, 1.0)
+        select = _mmr_select_numba if NUMBA_AVAILABLE else _mmr_select_numpy
+        order, mmr_scores, diversity = select(vectors, relevance, float(self.lambda_param), max(0, min(top_k, n)), scale)
+
+        results = [
+            (doc_ids[i], float(score), float(relevance[i]), float(div))
+            for i, score, div in zip(order.tolist(), mmr_scores.tolist(), diversity.tolist())
+        ]
 
         logger.debug(f"[MMR] Selected {len(results)} documents with average MMR score: {np.mean([r[1] for r in results]):.3f}")
 
@@ -140,7 +224,8 @@ class MMRRanker:
                 logger.warning(f"Result {doc_id} missing embedding, skipping")
                 continue
 
-            embeddings[str(doc_id)] = np.array(result['embedding'])
+            # asarray: no copy when the embedding is already a float64 array
+            embeddings[str(doc_id)] = np.asarray(result['embedding'], dtype=np.float64)
             scores[str(doc_id)] = result.get('score', 0.5)
 
         if not embeddings:
@@ -171,8 +256,9 @@ class FakeEmbedding:
     @staticmethod
     def create_dummy(doc_id: str, dim: int = 768) -> np.ndarray:
         """Create deterministic dummy embedding for testing"""
-        np.random.seed(hash(doc_id) % (2**32))
-        return np.random.randn(dim).astype(np.float32)
+        # Local Generator: no global RNG state touched, safe from worker threads
+        rng = np.random.default_rng(hash(doc_id) % (2**32))
+        return rng.standard_normal(dim, dtype=np.float32)
 
 
 def compare_ranking_strategies(
@@ -201,37 +287,55 @@ def compare_ranking_strategies(
     )[:top_k]
 
     # 2. Pure diversity ranking (no query consideration)
-    embeddings = {str(r.get('id')): np.array(r['embedding']) for r in results if 'embedding' in r}
+    # Convert each result's embedding once; strategies 2 and 3 share the arrays
+    with_embedding = [(r, np.asarray(r['embedding'], dtype=np.float64)) for r in results if 'embedding' in r]
+    embeddings = {str(r.get('id')): vec for r, vec in with_embedding}
     diverse = []
-    remaining = set(embeddings.keys())
 
-    for _ in range(min(top_k, len(remaining))):
-        if not diverse:
-            # First item: pick highest scoring
-            best = max(remaining, key=lambda x: float([r['score'] for r in results if str(r.get('id')) == x][0]))
-        else:
-            # Pick most different from selected
-            best = max(remaining, key=lambda doc: min([
-                1 - abs(np.dot(
-                    embeddings[doc] / (np.linalg.norm(embeddings[doc]) + 1e-8),
-                    embeddings[sel] / (np.linalg.norm(embeddings[sel]) + 1e-8)
-                )) for sel in diverse
-            ]))
-        diverse.append(best)
-        remaining.remove(best)
-
-    strategies['diversity_only'] = [r for r in results if str(r.get('id')) in diverse][:top_k]
+    if embeddings:
+        doc_ids = list(embeddings.keys())
+        matrix = np.stack([embeddings[doc_id].ravel() for doc_id in doc_ids])
+        unit = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8)
+
+        # Score of the first result carrying each id
+        first_score = {}
+        for r in results:
+            doc_id = str(r.get('id'))
+            if doc_id in embeddings and doc_id not in first_score:
+                first_score[doc_id] = float(r['score'])
+
+        available = np.ones(len(doc_ids), dtype=bool)
+        min_dissimilarity = None  # to the selected set, per candidate
+
+        for _ in range(min(top_k, len(doc_ids))):
+            if min_dissimilarity is None:
+                # First item: pick highest scoring
+                key = np.fromiter((first_score[doc_id] for doc_id in doc_ids), dtype=np.float64, count=len(doc_ids))
+            else:
+                # Pick most different from selected
+                key = min_dissimilarity.copy()
+            key[~available] = -np.inf
+            best = int(np.argmax(key))
+            available[best] = False
+            diverse.append(doc_ids[best])
+
+            dissimilarity = 1 - np.abs(unit @ unit[best])
+            min_dissimilarity = (dissimilarity if min_dissimilarity is None
+                                 else np.minimum(min_dissimilarity, dissimilarity))
+
+    diverse_ids = set(diverse)
+    strategies['diversity_only'] = [r for r in results if str(r.get('id')) in diverse_ids][:top_k]
 
     # 3. Balanced MMR ranking
     mmr = MMRRanker(lambda_param=0.5)
-    embeddings_dict = {str(r.get('doc_id') or r.get('id')): np.array(r['embedding'])
-                       for r in results if 'embedding' in r}
+    embeddings_dict = {str(r.get('doc_id') or r.get('id')): vec for r, vec in with_embedding}
     scores_dict = {str(r.get('doc_id') or r.get('id')): r.get('score', 0.5) for r in results}
 
     mmr_ranked = mmr.rank(query_embedding, embeddings_dict, scores_dict, top_k)
+    mmr_ids = {m[0] for m in mmr_ranked}
     strategies['mmr_alpha=0.5'] = [
         r for r in results
-        if str(r.get('doc_id') or r.get('id')) in [m[0] for m in mmr_ranked]
+        if str(r.get('doc_id') or r.get('id')) in mmr_ids
     ][:top_k]
 
     return strategies
@@ -4,14 +4,60 @@ Generates all report formats in one go: Email, PDF, PPT, Podcast, Transcript, Su
 Includes automatic backup and versioning of existing reports.
 """
 
+import asyncio
+import heapq
 import logging
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
+from functools import cached_property
 
 logger = logging.getLogger(__name__)
 
+# Stable report file names inside output_dir (keys are the backup labels)
+_REPORT_FILES = {
+    "pdf":          "report.pdf",
+    "pptx":         "report.pptx",
+    "podcast_mp3":  "podcast.mp3",
+    "podcast_wav":  "podcast.wav",
+    "transcript":   "transcript.txt",
+    "summary_json": "summary.json",
+    "summary_txt":  "summary.txt",
+    "email_report": "email_report.html",
+}
+
+# One "TOP 6 PAPERS" entry of the text summary, filled from a _PaperView
+_PAPER_BLOCK = (
+    "#{idx} {title}\n"
+    "  Source: {source} | Score: {relevance_score}/100\n"
+    "  Platform: {platform} | Impact: {dram_impact}\n"
+    "  Memory Insight: {memory_insight}\n"
+    "  Takeaway: {engineering_takeaway}\n"
+    "\n"
+)
+
+# Summary fallbacks for fields a paper doesn't have
+_PAPER_DEFAULTS = {
+    'title': 'Unknown',
+    'relevance_score': 0,
+    'platform': 'Unknown',
+    'dram_impact': 'Unknown',
+    'source': 'Unknown',
+    'memory_insight': 'N/A',
+    'engineering_takeaway': 'N/A',
+}
+
+
+class _PaperView(dict):
+    """Paper fields with _PAPER_DEFAULTS for missing keys (for str.format_map)"""
+    __slots__ = ()
+
+    def __missing__(self, key):
+        return _PAPER_DEFAULTS[key]
+
 
 class MultiFormatReportOrchestrator:
     """
@@ -41,10 +87,16 @@ class MultiFormatReportOrchestrator:
             self.backup_dir = Path("results/backup")
             self.podcast_dir = self.output_dir
 
-        # Ensure directories exist
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-        self.podcast_dir.mkdir(parents=True, exist_ok=True)
+        # Ensure directories exist (one stat each in the usual already-there case;
+        # podcast_dir is output_dir)
+        for directory in {self.output_dir, self.backup_dir, self.podcast_dir}:
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+
+        # Full report paths, joined once
+        self.report_paths: Dict[str, Path] = {
+            key: self.output_dir / name for key, name in _REPORT_FILES.items()
+        }
 
         # Initialize backup manager
         try:
@@ -55,302 +107,332 @@ class MultiFormatReportOrchestrator:
             self.backup_manager = None
             logger.warning("[Orchestrator] BackupManager not available")
 
-        # Import generators
+        # HTML of the last generated email report (also written to email_report.html)
+        self.email_html: Optional[str] = None
+
+        # LLM Podcast Generator - archived (using template-based generator instead)
+        self.llm_podcast_gen = None
+
+    # Generators are imported and built on first use: reportlab, python-pptx and
+    # the TTS stack are heavy to import, and not every orchestrator generates reports
+
+    @cached_property
+    def email_formatter(self):
+        """Enhanced HTML email formatter"""
         try:
             from .enhanced_formatter import EnhancedReportFormatter
-            self.email_formatter = EnhancedReportFormatter()
+            return EnhancedReportFormatter()
         except ImportError:
-            self.email_formatter = None
             logger.warning("[Orchestrator] enhanced_formatter not available")
+            return None
 
+    @cached_property
+    def pdf_gen(self):
+        """PDF report generator"""
         try:
             from .pdf_generator import PDFReportGenerator
-            self.pdf_gen = PDFReportGenerator(
-                output_path=str(self.output_dir / "report.pdf")
+            return PDFReportGenerator(
+                output_path=str(self.report_paths['pdf'])
             )
         except ImportError:
-            self.pdf_gen = None
             logger.warning("[Orchestrator] pdf_generator not available")
+            return None
 
+    @cached_property
+    def pptx_gen(self):
+        """PowerPoint generator"""
         try:
             from .pptx_generator import PowerPointGenerator
-            self.pptx_gen = PowerPointGenerator(
-                output_path=str(self.output_dir / "report.pptx")
+            return PowerPointGenerator(
+                output_path=str(self.report_paths['pptx'])
             )
         except ImportError:
-            self.pptx_gen = None
             logger.warning("[Orchestrator] pptx_generator not available")
+            return None
 
+    @cached_property
+    def podcast_gen(self):
+        """Podcast audio generator"""
         try:
-            from .podcast_generator import PodcastGenerator, TranscriptGenerator
+            from .podcast_generator import PodcastGenerator
             # Get greeting from PathConfig if available
             greeting = None
             if self.path_config:
                 greeting = self.path_config.get_podcast_greeting()
 
-            self.podcast_gen = PodcastGenerator(
+            return PodcastGenerator(
                 output_dir=str(self.podcast_dir),
                 greeting=greeting,
                 intro_music_path=self.path_config.get_podcast_intro_music() if self.path_config else None,
                 outro_music_path=self.path_config.get_podcast_outro_music() if self.path_config else None,
             )
-            self.transcript_gen = TranscriptGenerator()
         except ImportError:
-            self.podcast_gen = None
-            self.transcript_gen = None
             logger.warning("[Orchestrator] podcast_generator not available")
+            return None
 
-        # LLM Podcast Generator - archived (using template-based generator instead)
-        self.llm_podcast_gen = None
+    @cached_property
+    def transcript_gen(self):
+        """Podcast transcript generator"""
+        try:
+            from .podcast_generator import TranscriptGenerator
+            return TranscriptGenerator()
+        except ImportError:
+            logger.warning("[Orchestrator] podcast_generator not available")
+            return None
 
-        # Initialize JSON summary generator
+    @cached_property
+    def summary_gen(self):
+        """JSON summary generator"""
         try:
             from .summary_generator import JsonSummaryGenerator
-            self.summary_gen = JsonSummaryGenerator()
+            return JsonSummaryGenerator()
         except ImportError:
-            self.summary_gen = None
             logger.warning("[Orchestrator] summary_generator not available")
+            return None
 
-        # Initialize source link processor
+    @cached_property
+    def source_processor(self):
+        """Source link processor"""
         try:
             from .source_link_processor import SourceLinkProcessor
-            self.source_processor = SourceLinkProcessor()
+            return SourceLinkProcessor()
         except ImportError:
-            self.source_processor = None
             logger.warning("[Orchestrator] source_link_processor not available")
+            return None
 
     def generate_all(self, insights: List[Dict]) -> Dict[str, bool]:
         """
         Generate all report formats with automatic backup and versioning
         Returns: Dict with format -> success status
         """
+        self.email_html = None
         if not insights:
             logger.warning("[Orchestrator] No insights to generate reports")
             return {}
 
         results = {}
 
-        logger.info(f"[Orchestrator] Starting multi-format report generation for {len(insights)} papers...")
+        logger.info("[Orchestrator] Starting multi-format report generation for %s papers...", len(insights))
 
         # BACKUP EXISTING REPORTS (before generating new ones)
         if self.backup_manager:
-            files_to_backup = {
-                "pdf":          self.output_dir / "report.pdf",
-                "pptx":         self.output_dir / "report.pptx",
-                "podcast_mp3":  self.output_dir / "podcast.mp3",
-                "podcast_wav":  self.output_dir / "podcast.wav",
-                "transcript":   self.output_dir / "transcript.txt",
-                "summary_json": self.output_dir / "summary.json",
-                "summary_txt":  self.output_dir / "summary.txt",
-                "email_report": self.output_dir / "email_report.html",
-            }
-            backup_results = self.backup_manager.backup_and_version(files_to_backup)
-            logger.info(f"[Orchestrator] Backed up {sum(1 for v in backup_results.values() if v)} existing files")
-
-        # 1. Enhanced Email
-        if self.email_formatter:
-            try:
-                html = self.email_formatter.build_html(insights)
-                email_path = self.output_dir / "email_report.html"
-                email_path.write_text(html, encoding='utf-8')
-                logger.info(f"[Orchestrator] ✅ Email report: {email_path}")
-                results['email'] = True
-            except Exception as e:
-                logger.error(f"[Orchestrator] ❌ Email generation failed: {e}")
-                results['email'] = False
-        else:
-            results['email'] = False
-
-        # 2. PDF Report
-        if self.pdf_gen:
-            try:
-                success = self.pdf_gen.generate(insights)
-                if success:
-                    logger.info(f"[Orchestrator] ✅ PDF report: {self.output_dir / 'report.pdf'}")
-                results['pdf'] = success
-            except Exception as e:
-                logger.error(f"[Orchestrator] ❌ PDF generation failed: {e}")
-                results['pdf'] = False
-        else:
-            results['pdf'] = False
-
-        # 3. PowerPoint Presentation
-        if self.pptx_gen:
-            try:
-                success = self.pptx_gen.generate(insights)
-                if success:
-                    logger.info(f"[Orchestrator] ✅ PowerPoint: {self.output_dir / 'report.pptx'}")
-                results['pptx'] = success
-            except Exception as e:
-                logger.error(f"[Orchestrator] ❌ PPT generation failed: {e}")
-                results['pptx'] = False
-        else:
-            results['pptx'] = False
-
-        # 4. Podcast Audio
-        podcast_success = False
-
-        if self.podcast_gen:
-            try:
-                logger.info("[Orchestrator] Generating podcast...")
-                podcast_results = self.podcast_gen.generate(
-                    insights=insights,
-                    title="On-Device AI Intelligence Report",
-                    episode_number=datetime.now().strftime("%Y-%m-%d"),
-                    description=f"Intelligence report on {len(insights)} papers",
-                    source_links=[p.get('link') for p in insights if p.get('link')]
-                )
-
-                # podcast_generator saves with a timestamp in the filename.
-                # Copy to stable names (podcast.mp3 / podcast.wav) in output_dir
-                # so backup, email attachment and archiving all resolve from one place.
-                import shutil
-                if podcast_results.get("mp3"):
-                    src = Path(podcast_results["mp3"])
-                    dst = self.output_dir / "podcast.mp3"
-                    shutil.copy2(str(src), str(dst))
-                    src.unlink(missing_ok=True)   # remove timestamped copy, keep only stable
-                    logger.info(f"[Orchestrator] ✅ Podcast MP3: {dst}")
-                    podcast_success = True
-
-                if podcast_results.get("wav"):
-                    src = Path(podcast_results["wav"])
-                    dst = self.output_dir / "podcast.wav"
-                    shutil.copy2(str(src), str(dst))
-                    src.unlink(missing_ok=True)
-                    logger.info(f"[Orchestrator] ✅ Podcast WAV: {dst}")
-
-            except Exception as e:
-                logger.error(f"[Orchestrator] ❌ Podcast generation failed: {e}", exc_info=True)
-                podcast_success = False
-
-        results['podcast'] = podcast_success
-
-        # 5. Transcript
-        if self.transcript_gen:
-            try:
-                success = self.transcript_gen.generate_transcript(
-                    insights,
-                    output_path=str(self.output_dir / "transcript.txt")
-                )
-                if success:
-                    logger.info(f"[Orchestrator] ✅ Transcript: {self.output_dir / 'transcript.txt'}")
-                results['transcript'] = success
-            except Exception as e:
-                logger.error(f"[Orchestrator] ❌ Transcript generation failed: {e}")
-                results['transcript'] = False
-        else:
-            results['transcript'] = False
-
-        # 6. Summary Documents (Text + JSON)
+            backup_results = self.backup_manager.backup_and_version(dict(self.report_paths))
+            logger.info("[Orchestrator] Backed up %s existing files", sum(1 for v in backup_results.values() if v))
+
+        # The formats are independent of each other: build them concurrently
+        # (PDF/PPTX serialization, TTS and file writes overlap instead of queueing)
+        # format → (log label, step); each step returns its success flag
+        steps = {
+            'email':      ("Email", self._generate_email),
+            'pdf':        ("PDF", self._generate_pdf),
+            'pptx':       ("PPT", self._generate_pptx),
+            'podcast':    ("Podcast", self._generate_podcast),
+            'transcript': ("Transcript", self._generate_transcript),
+            'summary':    ("Summary", self._generate_summaries),
+        }
+        # Sorted once for every format's "top papers" section (each generator
+        # sorts for itself if the scores don't compare)
         try:
-            summary_txt_path = self.output_dir / "summary.txt"
-            summary_json_path = self.output_dir / "summary.json"
-
-            self._generate_summary(insights, str(summary_txt_path), str(summary_json_path))
-            logger.info(f"[Orchestrator] ✅ Text Summary: {summary_txt_path}")
-            logger.info(f"[Orchestrator] ✅ JSON Summary: {summary_json_path}")
-            results['summary'] = True
-        except Exception as e:
-            logger.error(f"[Orchestrator] ❌ Summary generation failed: {e}")
-            results['summary'] = False
+            ranked = sorted(insights, key=lambda x: x.get('relevance_score', 0), reverse=True)
+        except TypeError:
+            ranked = None
+        with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="report") as pool:
+            futures = {
+                pool.submit(self._run_step, label, step, insights, ranked): fmt
+                for fmt, (label, step) in steps.items()
+            }
+            completed = {futures[future]: future.result() for future in as_completed(futures)}
+        results.update((fmt, completed[fmt]) for fmt in steps)  # report in the usual order
 
         # Print overview
         logger.info("[Orchestrator] ==================== REPORT GENERATION COMPLETE ====================")
         logger.info("[Orchestrator] Generated formats:")
         for fmt, success in results.items():
             status = "✅" if success else "❌"
-            logger.info(f"  {status} {fmt.upper()}")
+            logger.info("  %s %s", status, fmt.upper())
         logger.info("[Orchestrator] ========================================================================")
 
         return results
 
-    def _generate_summary(self, insights: List[Dict], txt_path: str, json_path: str = None):
-        """Generate text and JSON summaries"""
+    async def generate_all_async(self, insights: List[Dict]) -> Dict[str, bool]:
+        """
+        generate_all for async callers: the blocking generation and file I/O run in
+        the default executor so the event loop keeps serving other tasks
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate_all, insights)
+
+    def _run_step(self, label: str, step, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """Run one format step; any exception is logged and reported as a failure"""
+        try:
+            return bool(step(insights, ranked))
+        except Exception as e:
+            logger.error("[Orchestrator] ❌ %s generation failed: %s", label, e, exc_info=True)
+            return False
+
+    def _generate_email(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """1. Enhanced Email"""
+        if not self.email_formatter:
+            return False
+        html = self.email_formatter.build_html(insights, ranked)
+        email_path = self.report_paths['email_report']
+        email_path.write_text(html, encoding='utf-8')
+        self.email_html = html
+        logger.info("[Orchestrator] ✅ Email report: %s", email_path)
+        return True
+
+    def _generate_pdf(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """2. PDF Report"""
+        if not self.pdf_gen:
+            return False
+        success = self.pdf_gen.generate(insights, ranked)
+        if success:
+            logger.info("[Orchestrator] ✅ PDF report: %s", self.report_paths['pdf'])
+        return success
+
+    def _generate_pptx(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """3. PowerPoint Presentation"""
+        if not self.pptx_gen:
+            return False
+        success = self.pptx_gen.generate(insights, ranked)
+        if success:
+            logger.info("[Orchestrator] ✅ PowerPoint: %s", self.report_paths['pptx'])
+        return success
+
+    def _generate_podcast(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """4. Podcast Audio"""
+        if not self.podcast_gen:
+            return False
+
+        logger.info("[Orchestrator] Generating podcast...")
+        podcast_results = self.podcast_gen.generate(
+            insights=insights,
+            title="On-Device AI Intelligence Report",
+            episode_number=datetime.now().strftime("%Y-%m-%d"),
+            description=f"Intelligence report on {len(insights)} papers",
+            source_links=[p.get('link') for p in insights if p.get('link')]
+        )
+
+        # podcast_generator saves with a timestamp in the filename.
+        # Copy to stable names (podcast.mp3 / podcast.wav) in output_dir
+        # so backup, email attachment and archiving all resolve from one place.
+        import shutil
+        podcast_success = False
+        if podcast_results.get("mp3"):
+            src = Path(podcast_results["mp3"])
+            dst = self.report_paths['podcast_mp3']
+            shutil.copy2(str(src), str(dst))
+            src.unlink(missing_ok=True)   # remove timestamped copy, keep only stable
+            logger.info("[Orchestrator] ✅ Podcast MP3: %s", dst)
+            podcast_success = True
+
+        if podcast_results.get("wav"):
+            src = Path(podcast_results["wav"])
+            dst = self.report_paths['podcast_wav']
+            shutil.copy2(str(src), str(dst))
+            src.unlink(missing_ok=True)
+            logger.info("[Orchestrator] ✅ Podcast WAV: %s", dst)
+
+        return podcast_success
+
+    def _generate_transcript(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """5. Transcript"""
+        if not self.transcript_gen:
+            return False
+        success = self.transcript_gen.generate_transcript(
+            insights,
+            output_path=str(self.report_paths['transcript'])
+        )
+        if success:
+            logger.info("[Orchestrator] ✅ Transcript: %s", self.report_paths['transcript'])
+        return success
+
+    def _generate_summaries(self, insights: List[Dict], ranked: Optional[List[Dict]]) -> bool:
+        """6. Summary Documents (Text + JSON)"""
+        summary_txt_path = self.report_paths['summary_txt']
+        summary_json_path = self.report_paths['summary_json']
+
+        self._generate_summary(insights, str(summary_txt_path), str(summary_json_path), ranked)
+        logger.info("[Orchestrator] ✅ Text Summary: %s", summary_txt_path)
+        logger.info("[Orchestrator] ✅ JSON Summary: %s", summary_json_path)
+        return True
+
+    def _generate_summary(self, insights: List[Dict], txt_path: str, json_path: str = None,
+                          ranked: Optional[List[Dict]] = None):
+        """Generate text and JSON summaries (`ranked`: insights pre-sorted by relevance, if available)"""
         import json
 
-        # Generate text summary
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("ON-DEVICE AI INTELLIGENCE REPORT - SUMMARY\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y')}\n")
-            f.write("Confidence: Based on primary sources\n")
-            f.write("=" * 80 + "\n\n")
-
-            # Metrics
-            f.write("EXECUTIVE SUMMARY\n")
-            f.write("-" * 80 + "\n")
-            total = len(insights)
-            avg_score = sum(i.get('relevance_score', 0) for i in insights) / total if total else 0
-
-            f.write(f"Total Papers Analyzed: {total}\n")
-            f.write(f"Average Relevance Score: {avg_score:.1f}/100\n\n")
-
-            # Platform breakdown
-            platforms = {}
-            for item in insights:
-                platform = item.get('platform', 'Unknown')
-                platforms[platform] = platforms.get(platform, 0) + 1
-
-            f.write("Platform Breakdown:\n")
-            for platform, count in sorted(platforms.items(), key=lambda x: x[1], reverse=True):
-                f.write(f"  • {platform}: {count} papers\n")
-            f.write("\n")
-
-            # Impact analysis
-            high_impact = len([i for i in insights if i.get('dram_impact') == 'High'])
-            medium_impact = len([i for i in insights if i.get('dram_impact') == 'Medium'])
-            low_impact = len([i for i in insights if i.get('dram_impact') == 'Low'])
-
-            f.write("Impact Distribution:\n")
-            f.write(f"  • High Impact: {high_impact} papers\n")
-            f.write(f"  • Medium Impact: {medium_impact} papers\n")
-            f.write(f"  • Low Impact: {low_impact} papers\n\n")
-
-            # Top papers
-            sorted_insights = sorted(
-                insights,
-                key=lambda x: x.get('relevance_score', 0),
-                reverse=True
-            )
+        total = len(insights)
+        score_sum = 0
+        platforms = Counter()
+        impacts = Counter()
+        techniques = Counter()
+        # One pass over the insights for every aggregate below
+        for item in insights:
+            score_sum += item.get('relevance_score', 0)
+            platforms[item.get('platform', 'Unknown')] += 1
+            impacts[item.get('dram_impact')] += 1
+            tech = item.get('quantization_method', 'N/A')
+            if tech != 'N/A':
+                techniques[tech] += 1
+        avg_score = score_sum / total if total else 0
+        if ranked is not None:
+            top_papers = ranked[:6]
+        else:
+            # Same order as sorted(..., reverse=True)[:6], without sorting everything
+            top_papers = heapq.nlargest(6, insights, key=lambda x: x.get('relevance_score', 0))
+        # Wrapped once: field reads below are plain subscripts with the summary defaults
+        top_papers = [_PaperView(paper) for paper in top_papers]
+
+        # Generate text summary: assemble in memory, then one write
+        parts = []
+        parts.append("=" * 80 + "\n")
+        parts.append("ON-DEVICE AI INTELLIGENCE REPORT - SUMMARY\n")
+        parts.append(f"Generated: {datetime.now().strftime('%B %d, %Y')}\n")
+        parts.append("Confidence: Based on primary sources\n")
+        parts.append("=" * 80 + "\n\n")
+
+        # Metrics
+        parts.append("EXECUTIVE SUMMARY\n")
+        parts.append("-" * 80 + "\n")
+        parts.append(f"Total Papers Analyzed: {total}\n")
+        parts.append(f"Average Relevance Score: {avg_score:.1f}/100\n\n")
+
+        # Platform breakdown
+        parts.append("Platform Breakdown:\n")
+        for platform, count in platforms.most_common():
+            parts.append(f"  • {platform}: {count} papers\n")
+        parts.append("\n")
+
+        # Impact analysis
+        parts.append("Impact Distribution:\n")
+        parts.append(f"  • High Impact: {impacts['High']} papers\n")
+        parts.append(f"  • Medium Impact: {impacts['Medium']} papers\n")
+        parts.append(f"  • Low Impact: {impacts['Low']} papers\n\n")
+
+        # Top papers
+        parts.append("TOP 6 PAPERS\n")
+        parts.append("-" * 80 + "\n\n")
+
+        for idx, paper in enumerate(top_papers, 1):
+            paper['idx'] = idx
+            parts.append(_PAPER_BLOCK.format_map(paper))
+
+        # Key findings
+        parts.append("KEY FINDINGS\n")
+        parts.append("-" * 80 + "\n")
+
+        parts.append("Top Techniques:\n")
+        for tech, count in techniques.most_common(3):
+            parts.append(f"  • {tech}: {count} papers\n")
+        parts.append("\n")
+
+        parts.append("=" * 80 + "\n")
+        parts.append("For more details, see the full reports in other formats.\n")
+        parts.append("=" * 80 + "\n")
 
-            f.write("TOP 6 PAPERS\n")
-            f.write("-" * 80 + "\n\n")
-
-            for idx, paper in enumerate(sorted_insights[:6], 1):
-                title = paper.get('title', 'Unknown')
-                score = paper.get('relevance_score', 0)
-                platform = paper.get('platform', 'Unknown')
-                impact = paper.get('dram_impact', 'Unknown')
-                source = paper.get('source', 'Unknown')
-                memory = paper.get('memory_insight', 'N/A')
-                takeaway = paper.get('engineering_takeaway', 'N/A')
-
-                f.write(f"#{idx} {title}\n")
-                f.write(f"  Source: {source} | Score: {score}/100\n")
-                f.write(f"  Platform: {platform} | Impact: {impact}\n")
-                f.write(f"  Memory Insight: {memory}\n")
-                f.write(f"  Takeaway: {takeaway}\n")
-                f.write("\n")
-
-            # Key findings
-            f.write("KEY FINDINGS\n")
-            f.write("-" * 80 + "\n")
-
-            techniques = {}
-            for item in insights:
-                tech = item.get('quantization_method', 'N/A')
-                if tech != 'N/A':
-                    techniques[tech] = techniques.get(tech, 0) + 1
-
-            f.write("Top Techniques:\n")
-            for tech, count in sorted(techniques.items(), key=lambda x: x[1], reverse=True)[:3]:
-                f.write(f"  • {tech}: {count} papers\n")
-            f.write("\n")
-
-            f.write("=" * 80 + "\n")
-            f.write("For more details, see the full reports in other formats.\n")
-            f.write("=" * 80 + "\n")
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
 
         # Generate JSON summary if path provided
         if json_path:
@@ -358,10 +440,8 @@ class MultiFormatReportOrchestrator:
                 from .summary_generator import JsonSummaryGenerator
                 json_gen = JsonSummaryGenerator()
 
-                # Create executive summary
-                total = len(insights)
-                avg_score = sum(i.get('relevance_score', 0) for i in insights) / total if total else 0
-                high_impact = len([i for i in insights if i.get('dram_impact') == 'High'])
+                # Create executive summary (aggregates from the pass above)
+                high_impact = impacts['High']
 
                 executive_summary = (
                     f"Analysis of {total} papers on on-device AI optimization techniques. "
@@ -370,14 +450,7 @@ class MultiFormatReportOrchestrator:
                 )
 
                 # Extract takeaways from papers
-                takeaways = [
-                    paper.get('engineering_takeaway', 'N/A')
-                    for paper in sorted(
-                        insights,
-                        key=lambda x: x.get('relevance_score', 0),
-                        reverse=True
-                    )[:5]
-                ]
+                takeaways = [paper['engineering_takeaway'] for paper in top_papers[:5]]
 
                 json_summary = json_gen.build_json_summary(
                     papers=insights,
@@ -387,10 +460,11 @@ class MultiFormatReportOrchestrator:
                 )
 
                 with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_summary.to_dict(), f, indent=2, default=str)
-                logger.info(f"[Orchestrator] JSON summary saved: {json_path}")
+                    # dumps + one write: json.dump() writes every token separately
+                    f.write(json.dumps(json_summary.to_dict(), indent=2, default=str))
+                logger.info("[Orchestrator] JSON summary saved: %s", json_path)
             except Exception as e:
-                logger.warning(f"[Orchestrator] JSON summary generation failed: {e}")
+                logger.warning("[Orchestrator] JSON summary generation failed: %s", e)
 
 
 __all__ = ['MultiFormatReportOrchestrator']
\ No newline at end of file
@@ -3,6 +3,8 @@ Multi-Format Report Integration
 Seamlessly integrates multi-format report generation into the email pipeline
 """
 
+import asyncio
+import fnmatch
 import logging
 import os
 from typing import List, Dict, Tuple, Optional
@@ -10,6 +12,10 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Fixed-name report files attached to the email, in attachment order
+# (the podcast MP3 is looked up separately: it has a timestamped fallback)
+_ATTACHMENT_FILES = ("report.pdf", "report.pptx", "transcript.txt", "summary.txt")
+
 
 class MultiFormatReportIntegration:
     """
@@ -20,7 +26,8 @@ class MultiFormatReportIntegration:
     def __init__(self, output_dir: str = "results/reports"):
         """Initialize integration"""
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
 
         # Import orchestrator
         try:
@@ -31,7 +38,7 @@ class MultiFormatReportIntegration:
         except ImportError as e:
             self.orchestrator = None
             self.available = False
-            logger.warning(f"[MultiFormat] Orchestrator not available: {e}")
+            logger.warning("[MultiFormat] Orchestrator not available: %s", e)
 
     def generate_multiformat_reports(self, insights: List[Dict]) -> Tuple[str, Dict]:
         """
@@ -51,28 +58,62 @@ class MultiFormatReportIntegration:
             logger.warning("[MultiFormat] No insights to generate reports")
             return "", {}
 
-        logger.info(f"[MultiFormat] Generating multi-format reports for {len(insights)} papers...")
+        logger.info("[MultiFormat] Generating multi-format reports for %s papers...", len(insights))
 
         try:
             # Generate all formats
             results = self.orchestrator.generate_all(insights)
 
-            # Get email HTML content
-            email_html = self._read_email_report()
+            # Get email HTML content (kept in memory by the orchestrator; disk only as fallback)
+            email_html = self.orchestrator.email_html
+            if email_html is None:
+                email_html = self._read_email_report()
+
+            self._log_summary(results)
+            return email_html, results
+
+        except Exception as e:
+            logger.error("[MultiFormat] Generation failed: %s", e)
+            return "", {}
+
+    async def generate_multiformat_reports_async(self, insights: List[Dict]) -> Tuple[str, Dict]:
+        """
+        generate_multiformat_reports for async callers (e.g. the email dispatch
+        path): report generation and file reads run off the event loop
+        """
+        if not self.available or not self.orchestrator:
+            logger.error("[MultiFormat] Orchestrator not available")
+            return "", {}
+
+        if not insights:
+            logger.warning("[MultiFormat] No insights to generate reports")
+            return "", {}
 
-            # Log summary
-            logger.info("[MultiFormat] ==================== GENERATION SUMMARY ====================")
-            for fmt, success in results.items():
-                status = "✅" if success else "❌"
-                logger.info(f"  {status} {fmt.upper()}")
-            logger.info("[MultiFormat] ================================================================")
+        logger.info("[MultiFormat] Generating multi-format reports for %s papers...", len(insights))
 
+        try:
+            results = await self.orchestrator.generate_all_async(insights)
+
+            email_html = self.orchestrator.email_html
+            if email_html is None:
+                email_html = await self._read_email_report_async()
+
+            self._log_summary(results)
             return email_html, results
 
         except Exception as e:
-            logger.error(f"[MultiFormat] Generation failed: {e}")
+            logger.error("[MultiFormat] Generation failed: %s", e)
             return "", {}
 
+    @staticmethod
+    def _log_summary(results: Dict):
+        """Log per-format success"""
+        logger.info("[MultiFormat] ==================== GENERATION SUMMARY ====================")
+        for fmt, success in results.items():
+            status = "✅" if success else "❌"
+            logger.info("  %s %s", status, fmt.upper())
+        logger.info("[MultiFormat] ================================================================")
+
     def _read_email_report(self) -> str:
         """Read the generated email HTML report"""
         email_path = os.path.join(self.output_dir, "email_report.html")
@@ -82,41 +123,57 @@ class MultiFormatReportIntegration:
                 with open(email_path, 'r', encoding='utf-8') as f:
                     return f.read()
             else:
-                logger.warning(f"[MultiFormat] Email report not found: {email_path}")
+                logger.warning("[MultiFormat] Email report not found: %s", email_path)
                 return ""
         except Exception as e:
-            logger.error(f"[MultiFormat] Failed to read email report: {e}")
+            logger.error("[MultiFormat] Failed to read email report: %s", e)
             return ""
 
+    async def _read_email_report_async(self) -> str:
+        """_read_email_report without blocking the event loop on file I/O"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read_email_report)
+
+    def _scan_output_dir(self) -> Dict[str, int]:
+        """
+        {filename: size in bytes} for regular files in output_dir, from a single
+        os.scandir pass (DirEntry caches the type and stat results)
+        """
+        files = {}
+        try:
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat().st_size
+        except FileNotFoundError:
+            pass
+        return files
+
     def get_attachment_paths(self) -> List[str]:
         """
         Get paths of all generated report files for email attachments.
         All files live in the same output_dir — podcast included.
         Glob fallback finds timestamped podcast files if stable name is missing.
         """
-        import glob as _glob
-        attachments = []
+        present = self._scan_output_dir()
 
         # Fixed-name files — always in output_dir
-        for filename in ["report.pdf", "report.pptx", "transcript.txt", "summary.txt"]:
-            filepath = os.path.join(self.output_dir, filename)
-            if os.path.exists(filepath):
-                attachments.append(filepath)
-                logger.info(f"[MultiFormat] Will attach: {filename}")
+        attachments = [
+            os.path.join(self.output_dir, filename)
+            for filename in _ATTACHMENT_FILES if filename in present
+        ]
+        for path in attachments:
+            logger.info("[MultiFormat] Will attach: %s", os.path.basename(path))
 
         # Podcast MP3 — stable name preferred, fall back to most-recent timestamped
-        stable_mp3 = os.path.join(self.output_dir, "podcast.mp3")
-        if os.path.exists(stable_mp3):
-            attachments.append(stable_mp3)
+        if "podcast.mp3" in present:
+            attachments.append(os.path.join(self.output_dir, "podcast.mp3"))
             logger.info("[MultiFormat] Will attach: podcast.mp3")
         else:
-            candidates = sorted(
-                _glob.glob(os.path.join(self.output_dir, "podcast_*.mp3")),
-                reverse=True
-            )
+            candidates = sorted(fnmatch.filter(present, "podcast_*.mp3"), reverse=True)
             if candidates:
-                attachments.append(candidates[0])
-                logger.info(f"[MultiFormat] Will attach: {os.path.basename(candidates[0])} (fallback)")
+                attachments.append(os.path.join(self.output_dir, candidates[0]))
+                logger.info("[MultiFormat] Will attach: %s (fallback)", candidates[0])
             else:
                 logger.warning("[MultiFormat] No podcast MP3 found to attach")
 
@@ -130,18 +187,13 @@ class MultiFormatReportIntegration:
             'total_size_mb': 0.0
         }
 
-        if not os.path.exists(self.output_dir):
-            return stats
-
         try:
-            for filename in os.listdir(self.output_dir):
-                filepath = os.path.join(self.output_dir, filename)
-                if os.path.isfile(filepath):
-                    size_mb = os.path.getsize(filepath) / (1024 * 1024)
-                    stats['generated_files'][filename] = f"{size_mb:.2f} MB"
-                    stats['total_size_mb'] += size_mb
+            for filename, size in self._scan_output_dir().items():
+                size_mb = size / (1024 * 1024)
+                stats['generated_files'][filename] = f"{size_mb:.2f} MB"
+                stats['total_size_mb'] += size_mb
         except Exception as e:
-            logger.error(f"[MultiFormat] Failed to get stats: {e}")
+            logger.error("[MultiFormat] Failed to get stats: %s", e)
 
         return stats
 
@@ -172,10 +224,10 @@ def generate_multiformat_email_report(papers: List[Dict], output_dir: str = "res
 
     # Log summary
     stats = integration.get_generation_stats()
-    logger.info(f"\n[MultiFormat] Generation complete:")
-    logger.info(f"  Email HTML: {len(email_html)} bytes")
-    logger.info(f"  Attachments: {len(attachments)} files")
-    logger.info(f"  Total Size: {stats['total_size_mb']:.2f} MB")
+    logger.info("\n[MultiFormat] Generation complete:")
+    logger.info("  Email HTML: %s bytes", len(email_html))
+    logger.info("  Attachments: %s files", len(attachments))
+    logger.info("  Total Size: %.2f MB", stats['total_size_mb'])
 
     return email_html, attachments, results
 
@@ -5,12 +5,24 @@ FINAL FIX: Correct Gemini import + _reasoning field fix
 import os
 import json
 import time
+import random
+import re
+import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Dict, Optional, List, Tuple
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple, Union
 from enum import Enum
+from functools import lru_cache
 from datetime import datetime
+import httpx
 import requests
-from groq import Groq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from groq import Groq, AsyncGroq
 
 # google-genai SDK (new, >=1.0)
 try:
@@ -20,6 +32,31 @@ except ImportError:
     genai_sdk = None
     GEMINI_AVAILABLE = False
 
+# Optional per-provider request rate limiting for the async path
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AsyncLimiter = None
+    AIOLIMITER_AVAILABLE = False
+
+# Optional C JSON parser for provider responses
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# Optional on-disk cache of parsed LLM analyses
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    diskcache = None
+    DISKCACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +73,38 @@ class ModelStatus(Enum):
     UNKNOWN = "unknown"
 
 
+# JSON payload inside a ```json fence, else the outermost {...} of a response
+_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Static tail of every article prompt (_build_prompt_with_reasoning splices the
+# context and article fields in front of it)
+_PROMPT_SUFFIX = """
+
+REQUIRED JSON OUTPUT (include ALL fields):
+{
+  "_reasoning": "<Explain: Why is this on-device relevant? What memory implications? Why this score?>",
+  "relevance_score": <0-100 integer>,
+  "platform": "<Mobile|Laptop|Both|IoT|Edge|Unknown>",
+  "model_type": "<LLM|Vision|Audio|Multimodal|Other|Unknown>",
+  "memory_insight": "<Specific memory/DRAM details or 'Unknown'>",
+  "dram_impact": "<High|Medium|Low|Unknown>",
+  "engineering_takeaway": "<One actionable sentence>"
+}
+
+CRITICAL: Must include _reasoning field explaining your score!"""
+
+
+@dataclass
+class ProcessorConfig:
+    """Batch settings for EnterpriseAIProcessor.process_articles"""
+    max_workers: int = 5                  # articles in flight at once
+    timeout_per_item: float = 180.0       # seconds per article, retries included
+    hedge: bool = False                   # race the top two providers per request
+    # requests/minute per provider for the async path (needs aiolimiter)
+    rate_limits: Dict[ModelProvider, float] = field(default_factory=dict)
+
+
 class GroqClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -47,6 +116,16 @@ class GroqClient:
             "gemma2-9b-it"
         ]
         self.current_idx = 0
+        self._async_client = None
+        self._async_loop = None
+
+    def _aclient(self) -> AsyncGroq:
+        """AsyncGroq for the running event loop (pooled connections can't cross loops)"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = AsyncGroq(api_key=self.api_key)
+            self._async_loop = loop
+        return self._async_client
 
     def check_health(self) -> ModelStatus:
         try:
@@ -56,62 +135,161 @@ class GroqClient:
             logger.error(f"Groq health check failed: {e}")
             return ModelStatus.FAILED
 
+    @staticmethod
+    def _completion_args(model: str, prompt: str, kwargs: Dict) -> Dict:
+        return {
+            'model': model,
+            'messages': [{"role": "user", "content": prompt}],
+            'temperature': kwargs.get('temperature', 0.1),
+            'response_format': {"type": "json_object"} if kwargs.get('json_mode', True) else None,
+        }
+
+    def _pick_model(self, failed: set) -> str:
+        """Current pool model, skipping models that already failed for this prompt"""
+        while self.model_pool[self.current_idx] in failed:
+            self.current_idx = (self.current_idx + 1) % len(self.model_pool)
+        return self.model_pool[self.current_idx]
+
+    def _model_failed(self, model: str, error: Exception, failed: set) -> float:
+        """
+        Exclude `model` for the rest of this prompt and rotate past it.
+        Returns the backoff before the next model: exponential on rate limits, else 0
+        """
+        failed.add(model)
+        self.current_idx = (self.current_idx + 1) % len(self.model_pool)
+        error_str = str(error).lower()
+        if "429" in error_str or "rate limit" in error_str:
+            logger.warning(f"🔄 Groq {model} limited. Rotating ({len(failed)}/{len(self.model_pool)} models tried)")
+            return 0.2 * 2 ** len(failed) if len(failed) < len(self.model_pool) else 0.0
+        logger.error(f"Groq error on {model}: {error}")
+        return 0.0
+
     def generate(self, prompt: str, **kwargs) -> Optional[str]:
-        for _ in range(2):
-            model = self.model_pool[self.current_idx]
+        failed = set()
+        while len(failed) < len(self.model_pool):
+            model = self._pick_model(failed)
             try:
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=kwargs.get('temperature', 0.1),
-                    response_format={"type": "json_object"} if kwargs.get('json_mode', True) else None,
-                )
+                response = self.client.chat.completions.create(**self._completion_args(model, prompt, kwargs))
                 return response.choices[0].message.content
             except Exception as e:
-                error_str = str(e).lower()
-                if "429" in error_str or "rate limit" in error_str:
-                    self.current_idx = (self.current_idx + 1) % len(self.model_pool)
-                    logger.warning(f"🔄 Groq {model} limited. Rotating to {self.model_pool[self.current_idx]}")
-                    continue
-                logger.error(f"Groq error: {e}")
-                return None
+                delay = self._model_failed(model, e, failed)
+                if delay:
+                    time.sleep(delay)
+        return None
+
+    async def agenerate(self, prompt: str, **kwargs) -> Optional[str]:
+        failed = set()
+        while len(failed) < len(self.model_pool):
+            model = self._pick_model(failed)
+            try:
+                response = await self._aclient().chat.completions.create(**self._completion_args(model, prompt, kwargs))
+                return response.choices[0].message.content
+            except Exception as e:
+                delay = self._model_failed(model, e, failed)
+                if delay:
+                    await asyncio.sleep(delay)
         return None
 
 
 class OllamaClient:
+    # /api/tags answers both "which models" and "is the server up"; one fetch
+    # serves both for this long and is only made once the client is used
+    TAGS_TTL = 60
+
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
-        self.available_models = []
+        self.available_models = None
+        self._tags_ts = 0.0
+        self._health = None
         self.default_model = "gemma3:4b"
-        self._load_available_models()
+        # Keep-alive connection pool for every call to the server; idempotent
+        # requests (GET /api/tags) are retried on gateway errors, generation isn't
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._async_client = None
+        self._async_loop = None
+
+    def _aclient(self) -> httpx.AsyncClient:
+        """httpx.AsyncClient for the running event loop (pooled connections can't cross loops)"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=60, limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            )
+            self._async_loop = loop
+        return self._async_client
     
-    def _load_available_models(self):
+    def _load_available_models(self) -> ModelStatus:
+        """Fetch /api/tags, refreshing the model list and the cached health verdict"""
+        self._tags_ts = time.time()
+        if self.available_models is None:
+            self.available_models = []
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 self.available_models = [m['name'] for m in data.get('models', [])]
                 logger.info(f"Ollama models available: {self.available_models}")
-        except Exception as e:
+                status = ModelStatus.HEALTHY
+            else:
+                status = ModelStatus.DEGRADED
+        except (requests.RequestException, ValueError, KeyError, AttributeError, TypeError) as e:
+            # AttributeError/TypeError: a body that isn't Ollama's {"models": [{...}]}
+            # shape (e.g. another service on the port) - skip Ollama, don't crash init
             logger.warning(f"Could not load Ollama models: {e}")
+            status = ModelStatus.FAILED
+        self._health = (status, self._tags_ts)
+        return status
+
+    def _models_stale(self) -> bool:
+        return self.available_models is None or time.time() - self._tags_ts > self.TAGS_TTL
     
-    def generate(self, prompt: str, model: str = None, temperature: float = 0.1, format: str = "json") -> Optional[str]:
+    def _payload(self, prompt: str, model: Optional[str], temperature: float, format: str) -> Optional[Dict]:
+        """/api/generate request body, or None if the model isn't available"""
         model = model or self.default_model
         
         if model not in self.available_models:
             logger.warning(f"Model {model} not found")
             return None
         
-        payload = {
+        return {
             "model": model,
             "prompt": prompt,
             "stream": False,
             "format": format,
             "options": {"temperature": temperature, "top_p": 0.95}
         }
+
+    def generate(self, prompt: str, model: str = None, temperature: float = 0.1, format: str = "json") -> Optional[str]:
+        if self._models_stale():
+            self._load_available_models()
+        payload = self._payload(prompt, model, temperature, format)
+        if payload is None:
+            return None
         
         try:
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=60)
+            response = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=60)
+            response.raise_for_status()
+            result = response.json()
+            return result.get('response', '')
+        except Exception as e:
+            logger.error(f"Ollama error: {e}")
+            return None
+
+    async def agenerate(self, prompt: str, model: str = None, temperature: float = 0.1, format: str = "json") -> Optional[str]:
+        if self._models_stale():
+            await asyncio.to_thread(self._load_available_models)
+        payload = self._payload(prompt, model, temperature, format)
+        if payload is None:
+            return None
+        
+        try:
+            response = await self._aclient().post(f"{self.base_url}/api/generate", json=payload)
             response.raise_for_status()
             result = response.json()
             return result.get('response', '')
@@ -120,11 +298,13 @@ class OllamaClient:
             return None
     
     def check_health(self) -> ModelStatus:
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return ModelStatus.HEALTHY if response.status_code == 200 else ModelStatus.DEGRADED
-        except:
-            return ModelStatus.FAILED
+        return self._load_available_models()
+
+    def check_health_cached(self) -> Tuple[ModelStatus, float]:
+        """(status, checked_at) from the last /api/tags fetch, probing only if it is stale"""
+        if self._health is None or self._models_stale():
+            self._load_available_models()
+        return self._health
 
 
 class GeminiClient:
@@ -135,21 +315,41 @@ class GeminiClient:
         self.default_model = "gemini-2.5-flash"
         self._client = genai_sdk.Client(api_key=api_key)   # new SDK: Client(api_key=)
 
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _config(temperature: float, system_instruction: Optional[str]):
+        """Request config, reused across calls with the same temperature and instruction"""
+        from google.genai import types
+        return types.GenerateContentConfig(
+            temperature=temperature,
+            response_mime_type="application/json",
+            system_instruction=system_instruction,
+        )
+
     def generate(self, prompt: str, model: str = None, temperature: float = 0.1,
                  system_instruction: str = None) -> Optional[str]:
         model_name = model or self.default_model
         try:
             # New SDK: client.models.generate_content(model, contents, config)
-            from google.genai import types
-            config = types.GenerateContentConfig(
-                temperature=temperature,
-                response_mime_type="application/json",
-                system_instruction=system_instruction,
-            )
             response = self._client.models.generate_content(
                 model=model_name,
                 contents=prompt,
-                config=config,
+                config=self._config(temperature, system_instruction),
+            )
+            return response.text if response else None
+        except Exception as e:
+            logger.error(f"Gemini error: {e}")
+            return None
+
+    async def agenerate(self, prompt: str, model: str = None, temperature: float = 0.1,
+                        system_instruction: str = None) -> Optional[str]:
+        model_name = model or self.default_model
+        try:
+            # Async surface of the same SDK client: client.aio.models.generate_content
+            response = await self._client.aio.models.generate_content(
+                model=model_name,
+                contents=prompt,
+                config=self._config(temperature, system_instruction),
             )
             return response.text if response else None
         except Exception as e:
@@ -163,20 +363,53 @@ class GeminiClient:
                 contents="Say OK",
             )
             return ModelStatus.HEALTHY if response else ModelStatus.FAILED
-        except Exception:
+        except Exception as e:
+            logger.warning(f"Gemini health check failed: {e}")
             return ModelStatus.FAILED
 
 
 class MultiModelOrchestrator:
+    # Passive health: a provider is judged by its real requests, where an empty
+    # response is a failure just like an exception. A success is trusted for HEALTHY_TTL seconds and a failure for UNHEALTHY_TTL;
+    # get_health_status() only probes providers whose verdict has gone stale
+    HEALTHY_TTL = 600
+    UNHEALTHY_TTL = 60
+
+    # Circuit breaker: BREAKER_THRESHOLD consecutive failures open the circuit for
+    # min(BREAKER_CAP, BREAKER_BASE * 2^n) seconds plus up to BREAKER_JITTER of jitter
+    # (a small delta, not full jitter: the cooldown stays close to its backoff).
+    # Once it expires the next request is a half-open probe: success closes the
+    # circuit, failure reopens it for twice as long
+    BREAKER_THRESHOLD = 3
+    BREAKER_BASE = 5
+    BREAKER_CAP = 300
+    BREAKER_JITTER = 2
+
+    RESPONSE_TIME_WINDOW = 256
+
+    # The clients swallow their own errors (rate limits, auth, timeouts) and
+    # return None, so an empty response counts as a failure like an exception
+    _EMPTY_RESPONSE = "empty response"
+
+    # Attempt order is drawn at random, weighted by success rate / mean latency
+    # over the stats above, so traffic leans towards whichever provider is doing
+    # best without blacklisting the rest. Weights are recomputed this often and
+    # stay empty (plain priority order) until some provider has a track record
+    ROUTING_REFRESH = 60
+
     def __init__(self, groq_api_key: Optional[str] = None, gemini_api_key: Optional[str] = None,
                  ollama_url: str = "http://localhost:11434", enable_groq: bool = True,
-                 enable_ollama: Optional[bool] = None, enable_gemini: bool = True):
+                 enable_ollama: Optional[bool] = None, enable_gemini: bool = True,
+                 rate_limits: Optional[Dict[ModelProvider, float]] = None):
 
         # If enable_ollama not explicitly set, read from environment variable
         if enable_ollama is None:
             enable_ollama = os.getenv("ENABLE_OLLAMA", "true").lower() == "true"
 
         self.providers: Dict[ModelProvider, any] = {}
+        # Set up front so health probes made while initializing count as checks
+        self.health_status = {}
+        self.last_health_check = {}
         
         if enable_groq:
             groq_key = groq_api_key or os.getenv("GROQ_API_KEY")
@@ -186,8 +419,11 @@ class MultiModelOrchestrator:
         
         if enable_ollama:
             ollama_client = OllamaClient(ollama_url)
-            if ollama_client.check_health() == ModelStatus.HEALTHY:
+            status, checked_at = ollama_client.check_health_cached()
+            if status == ModelStatus.HEALTHY:
                 self.providers[ModelProvider.OLLAMA] = ollama_client
+                self.health_status[ModelProvider.OLLAMA] = True
+                self.last_health_check[ModelProvider.OLLAMA] = checked_at
                 logger.info("✓ Ollama provider initialized")
         
         if enable_gemini and GEMINI_AVAILABLE:
@@ -207,81 +443,262 @@ class MultiModelOrchestrator:
             'total_requests': 0, 'successful_requests': 0, 'failed_requests': 0,
             'provider_usage': {p.value: 0 for p in ModelProvider},
             'provider_failures': {p.value: 0 for p in ModelProvider},
-            'avg_response_time': {}
+            # last RESPONSE_TIME_WINDOW latencies per provider, with running sums
+            'avg_response_time': {p.value: deque(maxlen=self.RESPONSE_TIME_WINDOW) for p in ModelProvider}
         }
-        self.health_status = {}
-        self.last_health_check = {}
+        self._rt_sum = {p.value: 0.0 for p in ModelProvider}
+        self.breaker: Dict[ModelProvider, dict] = {
+            p: {'fails': 0, 'open_until': 0.0, 'state': 'closed'} for p in ModelProvider
+        }
+        self._routing_weights: Dict[ModelProvider, float] = {}
+        self._weights_ts = 0.0
+        self._limiters: Dict[ModelProvider, AsyncLimiter] = {}
+        self.set_rate_limits(rate_limits or {})
+
+    def set_rate_limits(self, rate_limits: Dict[ModelProvider, float]):
+        """Cap agenerate() attempts per provider at the given requests/minute"""
+        if rate_limits and not AIOLIMITER_AVAILABLE:
+            logger.warning("aiolimiter not installed: provider rate limits ignored (pip install aiolimiter)")
+            return
+        self._limiters = {p: AsyncLimiter(rpm, 60) for p, rpm in rate_limits.items()}
     
     def generate(self, prompt: str, system_instruction: str = None, temperature: float = 0.1,
                  max_tokens: int = 4096, json_mode: bool = True, 
-                 preferred_provider: Optional[ModelProvider] = None) -> Tuple[Optional[str], ModelProvider]:
-        
+                 preferred_provider: Optional[ModelProvider] = None,
+                 sticky_key: Optional[str] = None) -> Tuple[Optional[str], ModelProvider]:
+        """
+        First non-empty response, trying providers in priority order.
+        sticky_key (e.g. an article id), when no preferred_provider is given, picks
+        the first provider deterministically from the key so repeat requests for the
+        same item land on the same provider (and its prompt cache); the others
+        remain the failover
+        """
         self.stats['total_requests'] += 1
         
-        providers_to_try = ([preferred_provider] + [p for p in self.priority_order if p != preferred_provider]) \
-                           if preferred_provider and preferred_provider in self.providers else self.priority_order
-        
-        for provider_type in providers_to_try:
-            if provider_type not in self.providers:
-                continue
-            
-            if not self._is_provider_healthy(provider_type):
-                logger.warning(f"Provider {provider_type.value} unhealthy, skipping")
-                continue
-            
+        for provider_type in self._usable_providers(preferred_provider, sticky_key):
             provider = self.providers[provider_type]
             logger.info(f"Attempting generation with {provider_type.value}")
-            start_time = time.time()
+            start_time = time.monotonic()
             
             try:
-                if provider_type == ModelProvider.GROQ:
-                    response = provider.generate(prompt=prompt, temperature=temperature, json_mode=json_mode)
-                elif provider_type == ModelProvider.OLLAMA:
-                    response = provider.generate(prompt=prompt, temperature=temperature, format="json" if json_mode else "")
-                elif provider_type == ModelProvider.GEMINI:
-                    response = provider.generate(prompt=prompt, temperature=temperature, system_instruction=system_instruction)
-                
+                response = provider.generate(**self._provider_args(
+                    provider_type, prompt, system_instruction, temperature, json_mode))
+            except Exception as e:
+                self._record_failure(provider_type, e)
+                continue
+            if response:
+                self._record_success(provider_type, time.monotonic() - start_time)
+                return response, provider_type
+            self._record_failure(provider_type, self._EMPTY_RESPONSE)
+        
+        self.stats['failed_requests'] += 1
+        logger.error("All providers failed!")
+        return None, None
+
+    async def agenerate(self, prompt: str, system_instruction: str = None, temperature: float = 0.1,
+                        max_tokens: int = 4096, json_mode: bool = True,
+                        preferred_provider: Optional[ModelProvider] = None,
+                        hedge: bool = False, sticky_key: Optional[str] = None) -> Tuple[Optional[str], ModelProvider]:
+        """
+        generate() on the providers' async clients.
+        hedge=True races the first two usable providers and keeps the first non-empty
+        response, cancelling the other: latency of the faster one, at up to 2x requests.
+        If both come back empty, the remaining providers are tried in order as usual.
+        """
+        self.stats['total_requests'] += 1
+        args = (prompt, system_instruction, temperature, json_mode)
+        
+        usable = self._usable_providers(preferred_provider, sticky_key)
+        if hedge:
+            racers = list(itertools.islice(usable, 2))
+            if len(racers) == 2:
+                response, provider_type = await self._ahedge(racers, *args)
                 if response:
-                    elapsed = time.time() - start_time
-                    self.stats['successful_requests'] += 1
-                    self.stats['provider_usage'][provider_type.value] += 1
-                    if provider_type.value not in self.stats['avg_response_time']:
-                        self.stats['avg_response_time'][provider_type.value] = []
-                    self.stats['avg_response_time'][provider_type.value].append(elapsed)
-                    logger.info(f"✓ Success with {provider_type.value} ({elapsed:.2f}s)")
                     return response, provider_type
-                    
-            except Exception as e:
-                logger.error(f"Error with {provider_type.value}: {e}")
-                self.stats['provider_failures'][provider_type.value] += 1
-                self._mark_provider_unhealthy(provider_type)
+            else:
+                usable = itertools.chain(racers, usable)
+        
+        for provider_type in usable:
+            response = await self._aattempt(provider_type, *args)
+            if response:
+                return response, provider_type
         
         self.stats['failed_requests'] += 1
         logger.error("All providers failed!")
         return None, None
+
+    async def _ahedge(self, racers: List[ModelProvider], *args) -> Tuple[Optional[str], Optional[ModelProvider]]:
+        """First non-empty response among concurrent attempts on `racers`; the rest are cancelled"""
+        tasks = {asyncio.ensure_future(self._aattempt(p, *args)): p for p in racers}
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider_type = tasks.pop(task)
+                    response = task.result()
+                    if response:
+                        logger.info(f"Hedged request won by {provider_type.value}")
+                        return response, provider_type
+        finally:
+            for task in tasks:
+                task.cancel()
+        return None, None
+
+    async def _aattempt(self, provider_type: ModelProvider, prompt: str, system_instruction: Optional[str],
+                        temperature: float, json_mode: bool) -> Optional[str]:
+        """One async attempt on provider_type, with the same stats/health bookkeeping as generate()"""
+        provider = self.providers[provider_type]
+        limiter = self._limiters.get(provider_type)
+        if limiter is not None:
+            await limiter.acquire()
+        logger.info(f"Attempting generation with {provider_type.value}")
+        start_time = time.monotonic()
+        try:
+            response = await provider.agenerate(**self._provider_args(
+                provider_type, prompt, system_instruction, temperature, json_mode))
+        except Exception as e:
+            self._record_failure(provider_type, e)
+            return None
+        if response:
+            self._record_success(provider_type, time.monotonic() - start_time)
+        else:
+            self._record_failure(provider_type, self._EMPTY_RESPONSE)
+        return response
+
+    def _usable_providers(self, preferred_provider: Optional[ModelProvider] = None,
+                          sticky_key: Optional[str] = None):
+        """Configured, healthy providers in attempt order (lazy: health is checked on demand)"""
+        if time.time() - self._weights_ts >= self.ROUTING_REFRESH:
+            self._recompute_weights()
+        if preferred_provider and preferred_provider in self.providers:
+            providers_to_try = [preferred_provider] + [p for p in self.priority_order if p != preferred_provider]
+        elif self._routing_weights:
+            # Weighted sampling without replacement (sort by u ** (1/w)); u comes from
+            # the sticky key when there is one, so a key keeps its order between refreshes
+            weights = self._routing_weights
+            providers_to_try = sorted(
+                weights, key=lambda p: self._draw(p, sticky_key) ** (1 / weights[p]), reverse=True
+            )
+        elif sticky_key:
+            # Priority order rotated to start at the key's provider
+            providers_to_try = [p for p in self.priority_order if p in self.providers]
+            digest = hashlib.blake2b(sticky_key.encode('utf-8'), digest_size=4).digest()
+            idx = int.from_bytes(digest, 'big') % len(providers_to_try)
+            providers_to_try = providers_to_try[idx:] + providers_to_try[:idx]
+        else:
+            providers_to_try = self.priority_order
+        
+        for provider_type in providers_to_try:
+            if provider_type not in self.providers:
+                continue
+            
+            if not self._is_provider_healthy(provider_type):
+                logger.warning(f"Provider {provider_type.value} unhealthy, skipping")
+                continue
+            
+            yield provider_type
+
+    def _recompute_weights(self):
+        """Refresh _routing_weights from the success/failure counts and latency windows"""
+        self._weights_ts = time.time()
+        usage, failures = self.stats['provider_usage'], self.stats['provider_failures']
+        configured = [p for p in self.priority_order if p in self.providers]
+        if not any(usage[p.value] or failures[p.value] for p in configured):
+            self._routing_weights = {}
+            return
+        latency = {
+            p: self._rt_sum[p.value] / len(self.stats['avg_response_time'][p.value])
+            for p in configured if self.stats['avg_response_time'][p.value]
+        }
+        # A provider with no successes yet is assumed as slow as the slowest known one
+        fallback = max(latency.values(), default=1.0)
+        self._routing_weights = {
+            # Laplace-smoothed success rate: no data reads as 50%, never as 0
+            p: (usage[p.value] + 1) / (usage[p.value] + failures[p.value] + 2) / max(latency.get(p, fallback), 1e-3)
+            for p in configured
+        }
+
+    @staticmethod
+    def _draw(provider_type: ModelProvider, sticky_key: Optional[str]) -> float:
+        """Uniform draw in (0, 1], derived from sticky_key when given"""
+        if not sticky_key:
+            return 1.0 - random.random()
+        digest = hashlib.blake2b(f"{sticky_key}:{provider_type.value}".encode('utf-8'), digest_size=8).digest()
+        return (int.from_bytes(digest, 'big') + 1) / 2 ** 64
+
+    @staticmethod
+    def _provider_args(provider_type: ModelProvider, prompt: str, system_instruction: Optional[str],
+                       temperature: float, json_mode: bool) -> Dict:
+        """Keyword arguments for provider_type's generate/agenerate"""
+        if provider_type == ModelProvider.GROQ:
+            return {'prompt': prompt, 'temperature': temperature, 'json_mode': json_mode}
+        if provider_type == ModelProvider.OLLAMA:
+            return {'prompt': prompt, 'temperature': temperature, 'format': "json" if json_mode else ""}
+        return {'prompt': prompt, 'temperature': temperature, 'system_instruction': system_instruction}
+
+    def _record_success(self, provider_type: ModelProvider, elapsed: float):
+        self.stats['successful_requests'] += 1
+        self.stats['provider_usage'][provider_type.value] += 1
+        times = self.stats['avg_response_time'][provider_type.value]
+        if len(times) == times.maxlen:
+            self._rt_sum[provider_type.value] -= times[0]
+        times.append(elapsed)
+        self._rt_sum[provider_type.value] += elapsed
+        logger.info(f"✓ Success with {provider_type.value} ({elapsed:.2f}s)")
+        self.health_status[provider_type] = True
+        self.last_health_check[provider_type] = time.time()
+        breaker = self.breaker[provider_type]
+        if breaker['state'] != 'closed':
+            logger.info(f"Circuit for {provider_type.value} closed")
+        breaker.update(fails=0, open_until=0.0, state='closed')
+
+    def _record_failure(self, provider_type: ModelProvider, error: Union[Exception, str]):
+        logger.error(f"Error with {provider_type.value}: {error}")
+        self.stats['provider_failures'][provider_type.value] += 1
+        self._mark_provider_unhealthy(provider_type)
     
     def _is_provider_healthy(self, provider_type: ModelProvider) -> bool:
-        now = time.time()
-        last_check = self.last_health_check.get(provider_type, 0)
-        if now - last_check < 60:
-            return self.health_status.get(provider_type, True)
+        """Usable unless its circuit is open (no probe on the request path)"""
         if provider_type not in self.providers:
             return False
-        provider = self.providers[provider_type]
-        status = provider.check_health()
-        self.health_status[provider_type] = (status == ModelStatus.HEALTHY)
-        self.last_health_check[provider_type] = now
-        return self.health_status[provider_type]
+        breaker = self.breaker[provider_type]
+        if breaker['state'] == 'open':
+            if time.time() < breaker['open_until']:
+                return False
+            breaker['state'] = 'half_open'
+        return True
+    
+    def _refresh_health(self, provider_type: ModelProvider) -> bool:
+        """Cached health verdict, probing the provider only once the verdict is past its TTL"""
+        now = time.time()
+        healthy = self.health_status.get(provider_type)
+        ttl = self.HEALTHY_TTL if healthy else self.UNHEALTHY_TTL
+        if healthy is None or now - self.last_health_check.get(provider_type, 0) >= ttl:
+            status = self.providers[provider_type].check_health()
+            healthy = (status == ModelStatus.HEALTHY)
+            self.health_status[provider_type] = healthy
+            self.last_health_check[provider_type] = now
+        return healthy
     
     def _mark_provider_unhealthy(self, provider_type: ModelProvider):
+        now = time.time()
         self.health_status[provider_type] = False
-        self.last_health_check[provider_type] = time.time()
+        self.last_health_check[provider_type] = now
+        breaker = self.breaker[provider_type]
+        breaker['fails'] += 1
+        if breaker['fails'] >= self.BREAKER_THRESHOLD:
+            cooldown = min(self.BREAKER_CAP, self.BREAKER_BASE * 2 ** (breaker['fails'] - self.BREAKER_THRESHOLD))
+            cooldown += random.uniform(0, self.BREAKER_JITTER)
+            breaker['open_until'] = now + cooldown
+            breaker['state'] = 'open'
+            logger.warning(f"Circuit for {provider_type.value} open for {cooldown:.1f}s "
+                           f"after {breaker['fails']} consecutive failures")
     
     def get_statistics(self) -> Dict:
         stats = self.stats.copy()
         for provider, times in self.stats['avg_response_time'].items():
             if times:
-                stats[f'{provider}_avg_time'] = sum(times) / len(times)
+                stats[f'{provider}_avg_time'] = self._rt_sum[provider] / len(times)
         if stats['total_requests'] > 0:
             stats['success_rate'] = (stats['successful_requests'] / stats['total_requests'] * 100)
         return stats
@@ -290,7 +707,7 @@ class MultiModelOrchestrator:
         status = {}
         for provider_type in ModelProvider:
             if provider_type in self.providers:
-                is_healthy = self._is_provider_healthy(provider_type)
+                is_healthy = self._refresh_health(provider_type)
                 status[provider_type.value] = "healthy" if is_healthy else "unhealthy"
             else:
                 status[provider_type.value] = "disabled"
@@ -305,17 +722,111 @@ class EnterpriseAIProcessor:
     - Fixed context variable
     """
     
+    MAX_ATTEMPTS = 3
+    
     def __init__(self, groq_api_key: Optional[str] = None, gemini_api_key: Optional[str] = None,
-                 ollama_url: str = "http://localhost:11434", knowledge_manager = None):
+                 ollama_url: str = "http://localhost:11434", knowledge_manager = None,
+                 config: Optional[ProcessorConfig] = None, output_jsonl: Optional[str] = None,
+                 use_cache: bool = True, cache_dir: str = ".cache/llm"):
         
+        self.config = config or ProcessorConfig()
         self.orchestrator = MultiModelOrchestrator(
             groq_api_key=groq_api_key, 
             gemini_api_key=gemini_api_key, 
-            ollama_url=ollama_url
+            ollama_url=ollama_url,
+            rate_limits=self.config.rate_limits
         )
         self.knowledge_manager = knowledge_manager
         self.system_instruction = self._build_system_instruction()
         self.stats = {'total_processed': 0, 'successful': 0, 'failed': 0}
+        
+        # Append-only checkpoint of finished results: a restarted run skips
+        # every article already in the file instead of paying for it again
+        self.output_jsonl = None
+        self.checkpoint: Dict[str, Dict] = {}
+        self._checkpoint_lock = threading.Lock()
+        if output_jsonl:
+            self._load_checkpoint(output_jsonl)
+        
+        # Parsed analyses keyed by the exact request, so re-runs over the same
+        # articles read results from disk instead of calling a provider again
+        self.cache = None
+        if use_cache:
+            if DISKCACHE_AVAILABLE:
+                self.cache = diskcache.Cache(cache_dir)
+            else:
+                logger.debug("diskcache not installed: LLM response cache disabled")
+
+    @staticmethod
+    def custom_id(article: Dict) -> str:
+        """Stable checkpoint key for an article"""
+        key = article.get('title', '') + (article.get('url') or article.get('link', ''))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _load_checkpoint(self, output_jsonl: str):
+        """Use output_jsonl as the checkpoint file, loading results already in it"""
+        self.output_jsonl = output_jsonl
+        self.checkpoint = {}
+        if not os.path.exists(output_jsonl):
+            return
+        line = '\n'
+        with open(output_jsonl, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue   # e.g. a line cut short by a crash
+                cid = record.pop('custom_id', None)
+                if cid:
+                    self.checkpoint[cid] = record
+        if not line.endswith('\n'):
+            # Start new records on their own line after a torn write
+            with open(output_jsonl, 'a', encoding='utf-8') as f:
+                f.write('\n')
+        logger.info(f"✓ Checkpoint: {len(self.checkpoint)} results already in {output_jsonl}")
+
+    @staticmethod
+    def _sticky_key(article: Dict) -> Optional[str]:
+        """Provider-affinity key for an article (see MultiModelOrchestrator.generate)"""
+        key = article.get('id') or article.get('url') or article.get('link')
+        return str(key) if key else None
+
+    def _cache_key(self, prompt: str, temperature: float) -> str:
+        return hashlib.sha1((self.system_instruction + prompt + str(temperature)).encode('utf-8')).hexdigest()
+
+    def _from_cache(self, article: Dict, key: str) -> Optional[Dict]:
+        """Cached analysis for this exact request, counted as a success"""
+        if self.cache is None:
+            return None
+        result = self.cache.get(key)
+        if result is not None:
+            self._save_checkpoint(article, result)
+            self.stats['successful'] += 1
+            logger.info("✓ Processed from cache")
+        return result
+
+    def _save_checkpoint(self, article: Dict, result: Dict):
+        if not self.output_jsonl:
+            return
+        cid = self.custom_id(article)
+        line = json.dumps({'custom_id': cid, **result}, ensure_ascii=False) + '\n'
+        with self._checkpoint_lock:
+            with open(self.output_jsonl, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+            self.checkpoint[cid] = result
+
+    def resume(self, input_jsonl: str, output_jsonl: Optional[str] = None) -> List[Dict]:
+        """
+        Process the articles in input_jsonl (one JSON object per line) with
+        process_articles, skipping those already checkpointed in output_jsonl
+        (default: this processor's checkpoint file)
+        """
+        if output_jsonl and output_jsonl != self.output_jsonl:
+            self._load_checkpoint(output_jsonl)
+        with open(input_jsonl, 'r', encoding='utf-8') as f:
+            articles = [json.loads(line) for line in f if line.strip()]
+        return asyncio.run(self.process_articles(articles))
     
     def _build_system_instruction(self) -> str:
         return """You are a Senior AI Performance Engineer specializing in on-device AI.
@@ -340,10 +851,102 @@ SCORING:
 - 30-49: Tangentially related
 - 0-29: Not relevant or cloud-only"""
     
-    def process_article(self, article: Dict, context_str: str = "", retry_count: int = 0) -> Dict:
+    def process_article(self, article: Dict, context_str: str = "") -> Dict:
+        if self.checkpoint:
+            cached = self.checkpoint.get(self.custom_id(article))
+            if cached is not None:
+                return cached
+        self.stats['total_processed'] += 1
+        
+        prompt = self._build_prompt_with_reasoning(article, self._get_context(article, context_str))
+        cache_key = self._cache_key(prompt, 0.1)
+        cached = self._from_cache(article, cache_key)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(self._retry_delay(attempt))
+            try:
+                response_text, provider_used = self.orchestrator.generate(
+                    prompt=prompt,
+                    system_instruction=self.system_instruction,
+                    temperature=0.1,
+                    json_mode=True,
+                    sticky_key=self._sticky_key(article)
+                )
+                return self._finish_article(article, response_text, provider_used, cache_key)
+                
+            except Exception as e:
+                logger.error(f"Processing failed: {e}")
+                self.stats['failed'] += 1
+                error = e
+        return self._get_fallback_response(str(error))
+
+    async def process_articles(self, articles: List[Dict], context_str: str = "") -> List[Dict]:
+        """
+        Process a batch concurrently: up to config.max_workers articles are in flight,
+        each bounded by config.timeout_per_item. Results are in input order; an article
+        that times out or errors gets the fallback response.
+        """
+        sem = asyncio.Semaphore(self.config.max_workers)
+
+        async def _one(article: Dict) -> Dict:
+            async with sem:
+                return await asyncio.wait_for(
+                    self._aprocess_article(article, context_str), self.config.timeout_per_item
+                )
+
+        results = await asyncio.gather(*[_one(a) for a in articles], return_exceptions=True)
+        for idx, result in enumerate(results):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result)
+                logger.error(f"Processing failed: {reason}")
+                self.stats['failed'] += 1
+                results[idx] = self._get_fallback_response(reason)
+        return results
+
+    async def _aprocess_article(self, article: Dict, context_str: str = "") -> Dict:
+        """process_article on the orchestrator's async path"""
+        if self.checkpoint:
+            cached = self.checkpoint.get(self.custom_id(article))
+            if cached is not None:
+                return cached
         self.stats['total_processed'] += 1
         
-        # Get Graph RAG context
+        prompt = self._build_prompt_with_reasoning(article, self._get_context(article, context_str))
+        cache_key = self._cache_key(prompt, 0.1)
+        cached = self._from_cache(article, cache_key)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(self._retry_delay(attempt))
+            try:
+                response_text, provider_used = await self.orchestrator.agenerate(
+                    prompt=prompt,
+                    system_instruction=self.system_instruction,
+                    temperature=0.1,
+                    json_mode=True,
+                    hedge=self.config.hedge,
+                    sticky_key=self._sticky_key(article)
+                )
+                return self._finish_article(article, response_text, provider_used, cache_key)
+                
+            except Exception as e:
+                logger.error(f"Processing failed: {e}")
+                self.stats['failed'] += 1
+                error = e
+        return self._get_fallback_response(str(error))
+
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Exponential backoff with jitter so articles failing together don't retry in lockstep"""
+        return min(30, 0.5 * 2 ** attempt) + random.uniform(0, 0.5)
+
+    def _get_context(self, article: Dict, context_str: str) -> str:
+        """Graph RAG context for the article, else the caller's context_str"""
         context = ""
         if self.knowledge_manager:
             try:
@@ -359,87 +962,65 @@ SCORING:
         
         if not context and context_str:
             context = context_str
+        return context
+
+    def _finish_article(self, article: Dict, response_text: Optional[str],
+                        provider_used: Optional[ModelProvider], cache_key: Optional[str] = None) -> Dict:
+        """Parse and annotate a provider response; raises if there is nothing usable"""
+        if not response_text:
+            raise ValueError("Empty response from all providers")
         
-        # Build FIXED prompt
-        prompt = self._build_prompt_with_reasoning(article, context)
+        result = self._parse_response(response_text)
         
-        try:
-            response_text, provider_used = self.orchestrator.generate(
-                prompt=prompt,
-                system_instruction=self.system_instruction,
-                temperature=0.1,
-                json_mode=True
-            )
-            
-            if not response_text:
-                raise ValueError("Empty response from all providers")
-            
-            result = self._parse_response(response_text)
-            
-            # ENSURE _reasoning exists
-            if '_reasoning' not in result or not result['_reasoning']:
-                result['_reasoning'] = "Analysis completed"
-            
-            result['provider_used'] = provider_used.value if provider_used else "unknown"
-            result['processed_at'] = datetime.now().isoformat()
-            
-            # Add to knowledge graph
-            if self.knowledge_manager and result.get('relevance_score', 0) >= 60:
-                try:
-                    self.knowledge_manager.add_paper({**article, **result}, embedding=None)
-                    logger.info("✓ Added to Knowledge Graph")
-                except Exception as e:
-                    logger.warning(f"KG update failed: {e}")
-            
-            self.stats['successful'] += 1
-            logger.info(f"✓ Processed with {provider_used.value if provider_used else 'unknown'}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Processing failed: {e}")
-            self.stats['failed'] += 1
-            if retry_count < 2:
-                time.sleep(2)
-                return self.process_article(article, context_str, retry_count + 1)
-            return self._get_fallback_response(str(e))
+        # ENSURE _reasoning exists
+        if '_reasoning' not in result or not result['_reasoning']:
+            result['_reasoning'] = "Analysis completed"
+        
+        result['provider_used'] = provider_used.value if provider_used else "unknown"
+        result['processed_at'] = datetime.now().isoformat()
+        
+        # Add to knowledge graph
+        if self.knowledge_manager and result.get('relevance_score', 0) >= 60:
+            try:
+                self.knowledge_manager.add_paper({**article, **result}, embedding=None)
+                logger.info("✓ Added to Knowledge Graph")
+            except Exception as e:
+                logger.warning(f"KG update failed: {e}")
+        
+        self._save_checkpoint(article, result)
+        if self.cache is not None and cache_key:
+            self.cache.set(cache_key, result, expire=86400 * 7)
+        self.stats['successful'] += 1
+        logger.info(f"✓ Processed with {provider_used.value if provider_used else 'unknown'}")
+        return result
     
     def _build_prompt_with_reasoning(self, article: Dict, context: str) -> str:
         """FIXED: Explicitly asks for _reasoning field"""
         context_section = f"\n{context}\n" if context else "\nNo historical context.\n"
         
-        return f"""{context_section}
-
-ANALYZE THIS ARTICLE:
-
-Title: {article.get('title', 'N/A')}
-Authors: {article.get('authors', 'Unknown')}
-Summary: {article.get('summary', 'N/A')}
-
-REQUIRED JSON OUTPUT (include ALL fields):
-{{
-  "_reasoning": "<Explain: Why is this on-device relevant? What memory implications? Why this score?>",
-  "relevance_score": <0-100 integer>,
-  "platform": "<Mobile|Laptop|Both|IoT|Edge|Unknown>",
-  "model_type": "<LLM|Vision|Audio|Multimodal|Other|Unknown>",
-  "memory_insight": "<Specific memory/DRAM details or 'Unknown'>",
-  "dram_impact": "<High|Medium|Low|Unknown>",
-  "engineering_takeaway": "<One actionable sentence>"
-}}
-
-CRITICAL: Must include _reasoning field explaining your score!"""
+        return "".join((
+            context_section,
+            "\n\nANALYZE THIS ARTICLE:\n\nTitle: ", str(article.get('title', 'N/A')),
+            "\nAuthors: ", str(article.get('authors', 'Unknown')),
+            "\nSummary: ", str(article.get('summary', 'N/A')),
+            _PROMPT_SUFFIX,
+        ))
     
     def _parse_response(self, response_text: str) -> Dict:
         try:
-            return json.loads(response_text)
-        except:
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0]
-                return json.loads(json_str)
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start != -1 and end > start:
-                return json.loads(response_text[start:end])
-            raise ValueError("Could not parse JSON")
+            return _json_loads(response_text)
+        except ValueError:
+            pass
+        match = _FENCE_RE.search(response_text)
+        if match:
+            try:
+                return _json_loads(match.group(1))
+            except ValueError:
+                pass
+        match = _JSON_RE.search(response_text)
+        if match:
+            return _json_loads(match.group(0))
+        raise ValueError("Could not parse JSON")
     
     def _get_fallback_response(self, error: str) -> Dict:
         return {
@@ -3,8 +3,11 @@ PDF Report Generator
 Creates professional PDF reports with all details, clickable links, and rich formatting
 """
 
+import itertools
 import logging
-from typing import List, Dict
+from collections import Counter
+from operator import itemgetter
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -42,10 +45,48 @@ class PDFReportGenerator:
 
         if not self.has_reportlab:
             logger.error("[PDF] reportlab required. Install: pip install reportlab")
+            return
 
-    def generate(self, insights: List[Dict]) -> bool:
+        # Stylesheet and custom styles are built once and shared by every report
+        self._styles = getSampleStyleSheet()
+        self._accent = colors.HexColor('#667eea')
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=36,
+            textColor=self._accent,
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        self._date_style = ParagraphStyle(
+            'DateStyle',
+            parent=self._styles['Normal'],
+            fontSize=14,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        )
+        self._summary_style = ParagraphStyle(
+            'Summary',
+            parent=self._styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#4a5568')
+        )
+        self._metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self._accent),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+
+    def generate(self, insights: List[Dict], ranked: Optional[List[Dict]] = None) -> bool:
         """
         Generate comprehensive PDF report
+        `ranked`: the same insights already sorted by relevance_score (descending), if the caller has them
         Returns: True if successful
         """
         if not self.has_reportlab:
@@ -57,27 +98,23 @@ class PDFReportGenerator:
             return False
 
         try:
+            # Ranked once for the papers and resources sections
+            if ranked is None:
+                ranked = self._rank(insights)
+
             # Create PDF
             doc = SimpleDocTemplate(self.output_path, pagesize=letter)
-            story = []
-
-            # Build document
-            story.extend(self._build_title_page(insights))
-            story.append(PageBreak())
-
-            story.extend(self._build_executive_summary(insights))
-            story.append(PageBreak())
 
-            story.extend(self._build_methodology_section(insights))
-            story.append(PageBreak())
-
-            story.extend(self._build_papers_section(insights))
-            story.append(PageBreak())
-
-            story.extend(self._build_trends_section(insights))
-            story.append(PageBreak())
-
-            story.extend(self._build_resources_section(insights))
+            # Build document: the section builders yield their flowables straight
+            # into the one story list
+            story = list(itertools.chain(
+                self._build_title_page(insights), (PageBreak(),),
+                self._build_executive_summary(insights), (PageBreak(),),
+                self._build_methodology_section(insights), (PageBreak(),),
+                self._build_papers_section(insights, ranked), (PageBreak(),),
+                self._build_trends_section(insights), (PageBreak(),),
+                self._build_resources_section(insights, ranked),
+            ))
 
             # Build PDF
             doc.build(story)
@@ -88,36 +125,31 @@ class PDFReportGenerator:
             logger.error(f"[PDF] Generation failed: {e}")
             return False
 
-    def _build_title_page(self, insights: List[Dict]) -> List:
+    @staticmethod
+    def _rank(insights: List[Dict]) -> Optional[List[Dict]]:
+        """insights by relevance_score, descending; None if the scores don't compare"""
+        if all('relevance_score' in i for i in insights):
+            key = itemgetter('relevance_score')
+        else:
+            key = lambda x: x.get('relevance_score', 0)
+        try:
+            return sorted(insights, key=key, reverse=True)
+        except TypeError:
+            return None
+
+    def _build_title_page(self, insights: List[Dict]) -> Iterator:
         """Build title page"""
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=36,
-            textColor=colors.HexColor('#667eea'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-
-        story.append(Spacer(letter[0], 2 * inch))
-        story.append(Paragraph("On-Device AI Intelligence Report", title_style))
-        story.append(Spacer(letter[0], 0.3 * inch))
+        yield Spacer(letter[0], 2 * inch)
+        yield Paragraph("On-Device AI Intelligence Report", self._title_style)
+        yield Spacer(letter[0], 0.3 * inch)
 
         # Date
         today = datetime.now().strftime("%B %d, %Y")
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph(today, date_style))
-        story.append(Spacer(letter[0], 0.5 * inch))
+        yield Paragraph(today, self._date_style)
+        yield Spacer(letter[0], 0.5 * inch)
 
         # Summary
         total = len(insights)
@@ -128,74 +160,51 @@ class PDFReportGenerator:
         Average Relevance Score: {avg_score:.1f}/100<br/>
         Generated using Hybrid RAG + Multi-Model AI
         """
+        yield Paragraph(summary_text, self._summary_style)
 
-        summary_style = ParagraphStyle(
-            'Summary',
-            parent=styles['Normal'],
-            fontSize=12,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#4a5568')
-        )
-        story.append(Paragraph(summary_text, summary_style))
-
-        return story
-
-    def _build_executive_summary(self, insights: List[Dict]) -> List:
+    def _build_executive_summary(self, insights: List[Dict]) -> Iterator:
         """Build executive summary section"""
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
         # Title
-        story.append(Paragraph("Executive Summary", styles['Heading1']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph("Executive Summary", styles['Heading1'])
+        yield Spacer(letter[0], 0.2 * inch)
 
-        # Metrics
+        # Metrics (one pass over the insights)
         total = len(insights)
-        avg_score = sum(i.get('relevance_score', 0) for i in insights) / total if total > 0 else 0
-
-        platforms = {}
+        score_sum = 0
+        platforms = Counter()
+        impacts = Counter()
         for item in insights:
-            platform = item.get('platform', 'Unknown')
-            platforms[platform] = platforms.get(platform, 0) + 1
-
-        high_impact = len([i for i in insights if i.get('dram_impact') == 'High'])
-        medium_impact = len([i for i in insights if i.get('dram_impact') == 'Medium'])
+            score_sum += item.get('relevance_score', 0)
+            platforms[item.get('platform', 'Unknown')] += 1
+            impacts[item.get('dram_impact', 'Unknown')] += 1
+        avg_score = score_sum / total if total > 0 else 0
+        high_impact, medium_impact = impacts['High'], impacts['Medium']
 
         summary_data = [
             ['Metric', 'Value'],
             ['Total Papers Analyzed', str(total)],
             ['Average Relevance Score', f'{avg_score:.1f}/100'],
-            ['Mobile-Focused Papers', str(platforms.get('Mobile', 0))],
-            ['Laptop-Focused Papers', str(platforms.get('Laptop', 0))],
+            ['Mobile-Focused Papers', str(platforms['Mobile'])],
+            ['Laptop-Focused Papers', str(platforms['Laptop'])],
             ['High DRAM Impact Papers', str(high_impact)],
             ['Medium Impact Papers', str(medium_impact)],
         ]
 
         table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        table.setStyle(self._metrics_table_style)
 
-        story.append(table)
-        story.append(Spacer(letter[0], 0.3 * inch))
+        yield table
+        yield Spacer(letter[0], 0.3 * inch)
 
-        return story
-
-    def _build_methodology_section(self, insights: List[Dict]) -> List:
+    def _build_methodology_section(self, insights: List[Dict]) -> Iterator:
         """Build methodology and analysis process section"""
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
         # Title
-        story.append(Paragraph("Analysis Methodology", styles['Heading1']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph("Analysis Methodology", styles['Heading1'])
+        yield Spacer(letter[0], 0.2 * inch)
 
         # Methodology text
         methodology_text = """
@@ -255,18 +264,15 @@ class PDFReportGenerator:
         • engineering_takeaway: Actionable implementation insight
         """
 
-        story.append(Paragraph(methodology_text, styles['Normal']))
-        story.append(Spacer(letter[0], 0.2 * inch))
-
-        return story
+        yield Paragraph(methodology_text, styles['Normal'])
+        yield Spacer(letter[0], 0.2 * inch)
 
-    def _build_papers_section(self, insights: List[Dict]) -> List:
+    def _build_papers_section(self, insights: List[Dict], ranked: Optional[List[Dict]] = None) -> Iterator:
         """Build papers section with detailed analysis"""
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
         # Sort by relevance
-        sorted_insights = sorted(
+        sorted_insights = ranked if ranked is not None else sorted(
             insights,
             key=lambda x: x.get('relevance_score', 0),
             reverse=True
@@ -275,8 +281,8 @@ class PDFReportGenerator:
         # Get top 6
         top_papers = sorted_insights[:6]
 
-        story.append(Paragraph("Top 6 Research Papers", styles['Heading1']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph("Top 6 Research Papers", styles['Heading1'])
+        yield Spacer(letter[0], 0.2 * inch)
 
         for idx, paper in enumerate(top_papers, 1):
             # Paper header
@@ -285,7 +291,7 @@ class PDFReportGenerator:
             source = paper.get('source', 'Unknown')
 
             header = f"#{idx} • {title} ({source})"
-            story.append(Paragraph(header, styles['Heading2']))
+            yield Paragraph(header, styles['Heading2'])
 
             # Core metrics
             details = f"""
@@ -294,43 +300,41 @@ class PDFReportGenerator:
             <b>Model Type:</b> {paper.get('model_type', 'Unknown')} |
             <b>DRAM Impact:</b> {paper.get('dram_impact', 'Unknown')}
             """
-            story.append(Paragraph(details, styles['Normal']))
-            story.append(Spacer(letter[0], 0.15 * inch))
+            yield Paragraph(details, styles['Normal'])
+            yield Spacer(letter[0], 0.15 * inch)
 
             # Memory insight
             memory = paper.get('memory_insight', 'N/A')
-            story.append(Paragraph("<b>Memory Insight:</b>", styles['Normal']))
-            story.append(Paragraph(str(memory), styles['Normal']))
-            story.append(Spacer(letter[0], 0.1 * inch))
+            yield Paragraph("<b>Memory Insight:</b>", styles['Normal'])
+            yield Paragraph(str(memory), styles['Normal'])
+            yield Spacer(letter[0], 0.1 * inch)
 
             # Platform-specific insight
             platform = paper.get('platform', 'Unknown')
             platform_text = self._get_platform_insight(platform)
-            story.append(Paragraph(f"<b>Platform Implication ({platform}):</b>", styles['Normal']))
-            story.append(Paragraph(platform_text, styles['Normal']))
-            story.append(Spacer(letter[0], 0.1 * inch))
+            yield Paragraph(f"<b>Platform Implication ({platform}):</b>", styles['Normal'])
+            yield Paragraph(platform_text, styles['Normal'])
+            yield Spacer(letter[0], 0.1 * inch)
 
             # Model type insight
             model_type = paper.get('model_type', 'Unknown')
             model_text = self._get_model_type_insight(model_type)
-            story.append(Paragraph(f"<b>Model Type Analysis ({model_type}):</b>", styles['Normal']))
-            story.append(Paragraph(model_text, styles['Normal']))
-            story.append(Spacer(letter[0], 0.1 * inch))
+            yield Paragraph(f"<b>Model Type Analysis ({model_type}):</b>", styles['Normal'])
+            yield Paragraph(model_text, styles['Normal'])
+            yield Spacer(letter[0], 0.1 * inch)
 
             # DRAM impact explanation
             dram = paper.get('dram_impact', 'Unknown')
             dram_text = self._get_dram_impact_explanation(dram)
-            story.append(Paragraph(f"<b>DRAM Impact Assessment ({dram}):</b>", styles['Normal']))
-            story.append(Paragraph(dram_text, styles['Normal']))
-            story.append(Spacer(letter[0], 0.1 * inch))
+            yield Paragraph(f"<b>DRAM Impact Assessment ({dram}):</b>", styles['Normal'])
+            yield Paragraph(dram_text, styles['Normal'])
+            yield Spacer(letter[0], 0.1 * inch)
 
             # Takeaway
             takeaway = paper.get('engineering_takeaway', 'N/A')
-            story.append(Paragraph("<b>Engineering Takeaway:</b>", styles['Normal']))
-            story.append(Paragraph(str(takeaway), styles['Normal']))
-            story.append(Spacer(letter[0], 0.2 * inch))
-
-        return story
+            yield Paragraph("<b>Engineering Takeaway:</b>", styles['Normal'])
+            yield Paragraph(str(takeaway), styles['Normal'])
+            yield Spacer(letter[0], 0.2 * inch)
 
     def _get_platform_insight(self, platform: str) -> str:
         """Get platform-specific insight text"""
@@ -364,13 +368,12 @@ class PDFReportGenerator:
         }
         return impacts.get(impact, impacts['Unknown'])
 
-    def _build_trends_section(self, insights: List[Dict]) -> List:
+    def _build_trends_section(self, insights: List[Dict]) -> Iterator:
         """Build trends and conclusions section"""
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
-        story.append(Paragraph("Research Trends & Conclusions", styles['Heading1']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph("Research Trends & Conclusions", styles['Heading1'])
+        yield Spacer(letter[0], 0.2 * inch)
 
         # Analyze distributions
         platforms = {}
@@ -409,8 +412,8 @@ class PDFReportGenerator:
             pct = (count / total * 100) if total > 0 else 0
             trends_text += f"• {impact}: {count} papers ({pct:.1f}%)<br/>"
 
-        story.append(Paragraph(trends_text, styles['Normal']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph(trends_text, styles['Normal'])
+        yield Spacer(letter[0], 0.2 * inch)
 
         # Key findings
         findings_text = """
@@ -440,39 +443,38 @@ class PDFReportGenerator:
         • Monitor emerging trends in efficient model deployment
         """
 
-        story.append(Paragraph(findings_text, styles['Normal']))
-        story.append(Spacer(letter[0], 0.2 * inch))
-
-        return story
+        yield Paragraph(findings_text, styles['Normal'])
+        yield Spacer(letter[0], 0.2 * inch)
 
-    def _build_resources_section(self, insights: List[Dict]) -> List:
+    def _build_resources_section(self, insights: List[Dict], ranked: Optional[List[Dict]] = None) -> Iterator:
         """
         Build comprehensive resources section with ALL sources and clickable hyperlinks
         Uses SourceLinkProcessor for URL normalization, deduplication, and pagination
+        `ranked`: insights already in relevance order, so the source list needs no sort of its own
         """
-        story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
 
         # Try to use SourceLinkProcessor if available
+        papers = ranked if ranked is not None else insights
         try:
             from .source_link_processor import SourceLinkProcessor
             processor = SourceLinkProcessor()
-            sources = processor.build_source_list(insights, sort_by='relevance')
+            sources = processor.build_source_list(papers, sort_by=None if ranked is not None else 'relevance')
         except ImportError:
             logger.warning("[PDF] SourceLinkProcessor not available, using fallback")
-            sources = self._build_fallback_sources(insights)
+            sources = self._build_fallback_sources(papers, presorted=ranked is not None)
 
         # Add header with source count
         header_text = f"Reference Resources and Sources ({len(sources)} total)"
-        story.append(Paragraph(header_text, styles['Heading1']))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        yield Paragraph(header_text, styles['Heading1'])
+        yield Spacer(letter[0], 0.2 * inch)
 
-        story.append(Paragraph(
+        yield Paragraph(
             f"This report references <b>{len(sources)} unique sources</b> from the research analysis. "
             "All sources are listed below as clickable hyperlinks.",
             styles['Normal']
-        ))
-        story.append(Spacer(letter[0], 0.2 * inch))
+        )
+        yield Spacer(letter[0], 0.2 * inch)
 
         # Paginate sources (40 per page)
         sources_per_page = 40
@@ -484,11 +486,11 @@ class PDFReportGenerator:
         for page_num, page_sources in enumerate(pages, 1):
             # Page heading
             if page_num == 1:
-                story.append(Paragraph("Complete Source List:", styles['Heading2']))
+                yield Paragraph("Complete Source List:", styles['Heading2'])
             else:
-                story.append(Paragraph(f"Complete Source List (continued - Page {page_num}):", styles['Heading2']))
+                yield Paragraph(f"Complete Source List (continued - Page {page_num}):", styles['Heading2'])
 
-            story.append(Spacer(letter[0], 0.1 * inch))
+            yield Spacer(letter[0], 0.1 * inch)
 
             # Create clickable source list
             sources_text = ""
@@ -508,18 +510,17 @@ class PDFReportGenerator:
                     sources_text += f"   Platform: {platform} | Score: {score:.1f}<br/><br/>"
 
             if sources_text:
-                story.append(Paragraph(sources_text, styles['Normal']))
-            story.append(Spacer(letter[0], 0.2 * inch))
+                yield Paragraph(sources_text, styles['Normal'])
+            yield Spacer(letter[0], 0.2 * inch)
 
             # Add page break if not last page
             if page_num < len(pages):
-                story.append(PageBreak())
-
-        return story
+                yield PageBreak()
 
-    def _build_fallback_sources(self, insights: List[Dict]) -> List[Dict]:
+    def _build_fallback_sources(self, insights: List[Dict], presorted: bool = False) -> List[Dict]:
         """
         Fallback method to extract sources if SourceLinkProcessor unavailable
+        (`presorted`: insights are already in relevance order)
         """
         sources = []
         seen_urls = set()
@@ -543,7 +544,8 @@ class PDFReportGenerator:
             })
 
         # Sort by relevance
-        sources.sort(key=lambda x: x['relevance_score'], reverse=True)
+        if not presorted:
+            sources.sort(key=lambda x: x['relevance_score'], reverse=True)
         return sources
 
 
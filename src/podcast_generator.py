@@ -20,6 +20,7 @@ nothing is hardcoded here.
 """
 
 import logging
+from collections import Counter
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
@@ -320,9 +321,7 @@ class PodcastGenerator:
             dialog = self._build_dialog_script(insights)
 
             # Combine all text with speaker labels
-            script = ""
-            for speaker, text in dialog:
-                script += f"{speaker}: {text}\n\n"
+            script = "".join(f"{speaker}: {text}\n\n" for speaker, text in dialog)
 
             logger.info(f"[Audio] Generating podcast with gTTS (single voice with speaker labels)...")
             tts = gTTS(text=script, lang=self.language, slow=False)
@@ -417,8 +416,8 @@ This research shows a genuine path forward that practitioners are using right no
             """.strip()))
 
         # MEMORY ENGINEERING ANGLE
-        high_impact = len([i for i in insights if i.get('dram_impact') == 'High'])
-        medium_impact = len([i for i in insights if i.get('dram_impact') == 'Medium'])
+        impacts = Counter(i.get('dram_impact') for i in insights)
+        high_impact, medium_impact = impacts['High'], impacts['Medium']
 
         dialog.append(("Questioner", "You keep mentioning DRAM as a constraint. Are papers really that focused on memory?"))
 
@@ -618,16 +617,15 @@ class TranscriptGenerator:
             dialog = podcast_gen._build_dialog_script(insights)
 
             # Build transcript
-            transcript = "PODCAST TRANSCRIPT\n"
-            transcript += "=" * 80 + "\n\n"
-
+            parts = ["PODCAST TRANSCRIPT\n", "=" * 80 + "\n\n"]
+            separator = "-" * 40 + "\n\n"
             for speaker, text in dialog:
-                transcript += f"{speaker}:\n{text}\n\n"
-                transcript += "-" * 40 + "\n\n"
+                parts.append(f"{speaker}:\n{text}\n\n")
+                parts.append(separator)
 
             # Write to file
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(transcript)
+                f.write("".join(parts))
 
             logger.info(f"[Transcript] Generated: {output_path}")
             return True
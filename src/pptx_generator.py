@@ -4,7 +4,7 @@ Creates professional slides with analysis, findings, and resources
 """
 
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -47,9 +47,10 @@ class PowerPointGenerator:
         if not self.has_pptx:
             logger.error("[PPT] python-pptx required. Install: pip install python-pptx")
 
-    def generate(self, insights: List[Dict]) -> bool:
+    def generate(self, insights: List[Dict], ranked: Optional[List[Dict]] = None) -> bool:
         """
         Generate comprehensive PowerPoint presentation
+        `ranked`: the same insights already sorted by relevance_score (descending), if the caller has them
         Returns: True if successful
         """
         if not self.has_pptx:
@@ -71,7 +72,7 @@ class PowerPointGenerator:
             self._add_key_findings_slide(prs, insights)
 
             # Sort by relevance
-            sorted_insights = sorted(
+            sorted_insights = ranked if ranked is not None else sorted(
                 insights,
                 key=lambda x: x.get('relevance_score', 0),
                 reverse=True
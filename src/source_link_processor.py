@@ -79,7 +79,7 @@ class SourceLinkProcessor:
     def build_source_list(
         cls,
         papers: List[Dict[str, Any]],
-        sort_by: str = "relevance",
+        sort_by: Optional[str] = "relevance",
         deduplicate: bool = True
     ) -> List[Dict[str, Any]]:
         """
@@ -87,7 +87,8 @@ class SourceLinkProcessor:
 
         Args:
             papers: List of paper dictionaries
-            sort_by: "relevance" (score descending) or "alphabetical" (title ascending)
+            sort_by: "relevance" (score descending), "alphabetical" (title ascending),
+                     or None to keep the papers' order
             deduplicate: If True, remove duplicate URLs
 
         Returns:
@@ -109,6 +109,50 @@ class TestMailer:
         except ImportError:
             pytest.skip("src.mailer not available")
 
+    def test_mailer_outbox_skipped_without_credentials_and_bounded(self, monkeypatch):
+        """Test unconfigured installs don't queue emails and the outbox keeps only the newest"""
+        try:
+            from src.mailer import Mailer, MailerConfig
+        except ImportError:
+            pytest.skip("src.mailer not available")
+        monkeypatch.delenv("SMTP_USER", raising=False)
+        monkeypatch.delenv("SMTP_PASSWORD", raising=False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = MailerConfig()
+            config.OUTBOX_DIR = tmpdir
+            config.OUTBOX_MAX_ENTRIES = 2
+            mailer = Mailer({'recipients': ['team@test.com']}, config=config)
+
+            assert mailer.send("<p>report</p>") is False
+            assert os.listdir(tmpdir) == []
+
+            for i in range(4):
+                mailer._queue_for_replay(f"<p>{i}</p>", f"subject {i}", None, "normal", "test")
+            assert len(os.listdir(tmpdir)) == 2
+
+    def test_mailer_does_not_retry_refused_recipients(self, monkeypatch):
+        """Test a permanent recipient refusal is neither retried, queued nor counted by the breaker"""
+        try:
+            import smtplib
+            from src.mailer import Mailer, MailerConfig
+        except ImportError:
+            pytest.skip("src.mailer not available")
+        monkeypatch.setenv("SMTP_USER", "test@test.com")
+        monkeypatch.setenv("SMTP_PASSWORD", "test")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = MailerConfig()
+            config.OUTBOX_DIR = tmpdir
+            mailer = Mailer({'recipients': ['nobody@test.com']}, config=config)
+            mailer._deliver = Mock(side_effect=smtplib.SMTPRecipientsRefused(
+                {'nobody@test.com': (550, b'No such user')}
+            ))
+
+            assert mailer.send("<p>report</p>") is False
+            assert mailer._deliver.call_count == 1
+            assert mailer.stats['retries'] == 0
+            assert os.listdir(tmpdir) == []
+            assert mailer.breaker.state == 'closed'
+
 
 class TestHistory:
     """Test deduplication detection"""
@@ -274,6 +318,64 @@ class TestModelOrchestrator:
         except ImportError:
             pytest.skip("multimodel_orchestrator not available")
 
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test a provider that keeps returning nothing is skipped once its circuit opens"""
+        try:
+            from src.multimodel_orchestrator import MultiModelOrchestrator, ModelProvider
+        except ImportError:
+            pytest.skip("multimodel_orchestrator not available")
+        orchestrator = MultiModelOrchestrator(groq_api_key="test", enable_ollama=False, enable_gemini=False)
+        groq = Mock()
+        groq.generate.return_value = None     # what GroqClient returns on 429s
+        orchestrator.providers[ModelProvider.GROQ] = groq
+
+        for _ in range(5):
+            assert orchestrator.generate("prompt") == (None, None)
+
+        assert groq.generate.call_count == orchestrator.BREAKER_THRESHOLD
+        assert orchestrator.breaker[ModelProvider.GROQ]['state'] == 'open'
+        assert orchestrator.stats['provider_failures']['groq'] == orchestrator.BREAKER_THRESHOLD
+
+    def test_dead_provider_marked_unhealthy_from_empty_responses(self):
+        """Test requests fail over from a dead provider and its health verdict turns unhealthy"""
+        try:
+            from src.multimodel_orchestrator import MultiModelOrchestrator, ModelProvider
+        except ImportError:
+            pytest.skip("multimodel_orchestrator not available")
+        orchestrator = MultiModelOrchestrator(groq_api_key="test", enable_ollama=False, enable_gemini=False)
+        groq, fallback = Mock(), Mock()
+        groq.generate.return_value = None     # e.g. a revoked API key
+        fallback.generate.return_value = '{"relevance_score": 50}'
+        orchestrator.providers[ModelProvider.GROQ] = groq
+        orchestrator.providers[ModelProvider.GEMINI] = fallback
+
+        for _ in range(5):
+            assert orchestrator.generate("prompt")[1] == ModelProvider.GEMINI
+
+        assert orchestrator.health_status[ModelProvider.GROQ] is False
+        assert groq.generate.call_count == orchestrator.BREAKER_THRESHOLD
+        assert fallback.generate.call_count == 5
+
+    def test_failing_provider_loses_routing_weight(self):
+        """Test routing weights favour the provider that is actually succeeding"""
+        try:
+            from src.multimodel_orchestrator import MultiModelOrchestrator, ModelProvider
+        except ImportError:
+            pytest.skip("multimodel_orchestrator not available")
+        orchestrator = MultiModelOrchestrator(groq_api_key="test", enable_ollama=False, enable_gemini=False)
+        groq, fallback = Mock(), Mock()
+        groq.generate.return_value = None
+        fallback.generate.return_value = '{"relevance_score": 50}'
+        orchestrator.providers[ModelProvider.GROQ] = groq
+        orchestrator.providers[ModelProvider.GEMINI] = fallback
+
+        for _ in range(3):
+            orchestrator.generate("prompt")
+        orchestrator._recompute_weights()
+
+        weights = orchestrator._routing_weights
+        assert weights[ModelProvider.GROQ] < weights[ModelProvider.GEMINI] / 2
+
 
 # ============================================================================
 # SMOKE TESTS - Verify No Import Errors